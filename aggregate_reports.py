@@ -0,0 +1,81 @@
+"""
+Fold every per-scenario healing report into one incremental aggregate
+
+Scans the reports directory (including parallel worker directories), ingests
+only reports that are new or were rewritten since the last run and prints the
+rolled-up totals per element and per strategy.
+
+Usage:
+    python aggregate_reports.py                       # reports/ into config.REPORT_AGGREGATE_DB
+    python aggregate_reports.py reports/parallel -n 20
+    python aggregate_reports.py --json reports/aggregate.json
+"""
+import argparse
+import sys
+
+import config
+from utils.atomic_io import atomic_write_json
+from utils.report_aggregator import ReportAggregator
+
+
+def print_aggregate(aggregator, limit):
+    """Print the run totals, the most healed elements and the strategies that won most often"""
+    summary = aggregator.summary()
+    print("\n" + "-" * 80)
+    print(
+        f"📚 AGGREGATE: {summary['reports']} reports, {summary['total_attempts']} healing attempts, "
+        f"{summary['successful_healing']} healed, {summary['failed_healing']} failed "
+        f"({summary['success_rate']:.1f}%)"
+    )
+    print("-" * 80)
+    print(f"  {'Element':<32} {'Attempts':>8} {'Healed':>7} {'Failed':>7} {'Page':>5} {'Mean s':>7}  Last seen")
+    for element in aggregator.element_totals(limit):
+        mean = element["time_taken"] / element["attempts"] if element["attempts"] else 0.0
+        print(
+            f"  {element['element'][:32]:<32} {element['attempts']:>8} {element['healed']:>7} {element['failed']:>7} "
+            f"{element['page_level']:>5} {mean:>7.2f}  {element['last_seen'] or '-'}"
+        )
+
+    print(f"\n🏆 TOP {limit} STRATEGIES:")
+    for strategy in aggregator.strategy_totals(limit=limit):
+        print(
+            f"  • {strategy['wins']:>5} wins {strategy['failures']:>5} failures  {strategy['element'][:28]:<28} "
+            f"{strategy['strategy']}={strategy['value'][:60]}"
+        )
+    print("-" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally aggregate per-scenario healing reports")
+    parser.add_argument("directory", nargs="?", default="reports", help="Directory scanned for healing_report_*.json")
+    parser.add_argument("--db", default=config.REPORT_AGGREGATE_DB, help="Aggregate database")
+    parser.add_argument("-n", "--top", type=int, default=config.PROFILE_TOP_N, help="Elements and strategies listed")
+    parser.add_argument("-w", "--workers", type=int, help="Parser processes (default: one per core)")
+    parser.add_argument("--json", help="Write the summary and totals to this JSON file")
+    args = parser.parse_args(argv)
+
+    aggregator = ReportAggregator(args.db, config.AGGREGATE_PARALLEL_THRESHOLD, args.workers)
+    try:
+        stats = aggregator.update(args.directory)
+        print(
+            f"📥 Ingested {stats['ingested']} new or changed reports ({stats['events']} events) "
+            f"in {stats['time'] * 1000:.0f}ms"
+        )
+        if stats["errors"]:
+            print(f"⚠️ {stats['errors']} reports could not be read (see the log)")
+        print_aggregate(aggregator, args.top)
+
+        if args.json:
+            atomic_write_json(args.json, {
+                "summary": aggregator.summary(),
+                "elements": aggregator.element_totals(),
+                "strategies": aggregator.strategy_totals()
+            })
+            print(f"📄 Aggregate saved: {args.json}")
+    finally:
+        aggregator.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
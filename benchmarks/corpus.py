@@ -0,0 +1,233 @@
+"""
+Synthetic OrangeHRM-style pages and the DOM mutations applied to them
+
+Every page is built as a small element tree (standin.markup.Node) modelled on
+the OrangeHRM markup used by the page objects. Each element a locator should
+find carries a data-bench-target attribute, which the healer never looks at,
+so results can be checked against the ground truth in the browser as well as
+offline.
+"""
+import random
+from selenium.webdriver.common.by import By
+from standin.markup import MUTATORS, Node
+
+# Mutation classes, each applied on its own to the unmutated page
+MUTATIONS = ["none", "rename_ids", "rename_classes", "wrap", "text", "reorder", "combined"]
+
+
+class Target:
+    """An element a page object locates, with its locator as originally written"""
+
+    def __init__(self, name, description, *strategies):
+        self.name = name
+        self.description = description
+        self.strategies = list(strategies)
+
+
+def _input_group(label, target, input_attrs, tag="input"):
+    return Node("div", {"class": "oxd-input-group oxd-input-field-bottom-space"}, children=[
+        Node("div", {"class": "oxd-input-group__label-wrapper"}, children=[
+            Node("label", {"class": "oxd-label"}, label)
+        ]),
+        Node("div", children=[Node(tag, dict({"class": "oxd-input oxd-input--active"}, **input_attrs), target=target)])
+    ])
+
+
+def _chrome(content, title):
+    """Top bar, side menu and main area shared by every page behind the login"""
+    menu = [
+        ("Admin", "admin/viewAdminModule"), ("PIM", "pim/viewPimModule"), ("Leave", "leave/viewLeaveModule"),
+        ("Time", "time/viewTimeModule"), ("Recruitment", "recruitment/viewRecruitmentModule"),
+        ("My Info", "pim/viewMyDetails"), ("Performance", "performance/viewPerformanceModule"),
+        ("Dashboard", "dashboard/index"), ("Directory", "directory/viewDirectory"),
+        ("Maintenance", "maintenance/viewMaintenanceModule"), ("Claim", "claim/viewClaimModule"),
+        ("Buzz", "buzz/viewBuzz"),
+    ]
+    items = []
+    for label, route in menu:
+        link = Node("a", {"class": "oxd-main-menu-item", "href": f"/web/index.php/{route}"}, children=[
+            Node("span", {"class": "oxd-text oxd-text--span oxd-main-menu-item--name"}, label)
+        ], target=f"menu_{label.lower().replace(' ', '_')}" if label in ("Admin", "PIM", "Leave") else None)
+        items.append(Node("li", {"class": "oxd-main-menu-item-wrapper"}, children=[link]))
+
+    return Node("html", children=[
+        Node("head", children=[Node("title", text="OrangeHRM")]),
+        Node("body", children=[Node("div", {"id": "app"}, children=[
+            Node("div", {"class": "oxd-layout"}, children=[
+                Node("header", {"class": "oxd-topbar"}, children=[
+                    Node("div", {"class": "oxd-topbar-header"}, children=[
+                        Node("div", {"class": "oxd-topbar-header-title"}, children=[
+                            Node("h6", {"class": "oxd-text oxd-text--h6 oxd-topbar-header-breadcrumb-module"}, title,
+                                 target="page_heading")
+                        ]),
+                        Node("div", {"class": "oxd-topbar-header-userarea"}, children=[Node("ul", children=[Node("li", children=[
+                            Node("span", {"class": "oxd-userdropdown-tab"}, children=[
+                                Node("img", {"class": "oxd-userdropdown-img", "alt": "profile picture", "src": "profile.png"}),
+                                Node("p", {"class": "oxd-userdropdown-name"}, "Paul Collings")
+                            ], target="user_dropdown")
+                        ])])])
+                    ])
+                ]),
+                Node("aside", {"class": "oxd-sidepanel"}, children=[
+                    Node("nav", {"class": "oxd-navbar-nav", "aria-label": "Sidepanel"}, children=[
+                        Node("ul", {"class": "oxd-main-menu"}, children=items)
+                    ])
+                ]),
+                Node("div", {"class": "oxd-layout-container"}, children=[
+                    Node("div", {"class": "oxd-layout-context"}, children=[content])
+                ])
+            ])
+        ])])
+    ])
+
+
+def login_page():
+    form = Node("form", {"class": "oxd-form", "method": "post", "action": "/web/index.php/auth/validate"}, children=[
+        _input_group("Username", "username", {"name": "username", "placeholder": "Username"}),
+        _input_group("Password", "password", {"name": "password", "type": "password", "placeholder": "Password"}),
+        Node("div", {"class": "oxd-form-actions orangehrm-login-action"}, children=[
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--main orangehrm-login-button"},
+                 "Login", target="login_button")
+        ]),
+        Node("div", {"class": "orangehrm-login-forgot"}, children=[
+            Node("p", {"class": "oxd-text oxd-text--p orangehrm-login-forgot-header"}, "Forgot your password?",
+                 target="forgot_password")
+        ])
+    ])
+    root = Node("html", children=[
+        Node("head", children=[Node("title", text="OrangeHRM")]),
+        Node("body", children=[Node("div", {"id": "app"}, children=[
+            Node("div", {"class": "orangehrm-login-container"}, children=[
+                Node("div", {"class": "orangehrm-login-slot"}, children=[
+                    Node("div", {"class": "orangehrm-login-branding"}, children=[
+                        Node("img", {"src": "branding.png", "alt": "company-branding"})
+                    ]),
+                    Node("h5", {"class": "oxd-text oxd-text--h5 orangehrm-login-title"}, "Login"),
+                    form
+                ])
+            ])
+        ])])
+    ])
+    targets = [
+        Target("username", "Username input field", (By.NAME, "username")),
+        Target("password", "Password input field", (By.NAME, "password")),
+        Target("login_button", "Login button", (By.CSS_SELECTOR, "button.orangehrm-login-button")),
+        Target("forgot_password", "Forgot your password link", (By.XPATH, "//p[contains(@class,'orangehrm-login-forgot-header')]")),
+    ]
+    return root, targets
+
+
+def add_employee_page():
+    name_fields = Node("div", {"class": "oxd-form-row"}, children=[
+        Node("div", {"class": "--name-grouped-field"}, children=[
+            Node("div", {"class": "oxd-input-group"}, children=[Node("input", {
+                "class": "oxd-input oxd-input--active orangehrm-firstname", "name": "firstName", "placeholder": "First Name"
+            }, target="first_name")]),
+            Node("div", {"class": "oxd-input-group"}, children=[Node("input", {
+                "class": "oxd-input oxd-input--active orangehrm-middlename", "name": "middleName", "placeholder": "Middle Name"
+            }, target="middle_name")]),
+            Node("div", {"class": "oxd-input-group"}, children=[Node("input", {
+                "class": "oxd-input oxd-input--active orangehrm-lastname", "name": "lastName", "placeholder": "Last Name"
+            }, target="last_name")]),
+        ])
+    ])
+    form = Node("form", {"class": "oxd-form"}, children=[
+        name_fields,
+        Node("div", {"class": "oxd-form-row"}, children=[_input_group("Employee Id", "employee_id", {})]),
+        Node("div", {"class": "oxd-form-actions"}, children=[
+            Node("button", {"type": "button", "class": "oxd-button oxd-button--medium oxd-button--ghost"}, "Cancel",
+                 target="cancel_button"),
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--secondary orangehrm-left-space"},
+                 "Save", target="save_button"),
+        ])
+    ])
+    content = Node("div", {"class": "orangehrm-card-container"}, children=[
+        Node("h6", {"class": "oxd-text oxd-text--h6 orangehrm-main-title"}, "Add Employee"), form
+    ])
+    targets = [
+        Target("first_name", "First name input field", (By.NAME, "firstName")),
+        Target("middle_name", "Middle name input field", (By.NAME, "middleName")),
+        Target("last_name", "Last name input field", (By.NAME, "lastName")),
+        Target("employee_id", "Employee Id input field",
+               (By.XPATH, "//label[text()='Employee Id']/../following-sibling::div/input")),
+        Target("save_button", "Save button", (By.XPATH, "//button[normalize-space()='Save']")),
+        Target("cancel_button", "Cancel button", (By.XPATH, "//button[normalize-space()='Cancel']")),
+    ]
+    return _chrome(content, "PIM"), targets
+
+
+def apply_leave_page():
+    form = Node("form", {"class": "oxd-form"}, children=[
+        Node("div", {"class": "oxd-input-group"}, children=[
+            Node("div", {"class": "oxd-input-group__label-wrapper"}, children=[Node("label", {"class": "oxd-label"}, "Leave Type")]),
+            Node("div", {"class": "oxd-select-wrapper"}, children=[
+                Node("div", {"class": "oxd-select-text oxd-select-text--active"}, children=[
+                    Node("div", {"class": "oxd-select-text-input", "tabindex": "0"}, "-- Select --", target="leave_type")
+                ])
+            ])
+        ]),
+        _input_group("From Date", "from_date", {"placeholder": "yyyy-dd-mm"}),
+        _input_group("To Date", "to_date", {"placeholder": "yyyy-dd-mm"}),
+        _input_group("Comments", "comments", {"class": "oxd-textarea oxd-textarea--active oxd-textarea--resize-vertical"},
+                     tag="textarea"),
+        Node("div", {"class": "oxd-form-actions"}, children=[
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--secondary orangehrm-left-space"},
+                 "Apply", target="apply_button")
+        ])
+    ])
+    content = Node("div", {"class": "orangehrm-card-container"}, children=[
+        Node("h6", {"class": "oxd-text oxd-text--h6 orangehrm-main-title"}, "Apply Leave"), form
+    ])
+    targets = [
+        Target("leave_type", "Leave type dropdown", (By.CSS_SELECTOR, "div.oxd-select-text-input")),
+        Target("from_date", "From date input field",
+               (By.XPATH, "//label[text()='From Date']/../following-sibling::div//input")),
+        Target("to_date", "To date input field",
+               (By.XPATH, "//label[text()='To Date']/../following-sibling::div//input")),
+        Target("comments", "Comments textarea", (By.CSS_SELECTOR, "textarea.oxd-textarea")),
+        Target("apply_button", "Apply button", (By.XPATH, "//button[normalize-space()='Apply']")),
+    ]
+    return _chrome(content, "Leave"), targets
+
+
+def dashboard_page():
+    widgets = Node("div", {"class": "oxd-grid-3 orangehrm-dashboard-grid"}, children=[
+        Node("div", {"class": "oxd-grid-item orangehrm-dashboard-widget"}, children=[
+            Node("p", {"class": "oxd-text oxd-text--p"}, title),
+            Node("div", {"class": "orangehrm-dashboard-widget-body"}, children=[
+                Node("button", {"class": "oxd-icon-button orangehrm-quick-launch-icon", "title": title}, "")
+            ])
+        ])
+        for title in ("Time at Work", "My Actions", "Quick Launch", "Buzz Latest Posts", "Employees on Leave Today")
+    ])
+    targets = [
+        Target("page_heading", "Dashboard heading title", (By.CSS_SELECTOR, "h6.oxd-topbar-header-breadcrumb-module")),
+        Target("user_dropdown", "User dropdown menu with the user's name", (By.CSS_SELECTOR, "span.oxd-userdropdown-tab")),
+        Target("menu_admin", "Admin menu item link", (By.XPATH, "//a[contains(@href,'admin/viewAdminModule')]")),
+        Target("menu_pim", "PIM menu item link", (By.XPATH, "//span[text()='PIM']/ancestor::a")),
+        Target("menu_leave", "Leave menu item link", (By.CSS_SELECTOR, "a[href*='leave/viewLeaveModule']")),
+    ]
+    return _chrome(widgets, "Dashboard"), targets
+
+
+PAGES = {
+    "login": login_page,
+    "add_employee": add_employee_page,
+    "apply_leave": apply_leave_page,
+    "dashboard": dashboard_page,
+}
+
+
+def build_case(page, mutation, seed=0):
+    """
+    Build one benchmark page
+
+    :param page: Key of PAGES
+    :param mutation: Key of MUTATORS
+    :param seed: Seed of the mutation's random choices
+    :return: (original HTML, mutated HTML, list of Target)
+    """
+    original, targets = PAGES[page]()
+    mutated, _ = PAGES[page]()
+    MUTATORS[mutation](mutated, random.Random(f"{page}:{mutation}:{seed}"))
+    return "<!DOCTYPE html>\n" + original.render(), "<!DOCTYPE html>\n" + mutated.render(), targets
@@ -0,0 +1,340 @@
+"""
+Micro-benchmark of the healing engine on synthetic, mutated OrangeHRM pages
+
+Every locator of every corpus page is looked up through AISelfHealingDriver on
+each mutation class, cold (no fingerprint) and warm (fingerprint taken from the
+unmutated page). Reports time-to-heal, strategies probed, WebDriver round trips
+and accuracy per mutation class.
+
+By default pages are served by an in-process driver over DOMSnapshot, so the
+whole suite runs in seconds without a browser. --browser loads the same pages
+from local files in a headless browser instead.
+
+Usage:
+    python -m benchmarks.healing_benchmark
+    python -m benchmarks.healing_benchmark --save-baseline benchmarks/baseline.json
+    python -m benchmarks.healing_benchmark --compare benchmarks/baseline.json
+    python -m benchmarks.healing_benchmark --browser --seeds 1
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+import config
+from benchmarks.corpus import MUTATIONS, PAGES, build_case
+from standin.markup import TARGET_ATTRIBUTE
+from utils.ai_self_healing import AISelfHealingDriver, AISelfHealingLocator
+from utils.atomic_io import atomic_write_json
+from utils.batch_probe import PROBE_SCRIPT
+from utils.dom_observer import DOM_VERSION_SCRIPT
+from utils.dom_snapshot import DOMSnapshot
+from utils.element_fingerprint import CAPTURE_SCRIPT, fingerprint_from_node
+from utils.healing_events import open_event_stream
+from utils.snapshot_query import probe_snapshot, query
+
+# Accuracy drop (percentage points) and slowdown (ratio) that fail --compare
+MAX_ACCURACY_DROP = 0.0
+MAX_SLOWDOWN = 1.5
+
+
+class SnapshotElement:
+    """Element handle returned by SnapshotDriver"""
+
+    def __init__(self, driver, node):
+        self.parent = driver
+        self.node = node
+        self.id = str(node.index)
+
+
+class SnapshotDriver:
+    """
+    Minimal WebDriver over a DOMSnapshot, counting every command as a round trip
+
+    Answers the scripts the healing path sends (batched probe, DOM version,
+    fingerprint capture) with the offline query engine.
+    """
+
+    def __init__(self, html, url="file:///benchmark.html"):
+        self.snapshot = DOMSnapshot(html, url=url)
+        self.current_url = url
+        self.round_trips = 0
+        self.probes = 0
+        self.implicit_wait = 0
+
+    @property
+    def page_source(self):
+        self.round_trips += 1
+        return self.snapshot.html
+
+    @property
+    def timeouts(self):
+        return self
+
+    def implicitly_wait(self, seconds):
+        self.round_trips += 1
+        self.implicit_wait = seconds
+
+    def find_element(self, by=By.ID, value=None):
+        self.round_trips += 1
+        self.probes += 1
+        nodes = query(self.snapshot, by, value)
+        if not nodes:
+            raise NoSuchElementException(f"{by}={value}")
+        return SnapshotElement(self, nodes[0])
+
+    def execute_script(self, script, *args):
+        self.round_trips += 1
+        if script == PROBE_SCRIPT:
+            self.probes += len(args[0])
+            probes = probe_snapshot(self.snapshot, [tuple(strategy) for strategy in args[0]])
+            for probe in probes:
+                if probe["element"] is not None:
+                    probe["element"] = SnapshotElement(self, probe["element"])
+            return probes
+        if script == DOM_VERSION_SCRIPT:
+            return [self.current_url, "benchmark", 0]
+        if script == CAPTURE_SCRIPT:
+            return fingerprint_from_node(args[0].node)
+        return None
+
+
+class CountingDriver:
+    """Wraps a real WebDriver's command executor to count round trips"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.round_trips = 0
+        self.probes = 0
+        execute = driver.execute
+
+        def counting_execute(command, params=None):
+            self.round_trips += 1
+            if command == "findElement":
+                self.probes += 1
+            elif command in ("executeScript", "w3cExecuteScript") and params and params.get("script") == PROBE_SCRIPT:
+                self.probes += len(params["args"][0])
+            return execute(command, params)
+
+        driver.execute = counting_execute
+
+
+def _ground_truth(counter, element):
+    """Target name of the element a lookup returned"""
+    if isinstance(counter, SnapshotDriver):
+        return counter.snapshot.nodes[int(element.id)].attrs.get(TARGET_ATTRIBUTE)
+    return element.get_attribute(TARGET_ATTRIBUTE)
+
+
+def _fingerprints(html, targets):
+    """Fingerprints of the targets on the unmutated page, as a previous run would have stored them"""
+    snapshot = DOMSnapshot(html)
+    fingerprints = {}
+    for target in targets:
+        nodes = query(snapshot, By.CSS_SELECTOR, f"[{TARGET_ATTRIBUTE}='{target.name}']")
+        if nodes:
+            fingerprints[target.name] = fingerprint_from_node(nodes[0])
+    return fingerprints
+
+
+def run_lookups(healing_driver, counter, targets, fingerprints, warm):
+    """
+    Look up every target once and measure it
+
+    :return: List of per-lookup measurements
+    """
+    measurements = []
+    for target in targets:
+        locator = AISelfHealingLocator(target.name, target.description, *target.strategies)
+        healing_driver.learned_locators = {}
+        healing_driver.strategy_ranker.stats = {}
+        healing_driver.strategy_ranker.pending = {}
+        healing_driver.element_cache = {}
+        healing_driver.snapshot_cache.clear()
+        healing_driver.fingerprints = dict(fingerprints) if warm else {}
+
+        counter.round_trips = 0
+        counter.probes = 0
+        start_time = time.perf_counter()
+        try:
+            element = healing_driver.find_element(locator)
+        except NoSuchElementException:
+            element = None
+        elapsed = time.perf_counter() - start_time
+        round_trips = counter.round_trips
+
+        found = _ground_truth(counter, element) if element is not None else None
+        measurements.append({
+            "target": target.name,
+            "time": elapsed,
+            "probes": counter.probes,
+            "round_trips": round_trips,
+            "result": "missed" if element is None else ("correct" if found == target.name else "wrong"),
+            "strategy": list(locator.successful_strategy) if element is not None and locator.successful_strategy else None
+        })
+    return measurements
+
+
+def summarize(measurements):
+    """Aggregate lookups of one mutation class"""
+    times = sorted(m["time"] * 1000 for m in measurements)
+    count = len(measurements)
+    return {
+        "lookups": count,
+        "accuracy": sum(1 for m in measurements if m["result"] == "correct") / count if count else 0.0,
+        "wrong": sum(1 for m in measurements if m["result"] == "wrong"),
+        "missed": sum(1 for m in measurements if m["result"] == "missed"),
+        "mean_ms": statistics.mean(times) if times else 0.0,
+        "p95_ms": times[min(count - 1, int(count * 0.95))] if times else 0.0,
+        "mean_probes": statistics.mean(m["probes"] for m in measurements) if count else 0.0,
+        "mean_round_trips": statistics.mean(m["round_trips"] for m in measurements) if count else 0.0,
+    }
+
+
+def run_benchmark(seeds=3, browser=False, pages=None, mutations=None):
+    """
+    Run the whole suite
+
+    :param seeds: Mutation seeds per (page, mutation class)
+    :param browser: Use a headless browser on local files instead of the offline driver
+    :param pages: Corpus pages to include (all by default)
+    :param mutations: Mutation classes to include (all by default)
+    :return: Results dict with per-class summaries and every measurement
+    """
+    # Benchmarks must not read or write the real learning state
+    workdir = tempfile.mkdtemp(prefix="healing_benchmark_")
+    config.LEARNED_LOCATORS_DB = os.path.join(workdir, "learned_locators.db")
+    config.USE_GENAI = False
+    config.RECORD_DOM_SNAPSHOTS = False
+    config.HEALING_TIME_BUDGET = 0
+    open_event_stream(None, console=False)
+
+    real_driver = None
+    if browser:
+        from utils.driver_factory import create_driver
+        # create_driver returns a healing wrapper; count and heal on the raw WebDriver underneath
+        real_driver = create_driver(config.BROWSER, headless=True).driver
+        real_driver.implicitly_wait(0)
+        counter = CountingDriver(real_driver)
+        healing_driver = AISelfHealingDriver(real_driver)
+
+    measurements = {}
+    try:
+        for page in pages or list(PAGES):
+            for mutation in mutations or MUTATIONS:
+                for seed in range(seeds if mutation != "none" else 1):
+                    original, mutated, targets = build_case(page, mutation, seed)
+                    fingerprints = _fingerprints(original, targets)
+                    if browser:
+                        path = os.path.join(workdir, f"{page}-{mutation}-{seed}.html")
+                        with open(path, "w", encoding="utf-8") as f:
+                            f.write(mutated)
+                        real_driver.get("file://" + path)
+                    else:
+                        counter = SnapshotDriver(mutated)
+                        healing_driver = AISelfHealingDriver(counter)
+                    for mode in ("cold", "warm"):
+                        for measurement in run_lookups(healing_driver, counter, targets, fingerprints, mode == "warm"):
+                            measurement.update({"page": page, "seed": seed})
+                            measurements.setdefault(f"{mutation}/{mode}", []).append(measurement)
+                    if not browser:
+                        healing_driver.locator_store.close()
+    finally:
+        if real_driver is not None:
+            real_driver.quit()
+
+    return {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "engine": "browser" if browser else "offline",
+        "seeds": seeds,
+        "classes": {key: summarize(values) for key, values in measurements.items()},
+        "measurements": measurements,
+    }
+
+
+def print_report(results):
+    """Print one row per mutation class and mode"""
+    print(f"{'Mutation/mode':<24} {'Lookups':>7} {'Accuracy':>9} {'Wrong':>6} {'Missed':>7} "
+          f"{'Mean ms':>8} {'p95 ms':>8} {'Probes':>7} {'Trips':>6}")
+    for key, summary in results["classes"].items():
+        print(f"{key:<24} {summary['lookups']:>7} {summary['accuracy']:>8.0%} {summary['wrong']:>6} {summary['missed']:>7} "
+              f"{summary['mean_ms']:>8.2f} {summary['p95_ms']:>8.2f} {summary['mean_probes']:>7.1f} "
+              f"{summary['mean_round_trips']:>6.1f}")
+
+
+def compare(results, baseline):
+    """
+    Print the change of every class against a baseline
+
+    :return: List of regression messages (empty when nothing got worse)
+    """
+    regressions = []
+    print(f"\n{'Mutation/mode':<24} {'Accuracy':>18} {'Mean ms':>20} {'Trips':>14}")
+    for key, summary in results["classes"].items():
+        before = baseline["classes"].get(key)
+        if before is None:
+            print(f"{key:<24} (not in baseline)")
+            continue
+        accuracy_delta = summary["accuracy"] - before["accuracy"]
+        ratio = summary["mean_ms"] / before["mean_ms"] if before["mean_ms"] else 1.0
+        print(f"{key:<24} {before['accuracy']:>7.0%} -> {summary['accuracy']:>4.0%} {accuracy_delta:>+4.0%}"
+              f" {before['mean_ms']:>7.2f} -> {summary['mean_ms']:>6.2f} {ratio:>4.2f}x"
+              f" {before['mean_round_trips']:>5.1f} -> {summary['mean_round_trips']:>5.1f}")
+        if accuracy_delta < -MAX_ACCURACY_DROP - 1e-9:
+            regressions.append(f"{key}: accuracy {before['accuracy']:.0%} -> {summary['accuracy']:.0%}")
+        if ratio > MAX_SLOWDOWN and summary["mean_ms"] - before["mean_ms"] > 0.5:
+            regressions.append(f"{key}: mean time-to-heal {ratio:.2f}x the baseline")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the healing engine on mutated synthetic pages")
+    parser.add_argument("--seeds", type=int, default=3, help="Mutation seeds per page and mutation class")
+    parser.add_argument("--page", action="append", choices=list(PAGES), help="Only these corpus pages")
+    parser.add_argument("--mutation", action="append", choices=MUTATIONS, help="Only these mutation classes")
+    parser.add_argument("--browser", action="store_true", help="Run in a headless browser on local files")
+    parser.add_argument("--output", help="Write the full results to this JSON file")
+    parser.add_argument("--save-baseline", help="Write the per-class summary to this JSON baseline")
+    parser.add_argument("--compare", help="Compare against a JSON baseline and fail on regressions")
+    args = parser.parse_args(argv)
+
+    # Healing banners would drown the report
+    logging.disable(logging.CRITICAL)
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_benchmark(args.seeds, args.browser, args.page, args.mutation)
+    logging.disable(logging.NOTSET)
+    elapsed = time.perf_counter() - start_time
+
+    print_report(results)
+    print(f"\n⏱️ {sum(s['lookups'] for s in results['classes'].values())} lookups in {elapsed:.1f}s ({results['engine']})")
+
+    if args.output:
+        atomic_write_json(args.output, results)
+        print(f"📄 Results saved: {args.output}")
+    if args.save_baseline:
+        baseline = {key: value for key, value in results.items() if key != "measurements"}
+        atomic_write_json(args.save_baseline, baseline)
+        print(f"📄 Baseline saved: {args.save_baseline}")
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,54 @@
 # Configuration settings for the test framework
+import os
 
 # Browser settings
 BROWSER = "chrome"
 HEADLESS = False
+SESSION_MAX_USES = 20  # Scenarios served by one pooled browser session before it is restarted
 
 # Timeouts
 DEFAULT_TIMEOUT = 10  # seconds
 IMPLICIT_WAIT = 5  # seconds
+PAGE_IDLE_WINDOW = 0.3  # seconds without pending fetch/XHR or DOM mutations before a page counts as loaded
 
 # URLs
-BASE_URL = "https://opensource-demo.orangehrmlive.com/"
+BASE_URL = os.environ.get("BASE_URL", "https://opensource-demo.orangehrmlive.com/")
+STANDIN_HOST = "127.0.0.1"  # Local OrangeHRM stand-in (python -m standin.server, or behave -D standin=<variant>)
+STANDIN_PORT = 8765
 
 # Test data
 TEST_USERNAME = "Admin"
 TEST_PASSWORD = "admin123"
+AUTH_SESSION_TTL = 1800  # seconds a cached login session is reused before logging in again (0 = until rejected)
 
 # AI settings
 USE_GENAI = True  # Set to False to use only traditional self-healing
+GENAI_ENDPOINT = os.environ.get("GENAI_ENDPOINT", "https://api.openai.com/v1/chat/completions")  # Any OpenAI-compatible chat completions URL
+GENAI_MODEL = os.environ.get("GENAI_MODEL", "gpt-4o-mini")
+GENAI_TIMEOUT = 20  # seconds per request; generative healing is not limited by HEALING_TIME_BUDGET
+GENAI_CACHE_DIR = "reports/genai_cache"  # Model answers keyed by a hash of (description, DOM fragment)
+GENAI_DOM_TOKENS = 1500  # Token budget of the distilled DOM outline sent with each request
+FAILURE_OUTLINE_BYTES = 4000  # Size of the distilled DOM outline kept with each failed healing event
+
+# Self-healing settings
+BATCH_PROBE = True  # Resolve fallback and DOM-analysis candidates in one execute_script call
+HEALING_TIME_BUDGET = 2  # seconds allowed for healing after the primary locator misses (0 = unlimited)
+CAPTURE_FINGERPRINTS = True  # Record tag/attributes/text/parents/box of every element a locator resolves to
+LEARNED_LOCATORS_DB = "reports/learned_locators.db"  # SQLite store of learned strategies and fingerprints
+STRATEGY_LIMIT = 5  # Learned strategies kept per element
+STRATEGY_MAX_AGE_DAYS = 14  # Evict learned strategies that have not won for this long
+STRATEGY_LATENCY_ALPHA = 0.3  # Weight of the newest sample in the smoothed lookup latency
+BULK_HEALING = True  # The first heal on a page object re-checks every locator of that page in one batched probe
+BULK_MIN_SIMILARITY = 0.6  # Minimum fingerprint similarity for a bulk-healing candidate
+CACHE_ELEMENT_HANDLES = True  # Reuse resolved elements until the DOM changes; stale handles re-resolve themselves
+RECORD_DOM_SNAPSHOTS = False  # Save the page behind every locator lookup for offline replay (replay_healing.py)
+DOM_RECORDINGS_DIR = "reports/dom_recordings"  # Gzipped, content-addressed snapshots plus an index.jsonl of lookups
+EVENT_LOG = "reports/healing_events.jsonl"  # Probe/heal/failure/learn records, written in the background ("" = off)
+CONSOLE_EVENTS = True  # Print heals, failures and learned strategies as they are written
+STEP_TIMING = True  # Split the time of every behave step into locator stages, waits, actions and navigation
+PROFILE_COMMANDS = False  # Time every WebDriver command by type, locator and step (report at the end of the run)
+PROFILE_TOP_N = 15  # Most expensive call sites listed in the command profile
+REPORT_AGGREGATE_DB = "reports/aggregate.db"  # Rolled-up totals of every healing_report_*.json ingested so far
+AGGREGATE_PARALLEL_THRESHOLD = 32  # New reports needed before the aggregator parses them in a process pool
+REPORT_PAGE_SIZE = 500  # Healing events per lazily loaded shard of an HTML report
+REPORT_CHART_TOP_N = 20  # Elements in the report charts and strategies in the report tables
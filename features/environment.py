@@ -3,7 +3,15 @@ import json
 import re
 import traceback
 from datetime import datetime
-from utils.driver_factory import create_driver
+from utils.driver_factory import DriverSessionPool
+from utils.atomic_io import atomic_write_json
+from utils.session_cache import AuthSessionCache
+from utils.healing_events import open_event_stream, close_event_stream
+from utils.step_timing import step_timer, print_scenario_breakdown, print_run_breakdown
+from utils.command_profiler import command_profiler, print_command_profile
+from pages.login_page import LoginPage
+from standin.server import StandInServer
+import config
 from utils.code_updater import update_source_code_with_locators  # Import the function
 
 # --- NEW: Load .env and set OpenAI key ---
@@ -19,39 +27,79 @@ def before_all(context):
     openai.api_key = context.openai_api_key
     print("OpenAI API key loaded:", bool(context.openai_api_key))
 
+    # Parallel workers (run_parallel.py) pass their own report directory and
+    # leave source code updates to the runner
+    userdata = context.config.userdata
+    context.worker_id = userdata.get("worker_id")
+    context.reports_dir = userdata.get("reports_dir", "reports")
+    context.update_source = userdata.getbool("update_source", True)
+    
+    # -D standin=<variant> runs the suite against an in-process OrangeHRM stand-in
+    context.standin_server = None
+    if userdata.get("standin"):
+        context.standin_server = StandInServer(port=0, variant=userdata["standin"])
+        config.BASE_URL = context.standin_server.start()
+    
     # Create a directory for reports if it doesn't exist
-    if not os.path.exists("reports"):
-        os.makedirs("reports")
-        print("📁 Created reports directory")
+    if not os.path.exists(context.reports_dir):
+        os.makedirs(context.reports_dir)
+        print(f"📁 Created reports directory: {context.reports_dir}")
+    
+    # Healing records of this run go next to its reports
+    context.event_stream = open_event_stream(
+        os.path.join(context.reports_dir, os.path.basename(config.EVENT_LOG)) if config.EVENT_LOG else None
+    )
     
     # Create a directory for drivers if it doesn't exist
     if not os.path.exists("drivers"):
         os.makedirs("drivers")
         print("📁 Created drivers directory")
         print("⚠️ Please download the appropriate browser drivers and place them in the 'drivers' folder.")
+    
+    # Nested timing spans per step: locator stages, waits, actions, navigation
+    context.step_timer = step_timer() if config.STEP_TIMING else None
+    
+    # Opt-in latency profile of every WebDriver command, by command type, step and locator
+    context.command_profiler = command_profiler() if config.PROFILE_COMMANDS else None
+    
+    # Warm browser sessions are reused across scenarios
+    context.session_pool = DriverSessionPool(implicit_wait=config.IMPLICIT_WAIT)
+    
+    # Logged-in cookies/storage per (base URL, user), restored instead of logging in again
+    context.auth_sessions = AuthSessionCache(ttl=config.AUTH_SESSION_TTL, login_path=LoginPage.login_path)
 
 def before_scenario(context, scenario):
     """Set up environment before each scenario"""
     print(f"\n{'='*80}")
-    print(f"🚀 RUNNING SCENARIO: {scenario.name}")
+    if context.worker_id is not None:
+        print(f"🚀 RUNNING SCENARIO: {scenario.name} (worker {context.worker_id})")
+    else:
+        print(f"🚀 RUNNING SCENARIO: {scenario.name}")
     print(f"{'='*80}")
     
-    # Create a driver for each scenario
+    if context.step_timer:
+        context.step_timer.start_scenario(scenario.name)
+    
+    # Take a clean session from the pool (the first scenario starts the browser)
     try:
-        # Try Chrome first
-        context.driver = create_driver("chrome")
-        context.driver.driver.implicitly_wait(10)
-        print("🌐 Using Chrome browser")
+        context.driver = context.session_pool.acquire()
     except Exception as e:
-        print(f"⚠️ Error creating Chrome driver: {str(e)}")
-        try:
-            # Fall back to Edge if Chrome fails
-            context.driver = create_driver("edge")
-            context.driver.driver.implicitly_wait(10)
-            print("🌐 Using Edge browser")
-        except Exception as e2:
-            print(f"❌ Error creating Edge driver: {str(e2)}")
-            raise
+        print(f"❌ Error creating driver: {str(e)}")
+        raise
+
+def before_step(context, step):
+    """Start timing a step and charging WebDriver commands to it"""
+    if context.step_timer:
+        context.step_timer.start_step(f"{step.keyword} {step.name}")
+    if context.command_profiler:
+        context.command_profiler.step = f"{step.keyword} {step.name}"
+
+def after_step(context, step):
+    """Close the timing spans of a step and stop charging commands to it"""
+    if context.step_timer:
+        context.step_timer.end_step(step.status.name)
+    if context.command_profiler:
+        context.command_profiler.step = None
 
 def after_scenario(context, scenario):
     """Clean up and report after each scenario"""
@@ -59,6 +107,9 @@ def after_scenario(context, scenario):
     print(f"📊 SCENARIO COMPLETED: {scenario.name}")
     print(f"{'='*80}")
     
+    timing = context.step_timer.end_scenario() if context.step_timer else None
+    print_scenario_breakdown(timing)
+    
     # Generate healing report after each scenario
     if hasattr(context, 'driver'):
         try:
@@ -69,18 +120,34 @@ def after_scenario(context, scenario):
             # Save healing report as JSON
             try:
                 report = context.driver.get_healing_report()
-                json_report_path = f"reports/healing_report_{scenario_name}_{timestamp}.json"
-                with open(json_report_path, 'w') as f:
-                    json.dump(report, f, indent=2)
+                report["scenario"] = {
+                    "name": scenario.name,
+                    "feature": scenario.feature.filename,
+                    "line": scenario.line,
+                    "status": scenario.status.name,
+                    "worker": context.worker_id
+                }
+                if timing:
+                    report["timing"] = timing
+                json_report_path = os.path.join(context.reports_dir, f"healing_report_{scenario_name}_{timestamp}.json")
+                atomic_write_json(json_report_path, report)
                 print(f"📄 JSON report saved: {json_report_path}")
             except Exception as e:
                 print(f"⚠️ Error saving JSON report: {str(e)}")
             
+            # Persist strategy statistics gathered during the scenario
+            context.driver.flush_learning()
+            
+            # Let queued healing records reach the log and console before the summary
+            context.event_stream.flush()
+            
             # Print healing summary
             print_healing_summary(context.driver)
             
             # Check for learned locators and update source code
-            if hasattr(context.driver, 'learned_locators') and context.driver.learned_locators:
+            if not context.update_source:
+                print("\nℹ️ Source code updates are left to the parallel runner")
+            elif hasattr(context.driver, 'learned_locators') and context.driver.learned_locators:
                 print("\n🔄 LEARNED LOCATORS:")
                 for element, strategies in context.driver.learned_locators.items():
                     if strategies:
@@ -104,7 +171,7 @@ def after_scenario(context, scenario):
             # Take screenshot if scenario failed
             if scenario.status == "failed":
                 try:
-                    screenshot_path = f"reports/failure_{scenario_name}_{timestamp}.png"
+                    screenshot_path = os.path.join(context.reports_dir, f"failure_{scenario_name}_{timestamp}.png")
                     context.driver.driver.save_screenshot(screenshot_path)
                     print(f"📷 Failure screenshot saved: {screenshot_path}")
                 except Exception as e:
@@ -121,12 +188,24 @@ def after_scenario(context, scenario):
             traceback.print_exc()
         
         finally:
-            # Always try to close the driver
-            try:
-                context.driver.driver.quit()
-                print("🔒 Browser closed")
-            except Exception as e:
-                print(f"⚠️ Error closing browser: {str(e)}")
+            # Hand the session back; failed scenarios get a fresh browser
+            context.session_pool.release(context.driver, error=scenario.status == "failed")
+            del context.driver
+
+def after_all(context):
+    """Close every pooled browser session"""
+    if hasattr(context, 'session_pool'):
+        context.session_pool.close_all()
+    close_event_stream()
+    if getattr(context, 'step_timer', None):
+        print_run_breakdown(context.step_timer)
+    if getattr(context, 'command_profiler', None):
+        print_command_profile(context.command_profiler)
+        profile_path = os.path.join(context.reports_dir, "command_profile.json")
+        atomic_write_json(profile_path, context.command_profiler.to_dict())
+        print(f"📄 Command profile saved: {profile_path}")
+    if getattr(context, 'standin_server', None):
+        context.standin_server.stop()
 
 def print_healing_summary(driver):
     """Print a summary of healing and learning activities"""
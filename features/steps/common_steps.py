@@ -1,4 +1,5 @@
 # features/steps/common_steps.py
+import config
 from behave import given
 from pages.login_page import LoginPage
 from pages.dashboard_page import DashboardPage
@@ -6,8 +7,9 @@ from pages.dashboard_page import DashboardPage
 @given('I am logged in as an admin')
 def step_login_as_admin(context):
     login_page = LoginPage(context.driver)
-    login_page.navigate_to("https://opensource-demo.orangehrmlive.com/")
-    login_page.login("Admin", "admin123")
+    login_page.login_with_session_cache(
+        getattr(context, 'auth_sessions', None), config.BASE_URL, config.TEST_USERNAME, config.TEST_PASSWORD
+    )
     
     # Verify we're on the dashboard
     context.dashboard_page = DashboardPage(context.driver)
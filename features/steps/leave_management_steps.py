@@ -1,4 +1,5 @@
 # features/steps/leave_management_steps.py
+import config
 from behave import given, when, then
 from pages.login_page import LoginPage
 from pages.dashboard_page import DashboardPage
@@ -7,8 +8,10 @@ from pages.leave_page import LeavePage
 @given('I am logged in as an employee')
 def step_login_as_employee(context):
     login_page = LoginPage(context.driver)
-    login_page.navigate_to("https://opensource-demo.orangehrmlive.com/")
-    login_page.login("Admin", "admin123")  # Using admin for demo, but could be any employee
+    # Using admin for demo, but could be any employee
+    login_page.login_with_session_cache(
+        getattr(context, 'auth_sessions', None), config.BASE_URL, config.TEST_USERNAME, config.TEST_PASSWORD
+    )
     
     # Verify we're on the dashboard
     dashboard_page = DashboardPage(context.driver)
@@ -1,3 +1,4 @@
+import config
 from behave import given, when, then
 from pages.login_page import LoginPage
 from pages.dashboard_page import DashboardPage
@@ -5,7 +6,7 @@ from pages.dashboard_page import DashboardPage
 @given('I am on the Orange HRM login page')
 def step_navigate_to_login_page(context):
     context.login_page = LoginPage(context.driver)
-    context.login_page.navigate_to("https://opensource-demo.orangehrmlive.com/")
+    context.login_page.navigate_to(config.BASE_URL)
 
 @when('I enter "{username}" as username using AI-enhanced locators')
 def step_enter_username(context, username):
@@ -1,62 +1,31 @@
-import json
-import os
+import sys
+import config
+from utils.report_aggregator import ReportAggregator
+from utils.report_renderer import render_healing_report
 
-# Path to your self-healing JSON report
-HEALING_JSON = "reports/healing_report_login_with_ai-powered_self-healing_locators_20250606_133605.json"
+# Every healing_report_*.json under REPORTS_DIR is folded into the aggregate; only new ones are parsed
+REPORTS_DIR = sys.argv[1] if len(sys.argv) > 1 else "reports"
 OUTPUT_HTML = "reports/self_healing_report.html"
 
-if not os.path.exists(HEALING_JSON):
-    print(f"❌ Healing JSON report not found: {HEALING_JSON}")
-    exit(1)
-
-with open(HEALING_JSON, "r", encoding="utf-8") as f:
-    healing_data = json.load(f)
-
-html = """
-<html>
-<head>
-  <title>Self-Healing Locator Report</title>
-  <style>
-    body {{ font-family: Arial, sans-serif; margin: 2em; }}
-    .event {{ border:1px solid #ccc; margin:1em 0; padding:1em; border-radius: 8px; }}
-    .success {{ color: green; }}
-    .fail {{ color: red; }}
-    h1, h2 {{ color: #2d6cdf; }}
-  </style>
-</head>
-<body>
-<h1>🩹 Self-Healing Locator Report</h1>
-<h2>Summary</h2>
-<ul>
-  <li><b>Total Attempts:</b> {total}</li>
-  <li><b>Successful Healing:</b> {healed}</li>
-  <li><b>Failed Healing:</b> {failed}</li>
-  <li><b>Success Rate:</b> {rate:.1f}%</li>
-</ul>
-<h2>Healing Events</h2>
-""".format(
-    total=healing_data["summary"]["total_attempts"],
-    healed=healing_data["summary"]["successful_healing"],
-    failed=healing_data["summary"]["failed_healing"],
-    rate=(healing_data["summary"]["successful_healing"] / healing_data["summary"]["total_attempts"] * 100)
-    if healing_data["summary"]["total_attempts"] > 0 else 0
-)
-
-for i, event in enumerate(healing_data.get("events", [])):
-    html += f"""
-    <div class="event">
-      <b>Event {i+1}:</b><br>
-      <b>Element:</b> {event.get('element', '')}<br>
-      <b>Description:</b> {event.get('description', 'N/A')}<br>
-      <b>Failed Strategies:</b> {len(event.get('failed', []))}<br>
-      <b>Successful Strategy:</b> <span class="success">{event.get('succeeded', ['None'])[0]}='{event.get('succeeded', ['',''])[1] if event.get('succeeded') else ''}'</span><br>
-      <b>Timestamp:</b> {event.get('timestamp', '')}<br>
-    </div>
-    """
-
-html += "</body></html>"
-
-with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-    f.write(html)
-
-print(f"✅ Self-healing HTML report generated: {OUTPUT_HTML}")
+aggregator = ReportAggregator(config.REPORT_AGGREGATE_DB, config.AGGREGATE_PARALLEL_THRESHOLD)
+try:
+    stats = aggregator.update(REPORTS_DIR)
+    print(f"📥 Ingested {stats['ingested']} new or changed healing reports from {REPORTS_DIR}")
+    summary = aggregator.summary()
+    if not summary["reports"]:
+        print(f"❌ No healing JSON reports found in: {REPORTS_DIR}")
+        exit(1)
+
+    # Charts and tables come from the rolled-up totals; events stream from the database into shards
+    render_healing_report(
+        OUTPUT_HTML,
+        summary,
+        aggregator.iter_events(),
+        elements=aggregator.element_totals(),
+        strategies=aggregator.strategy_totals(limit=config.REPORT_CHART_TOP_N),
+        title="🩹 Self-Healing Locator Report"
+    )
+finally:
+    aggregator.close()
+
+print(f"✅ Self-healing HTML report generated: {OUTPUT_HTML} ({summary['events']} events)")
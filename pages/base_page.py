@@ -1,8 +1,13 @@
+import config
 from utils.ai_self_healing import AISelfHealingLocator
+from utils.page_activity import wait_for_quiescence
+from utils.step_timing import span, PAGE_LOAD
 
 class BasePage:
     def __init__(self, driver):
         self.driver = driver
+        self.locators = []  # Every locator of this page, healed together on the first heal
+        self.bulk_healed = False
     
     def create_ai_locator(self, name, description, *strategies):
         """
@@ -14,7 +19,27 @@ class BasePage:
         :return: AISelfHealingLocator instance
         """
         # Make sure we're passing the strategies correctly
-        return AISelfHealingLocator(name, description, *strategies)
+        locator = AISelfHealingLocator(name, description, *strategies)
+        locator.page = self
+        self.locators.append(locator)
+        return locator
+    
+    def wait_for_page_load(self, timeout=10):
+        """
+        Wait until the page is loaded and quiet
+        
+        Returns as soon as no fetch/XHR call is pending and the DOM has not changed
+        for config.PAGE_IDLE_WINDOW seconds, instead of sleeping a fixed time.
+        
+        :param timeout: Maximum wait in seconds
+        :return: True if the page went quiet in time
+        """
+        with span(PAGE_LOAD, type(self).__name__):
+            settled = wait_for_quiescence(self.driver.driver, config.PAGE_IDLE_WINDOW, timeout)
+        if settled:
+            return True
+        print(f"⚠️ Page did not settle after {timeout} seconds")
+        return False
     
     def click(self, locator):
         """Click on an element with AI self-healing"""
@@ -1,10 +1,10 @@
 # pages/dashboard_page.py
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-import time
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from utils.step_timing import span, WAIT
 
 class DashboardPage(BasePage):
     def __init__(self, driver):
@@ -49,24 +49,14 @@ class DashboardPage(BasePage):
             (By.XPATH, "//span[text()='Wrong Leave Text']")  # Wrong locator
         )
     
-    def wait_for_page_load(self, timeout=10):
-        """Wait for page to load completely"""
-        try:
-            WebDriverWait(self.driver.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            # Add a small delay to allow any JavaScript to finish
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"⚠️ Page did not load completely after {timeout} seconds: {str(e)}")
-    
     def is_element_visible(self, locator, timeout=5):
         """Check if an element is visible"""
         try:
             element = self.driver.find_element(locator)
-            WebDriverWait(self.driver.driver, timeout).until(
-                EC.visibility_of(element)
-            )
+            with span(WAIT, locator.name):
+                WebDriverWait(self.driver.driver, timeout).until(
+                    EC.visibility_of(element)
+                )
             return True
         except (TimeoutException, Exception) as e:
             print(f"⚠️ Element {locator.name} not visible: {str(e)}")
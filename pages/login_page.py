@@ -1,10 +1,10 @@
 # pages/login_page.py
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-import time
-from selenium.webdriver.support.ui import WebDriverWait
 
 class LoginPage(BasePage):
+    login_path = "/auth/login"  # URL fragment of the login route
+    
     def __init__(self, driver):
         super().__init__(driver)
         
@@ -41,20 +41,9 @@ class LoginPage(BasePage):
     
     def navigate_to(self, url):
         """Navigate to the login page"""
-        self.driver.driver.get(url)
+        self.driver.get(url)
         self.wait_for_page_load()
     
-    def wait_for_page_load(self, timeout=10):
-        """Wait for page to load completely"""
-        try:
-            WebDriverWait(self.driver.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            # Add a small delay to allow any JavaScript to finish
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"⚠️ Page did not load completely after {timeout} seconds: {str(e)}")
-    
     def enter_username(self, username):
         """Enter username in the username field"""
         self.input_text(self.username_field, username)
@@ -74,6 +63,27 @@ class LoginPage(BasePage):
         self.enter_password(password)
         self.click_login_button()
     
+    def login_with_session_cache(self, session_cache, base_url, username, password):
+        """
+        Log in by restoring a cached session, falling back to the login form
+        
+        :param session_cache: AuthSessionCache shared by the scenarios of this run
+        :param base_url: Application base URL
+        :param username: User to log in as
+        :param password: Password used for a real login
+        :return: True if a cached session was restored, False if the form was used
+        """
+        if session_cache is not None and session_cache.restore(self.driver, base_url, username):
+            print(f"🔑 Restored cached session for '{username}'")
+            self.wait_for_page_load()
+            return True
+        
+        self.navigate_to(base_url)
+        self.login(username, password)
+        if session_cache is not None and self.login_path not in self.driver.driver.current_url:
+            session_cache.capture(self.driver, base_url, username)
+        return False
+    
     def is_login_page_loaded(self):
         """Check if login page is loaded correctly"""
         return self.is_element_visible(self.login_form) and self.is_element_visible(self.logo)
@@ -2,10 +2,10 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
 import os
-import time
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from utils.step_timing import span, WAIT
 import logging
 
 class PIMPage(BasePage):
@@ -123,32 +123,23 @@ class PIMPage(BasePage):
         try:
             logging.info(f"Waiting for element {locator.name} to be visible")
             element = self.driver.find_element(locator)
-            WebDriverWait(self.driver.driver, timeout).until(
-                EC.visibility_of(element)
-            )
+            with span(WAIT, locator.name):
+                WebDriverWait(self.driver.driver, timeout).until(
+                    EC.visibility_of(element)
+                )
             logging.info(f"Element {locator.name} is now visible")
             return element
         except TimeoutException:
             logging.warning(f"⚠️ Element {locator.name} not visible after {timeout} seconds")
             return None
     
-    def wait_for_page_load(self, timeout=10):
-        try:
-            logging.info("Waiting for page to load completely")
-            WebDriverWait(self.driver.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            time.sleep(0.5)
-            logging.info("Page loaded completely")
-        except Exception as e:
-            logging.warning(f"⚠️ Page did not load completely after {timeout} seconds: {str(e)}")
-    
     def is_element_visible(self, locator, timeout=5):
         try:
             element = self.driver.find_element(locator)
-            WebDriverWait(self.driver.driver, timeout).until(
-                EC.visibility_of(element)
-            )
+            with span(WAIT, locator.name):
+                WebDriverWait(self.driver.driver, timeout).until(
+                    EC.visibility_of(element)
+                )
             return True
         except (TimeoutException, Exception) as e:
             logging.warning(f"⚠️ Element {locator.name} not visible: {str(e)}")
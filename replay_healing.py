@@ -0,0 +1,71 @@
+"""
+Replay recorded locator lookups offline, without a browser
+
+Runs the heuristic healing chain of AISelfHealingLocator against the DOM
+snapshots saved with config.RECORD_DOM_SNAPSHOTS and compares each result with
+what the live run found. Use it to check a change to candidate generation or
+ranking against real pages in milliseconds.
+
+Usage:
+    python replay_healing.py                          # config.DOM_RECORDINGS_DIR
+    python replay_healing.py reports/dom_recordings -l login_button
+    python replay_healing.py --json reports/replay.json
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+
+import config
+from utils.atomic_io import atomic_write_json
+from utils.healing_replay import CHANGED, REGRESSED, replay
+
+STATUS_ICONS = {"match": "✅", "changed": "⚠️", "regressed": "❌", "improved": "🩹", "missed": "➖", "unverified": "❔"}
+
+
+def print_results(results, verbose=False):
+    """Print one line per replayed lookup (only differences unless verbose)"""
+    for result in results:
+        if not verbose and result["status"] not in (CHANGED, REGRESSED):
+            continue
+        winner = f"{result['winner'][0]}={result['winner'][1]}" if result["winner"] else "-"
+        live = f"{result['live'][0]}={result['live'][1]}" if result["live"] else "-"
+        print(
+            f"{STATUS_ICONS.get(result['status'], '')} {result['status']:<10} {result['locator']:<28} "
+            f"{(result['stage'] or '-'):<12} replay: {winner[:60]:<60} live: {live[:60]} "
+            f"({result['time'] * 1000:.1f}ms)"
+        )
+        for error in result["errors"] if verbose else ():
+            print(f"      ⚠️ {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded locator lookups against their DOM snapshots")
+    parser.add_argument("directory", nargs="?", default=config.DOM_RECORDINGS_DIR, help="Recording directory")
+    parser.add_argument("-l", "--locator", action="append", help="Only replay this locator (repeatable)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every lookup, not only differences")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    results = replay(args.directory, args.locator)
+    elapsed = time.perf_counter() - start_time
+    if not results:
+        print(f"ℹ️ No recorded lookups in {args.directory} (set RECORD_DOM_SNAPSHOTS = True and run the suite)")
+        return 0
+
+    print_results(results, args.verbose)
+    counts = Counter(result["status"] for result in results)
+    print(
+        f"\n📊 Replayed {len(results)} lookups on {len({r['snapshot'] for r in results})} snapshots in {elapsed * 1000:.0f}ms: "
+        + ", ".join(f"{count} {status}" for status, count in counts.most_common())
+    )
+
+    if args.json:
+        atomic_write_json(args.json, {"elapsed": elapsed, "counts": dict(counts), "results": results})
+        print(f"📄 Replay results saved: {args.json}")
+    return 1 if counts[CHANGED] or counts[REGRESSED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Run the behave suite across a process pool
+
+Every pool worker runs its share of features (or, with --by scenario, single
+scenarios) in separate behave processes, each with its own browser and
+AISelfHealingDriver. Whole features are the default because every behave
+process pays for interpreter start-up, the step imports and a browser launch,
+which dwarfs a typical scenario. Workers write their reports to
+reports/parallel/<run>/worker-<n>, learned locators are merged through the
+shared SQLite store, and one combined healing summary is written at the end.
+
+Usage:
+    python run_parallel.py                       # every feature, one worker per core
+    python run_parallel.py --by scenario -w 2    # single scenarios on two workers (for a few long features)
+    python run_parallel.py features/login.feature -- --tags=@smoke
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from behave.parser import parse_file
+
+import config
+from utils.atomic_io import atomic_write_json
+from utils.code_updater import update_source_code_with_locators
+from utils.locator_store import LearnedLocatorStore
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Set in each pool process by _init_worker
+WORKER_ID = None
+
+
+def discover_targets(paths, by="feature"):
+    """
+    Expand feature files and directories into behave run targets
+
+    :param paths: Feature files or directories
+    :param by: "feature" for one target per file, "scenario" for one per scenario (file:line)
+    :return: List of targets
+    """
+    feature_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            feature_files.extend(sorted(glob.glob(os.path.join(path, "**", "*.feature"), recursive=True)))
+        else:
+            feature_files.append(path)
+
+    targets = []
+    for feature_file in feature_files:
+        if by == "feature":
+            targets.append(feature_file)
+            continue
+        feature = parse_file(feature_file)
+        if feature is None:
+            continue
+        # Scenario outlines are expanded into one target per example row
+        for scenario in feature.walk_scenarios():
+            targets.append(f"{feature_file}:{scenario.line}")
+    return targets
+
+
+def _init_worker(worker_ids):
+    global WORKER_ID
+    WORKER_ID = worker_ids.get()
+
+
+def run_target(target, run_dir, behave_args):
+    """
+    Run one behave target in a subprocess (executed inside a pool worker)
+
+    :param target: Feature file or file:line
+    :param run_dir: Directory of this parallel run
+    :param behave_args: Extra arguments passed to behave
+    :return: Dict with target, worker, return code, duration and log path
+    """
+    worker_dir = os.path.join(run_dir, f"worker-{WORKER_ID}")
+    os.makedirs(worker_dir, exist_ok=True)
+    log_name = target.replace(os.sep, "_").replace("/", "_").replace(":", "_") + ".log"
+    log_path = os.path.join(worker_dir, log_name)
+
+    command = [
+        sys.executable, "-m", "behave", target,
+        "-D", f"worker_id={WORKER_ID}",
+        "-D", f"reports_dir={worker_dir}",
+        "-D", "update_source=false",
+    ] + list(behave_args)
+
+    start_time = time.time()
+    with open(log_path, "w", encoding="utf-8") as log:
+        result = subprocess.run(command, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT)
+
+    return {
+        "target": target,
+        "worker": WORKER_ID,
+        "returncode": result.returncode,
+        "duration": time.time() - start_time,
+        "log": log_path
+    }
+
+
+def merge_reports(run_dir):
+    """
+    Combine the per-scenario healing reports written by every worker
+
+    :param run_dir: Directory of this parallel run
+    :return: Combined report dict
+    """
+    summary = {"total_attempts": 0, "successful_healing": 0, "failed_healing": 0}
+    scenarios = []
+    events = []
+
+    for path in sorted(glob.glob(os.path.join(run_dir, "worker-*", "healing_report_*.json"))):
+        try:
+            with open(path, "r") as f:
+                report = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Skipping unreadable report {path}: {str(e)}")
+            continue
+
+        for key in summary:
+            summary[key] += report["summary"].get(key, 0)
+        scenario = report.get("scenario", {"name": os.path.basename(path)})
+        scenarios.append(dict(scenario, report=path, **report["summary"]))
+        for event in report.get("events", []):
+            events.append(dict(event, scenario=scenario.get("name"), worker=scenario.get("worker")))
+
+    total = summary["total_attempts"]
+    summary["success_rate"] = (summary["successful_healing"] / (total or 1)) * 100
+    events.sort(key=lambda event: event.get("timestamp", ""))
+    return {"summary": summary, "scenarios": scenarios, "events": events}
+
+
+def print_summary(combined):
+    """Print the combined healing summary of a parallel run"""
+    run = combined["run"]
+    summary = combined["summary"]
+
+    print("\n" + "-" * 80)
+    print("📊 PARALLEL RUN SUMMARY")
+    print("-" * 80)
+    print(f"  • Targets: {run['targets']} on {run['workers']} workers")
+    print(f"  • Passed: {run['passed']}  Failed: {run['failed']}")
+    print(f"  • Wall clock: {run['wall_clock']:.1f}s (serial estimate {run['serial_time']:.1f}s, "
+          f"speedup {run['speedup']:.1f}x)")
+    print(f"\n📈 HEALING STATISTICS:")
+    print(f"  • Total Attempts: {summary['total_attempts']}")
+    print(f"  • Successful Healing: {summary['successful_healing']}")
+    print(f"  • Failed Healing: {summary['failed_healing']}")
+    if summary["total_attempts"]:
+        print(f"  • Success Rate: {summary['success_rate']:.1f}%")
+    else:
+        print(f"  • Success Rate: N/A (no attempts)")
+
+    if combined["events"]:
+        print(f"\n🔄 HEALING EVENTS:")
+        for event in combined["events"]:
+            succeeded = event["succeeded"]
+            outcome = f"{succeeded[0]}='{succeeded[1]}'" if succeeded else "None (healing failed)"
+            print(f"  • [{event.get('worker')}] {event['element']} in '{event.get('scenario')}': {outcome}")
+    print("-" * 80)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    behave_args = []
+    if "--" in argv:
+        behave_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Run behave features or scenarios in parallel")
+    parser.add_argument("paths", nargs="*", default=["features"], help="Feature files or directories")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--by", choices=["feature", "scenario"], default="feature", help="Unit of work per behave process")
+    parser.add_argument("--output", default=os.path.join("reports", "parallel"), help="Directory for run reports")
+    parser.add_argument("--no-update-source", action="store_true", help="Do not write learned locators back to page objects")
+    args = parser.parse_args(argv)
+
+    targets = discover_targets(args.paths, args.by)
+    if not targets:
+        print("ℹ️ No features or scenarios found")
+        return 0
+
+    workers = max(1, min(args.workers, len(targets)))
+    run_dir = os.path.join(args.output, datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(run_dir, exist_ok=True)
+    print(f"🚀 Running {len(targets)} targets on {workers} workers (reports in {run_dir})")
+
+    # Make sure the shared store exists before workers race to migrate it
+    LearnedLocatorStore(config.LEARNED_LOCATORS_DB).close()
+
+    worker_ids = multiprocessing.Queue()
+    for worker_id in range(1, workers + 1):
+        worker_ids.put(worker_id)
+
+    results = []
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(worker_ids,)) as pool:
+        futures = [pool.submit(run_target, target, run_dir, behave_args) for target in targets]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = "✅" if result["returncode"] == 0 else "❌"
+            print(f"{status} [worker {result['worker']}] {result['target']} ({result['duration']:.1f}s)")
+    wall_clock = time.time() - start_time
+
+    combined = merge_reports(run_dir)
+    serial_time = sum(result["duration"] for result in results)
+    combined["run"] = {
+        "targets": len(targets),
+        "workers": workers,
+        "passed": sum(1 for result in results if result["returncode"] == 0),
+        "failed": sum(1 for result in results if result["returncode"] != 0),
+        "wall_clock": wall_clock,
+        "serial_time": serial_time,
+        "speedup": serial_time / wall_clock if wall_clock else 0.0,
+        "results": sorted(results, key=lambda result: targets.index(result["target"]))
+    }
+    summary_path = os.path.join(run_dir, "summary.json")
+    atomic_write_json(summary_path, combined)
+    print_summary(combined)
+    print(f"📄 Combined report saved: {summary_path}")
+
+    # Workers only merge into the store; the page objects are updated once here
+    if not args.no_update_source:
+        store = LearnedLocatorStore(config.LEARNED_LOCATORS_DB)
+        try:
+            learned = store.load_locators()
+        finally:
+            store.close()
+        if learned:
+            print("\n📝 Updating source code with learned locators...")
+            update_source_code_with_locators("pages/login_page.py", learned)
+
+    return 0 if combined["run"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,582 @@
+"""
+Local stand-in for the OrangeHRM demo application
+
+Serves the login, dashboard, PIM employee list/add employee and leave pages on
+the same routes and with the same structure as the public demo, backed by a
+small in-memory store. Any mutation class of standin.markup can be applied to
+every page, so healing can be exercised against a redesign without a network.
+"""
+import html
+import random
+import secrets
+import time
+from urllib.parse import parse_qs, urlencode
+
+from standin.markup import MUTATORS, TARGET_ATTRIBUTE, Node
+
+PREFIX = "/web/index.php"
+LOGIN_PATH = PREFIX + "/auth/login"
+DASHBOARD_PATH = PREFIX + "/dashboard/index"
+SESSION_COOKIE = "orangehrm"
+
+USERS = {"Admin": "admin123"}
+LEAVE_TYPES = ["CAN - Bereavement", "CAN - FMLA", "CAN - Matternity", "CAN - Personal", "CAN - Vacation", "US - Personal"]
+
+# Behaviour is bound to data-standin-* attributes, which no mutation touches
+PAGE_SCRIPT = """
+document.addEventListener('click', function (event) {
+    var toggle = event.target.closest('[data-standin-toggle]');
+    if (toggle) {
+        var menu = document.querySelector('[data-standin-menu="' + toggle.getAttribute('data-standin-toggle') + '"]');
+        if (menu) { menu.style.display = menu.style.display === 'none' ? '' : 'none'; }
+        return;
+    }
+    var option = event.target.closest('[data-standin-option]');
+    if (option) {
+        var group = option.closest('[data-standin-select]');
+        group.querySelector('[data-standin-value]').value = option.getAttribute('data-standin-option');
+        group.querySelector('[data-standin-toggle]').firstChild.textContent = option.textContent;
+        group.querySelector('[data-standin-menu]').style.display = 'none';
+    }
+});
+"""
+
+
+class Response:
+    """Status, headers and body of one stand-in response"""
+
+    def __init__(self, status=200, body="", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+        self.headers.setdefault("Content-Type", "text/html; charset=utf-8")
+
+    @classmethod
+    def redirect(cls, location, headers=None):
+        return cls(302, "", dict({"Location": location}, **(headers or {})))
+
+
+class Backend:
+    """In-memory users, sessions, employees and leave requests"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Drop every session and restore the seed data"""
+        self.sessions = {}  # token -> {"user": name, "flash": message or None}
+        self.employees = [
+            {"number": 1, "id": "0001", "first": "Paul", "middle": "", "last": "Collings", "job": "Chief Financial Officer"},
+            {"number": 2, "id": "0002", "first": "Linda", "middle": "Jane", "last": "Anderson", "job": "HR Manager"},
+            {"number": 3, "id": "0003", "first": "Peter", "middle": "Mac", "last": "Anderson", "job": "Software Engineer"},
+        ]
+        self.leaves = []
+
+    def login(self, user, password):
+        """Start a session, returning its token, or None for bad credentials"""
+        if USERS.get(user) != password:
+            return None
+        token = secrets.token_hex(16)
+        self.sessions[token] = {"user": user, "flash": None}
+        return token
+
+    def add_employee(self, first, middle, last, employee_id):
+        number = max((employee["number"] for employee in self.employees), default=0) + 1
+        self.employees.append({
+            "number": number, "id": employee_id or f"{number:04d}", "first": first,
+            "middle": middle, "last": last, "job": ""
+        })
+        return number
+
+    def apply_leave(self, user, leave_type, from_date, to_date, comments):
+        self.leaves.append({
+            "user": user, "type": leave_type, "from": from_date, "to": to_date,
+            "comments": comments, "status": "Pending Approval", "applied_at": time.time()
+        })
+
+
+# ---------------------------------------------------------------- Pages
+
+def _document(title, body_children):
+    return Node("html", {"lang": "en"}, children=[
+        Node("head", children=[Node("title", text=title), Node("script", text=PAGE_SCRIPT)]),
+        Node("body", children=[Node("div", {"id": "app"}, children=body_children)])
+    ])
+
+
+def _input_group(label, input_node):
+    return Node("div", {"class": "oxd-input-group oxd-input-field-bottom-space"}, children=[
+        Node("div", {"class": "oxd-input-group__label-wrapper"}, children=[Node("label", {"class": "oxd-label"}, label)]),
+        Node("div", children=[input_node])
+    ])
+
+
+def _toast(message):
+    return Node("div", {"class": "oxd-toast-container oxd-toast-container--bottom"}, children=[
+        Node("div", {"class": "oxd-toast oxd-toast--success oxd-toast-container--toast", "role": "alert"}, children=[
+            Node("p", {"class": "oxd-text oxd-text--p oxd-text--toast-title oxd-toast-content-text"}, "Success"),
+            Node("p", {"class": "oxd-text oxd-text--p oxd-text--toast-message oxd-toast-content-text"}, message)
+        ], target="success_message")
+    ])
+
+
+def _chrome(module, title, content, tabs=(), flash=None, user="Paul Collings"):
+    """Top bar with module tabs and user menu, side menu and main area of every page behind the login"""
+    menu = [
+        ("Admin", "admin/viewAdminModule"), ("PIM", "pim/viewPimModule"), ("Leave", "leave/viewLeaveModule"),
+        ("Time", "time/viewTimeModule"), ("Recruitment", "recruitment/viewRecruitmentModule"),
+        ("My Info", "pim/viewMyDetails"), ("Performance", "performance/viewPerformanceModule"),
+        ("Dashboard", "dashboard/index"), ("Directory", "directory/viewDirectory"),
+        ("Maintenance", "maintenance/viewMaintenanceModule"), ("Claim", "claim/viewClaimModule"),
+        ("Buzz", "buzz/viewBuzz"),
+    ]
+    items = []
+    for label, route in menu:
+        classes = "oxd-main-menu-item" + (" active" if label == module else "")
+        link = Node("a", {"class": classes, "href": f"{PREFIX}/{route}"}, children=[
+            Node("span", {"class": "oxd-text oxd-text--span oxd-main-menu-item--name"}, label)
+        ], target=f"{label.lower()}_menu_item" if label in ("Admin", "PIM", "Leave") else None)
+        items.append(Node("li", {"class": "oxd-main-menu-item-wrapper"}, children=[link]))
+
+    topbar_tabs = [
+        Node("li", {"class": "oxd-topbar-body-nav-tab"}, children=[
+            Node("a", {"class": "oxd-topbar-body-nav-tab-item", "href": href}, label, target=target)
+        ])
+        for label, href, target in tabs
+    ]
+
+    header = Node("header", {"class": "oxd-topbar"}, children=[
+        Node("div", {"class": "oxd-topbar-header"}, children=[
+            Node("div", {"class": "oxd-topbar-header-title"}, children=[
+                Node("span", {"class": "oxd-topbar-header-breadcrumb"}, children=[
+                    Node("h6", {"class": "oxd-text oxd-text--h6 oxd-topbar-header-breadcrumb-module"}, title,
+                         target="dashboard_heading" if module == "Dashboard" else None)
+                ])
+            ]),
+            Node("div", {"class": "oxd-topbar-header-userarea"}, children=[Node("ul", children=[
+                Node("li", {"class": "oxd-userdropdown"}, children=[
+                    Node("span", {"class": "oxd-userdropdown-tab", "data-standin-toggle": "user-menu"}, children=[
+                        Node("img", {"class": "oxd-userdropdown-img", "alt": "profile picture", "src": "/favicon.ico"}),
+                        Node("p", {"class": "oxd-userdropdown-name"}, user)
+                    ], target="user_dropdown"),
+                    Node("ul", {"class": "oxd-dropdown-menu", "role": "menu", "data-standin-menu": "user-menu",
+                                "style": "display: none"}, children=[
+                        Node("li", children=[Node("a", {"class": "oxd-userdropdown-link", "href": f"{PREFIX}/help/help"}, "Support")]),
+                        Node("li", children=[Node("a", {"class": "oxd-userdropdown-link", "href": f"{PREFIX}/auth/logout"},
+                                                  "Logout", target="logout_link")]),
+                    ])
+                ])
+            ])])
+        ]),
+        Node("div", {"class": "oxd-topbar-body"}, children=[
+            Node("nav", {"class": "oxd-topbar-body-nav", "aria-label": "Topbar Menu"}, children=[Node("ul", children=topbar_tabs)])
+        ] if topbar_tabs else [])
+    ])
+
+    children = [Node("div", {"class": "oxd-layout"}, children=[
+        header,
+        Node("aside", {"class": "oxd-sidepanel"}, children=[
+            Node("nav", {"class": "oxd-navbar-nav", "aria-label": "Sidepanel"}, children=[
+                Node("div", {"class": "oxd-sidepanel-header"}, children=[
+                    Node("a", {"class": "oxd-brand", "href": f"{PREFIX}/dashboard/index"}, children=[
+                        Node("img", {"alt": "client brand banner", "src": "/favicon.ico"})
+                    ])
+                ]),
+                Node("ul", {"class": "oxd-main-menu"}, children=items)
+            ])
+        ]),
+        Node("div", {"class": "oxd-layout-container"}, children=[Node("div", {"class": "oxd-layout-context"}, children=[content])])
+    ])]
+    if flash:
+        children.append(_toast(flash))
+    return _document("OrangeHRM", children)
+
+
+def _table(headers, rows, row_target=None, status_column=None):
+    """Header row plus one row per entry, like the oxd-table component"""
+    header = Node("div", {"class": "oxd-table-header", "role": "rowgroup"}, children=[
+        Node("div", {"class": "oxd-table-header-row", "role": "row"}, children=[
+            Node("div", {"class": "oxd-table-header-cell", "role": "columnheader"}, label) for label in headers
+        ])
+    ])
+    body_rows = []
+    for index, row in enumerate(rows):
+        cells = []
+        for column, value in enumerate(row):
+            target = "leave_status_cell" if column == status_column and index == len(rows) - 1 else None
+            cells.append(Node("div", {"class": "oxd-table-cell", "role": "cell"}, children=[
+                Node("div", text=value or "")
+            ], target=target))
+        body_rows.append(Node("div", {"class": "oxd-table-card"}, children=[
+            Node("div", {"class": "oxd-table-row oxd-table-row--with-border", "role": "row"}, children=cells)
+        ]))
+    body = Node("div", {"class": "oxd-table-body", "role": "rowgroup"}, children=body_rows or [
+        Node("span", {"class": "oxd-text oxd-text--span"}, "No Records Found")
+    ])
+    return Node("div", {"class": "oxd-table", "role": "table"}, children=[header, body], target=row_target)
+
+
+def login_page(error=None):
+    form = Node("form", {"class": "oxd-form", "method": "post", "action": f"{PREFIX}/auth/validate"}, children=[
+        _input_group("Username", Node("input", {
+            "class": "oxd-input oxd-input--active", "name": "username", "placeholder": "Username", "autofocus": ""
+        }, target="username_field")),
+        _input_group("Password", Node("input", {
+            "class": "oxd-input oxd-input--active", "type": "password", "name": "password", "placeholder": "Password"
+        }, target="password_field")),
+        Node("div", {"class": "oxd-form-actions orangehrm-login-action"}, children=[
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--main orangehrm-login-button"},
+                 "Login", target="login_button")
+        ]),
+        Node("div", {"class": "orangehrm-login-forgot"}, children=[
+            Node("p", {"class": "oxd-text oxd-text--p orangehrm-login-forgot-header"}, "Forgot your password?")
+        ])
+    ], target="login_form")
+    slot = [
+        Node("div", {"class": "orangehrm-login-logo"}, children=[
+            Node("img", {"src": "/favicon.ico", "alt": "orangehrm-logo"}, target="logo")
+        ]),
+        Node("h5", {"class": "oxd-text oxd-text--h5 orangehrm-login-title"}, "Login"),
+    ]
+    if error:
+        slot.append(Node("div", {"class": "oxd-alert oxd-alert--error", "role": "alert"}, children=[
+            Node("p", {"class": "oxd-text oxd-text--p oxd-alert-content-text"}, error)
+        ]))
+    slot.append(form)
+    return _document("OrangeHRM", [Node("div", {"class": "orangehrm-login-layout"}, children=[
+        Node("div", {"class": "orangehrm-login-container"}, children=[
+            Node("div", {"class": "orangehrm-login-slot-wrapper"}, children=[
+                Node("div", {"class": "orangehrm-login-branding"}, children=[
+                    Node("img", {"src": "/favicon.ico", "alt": "company-branding"})
+                ]),
+                Node("div", {"class": "orangehrm-login-slot"}, children=slot)
+            ])
+        ])
+    ])])
+
+
+def dashboard_page(flash=None):
+    titles = ["Time at Work", "My Actions", "Quick Launch", "Buzz Latest Posts", "Employees on Leave Today"]
+    widgets = []
+    for title in titles:
+        body = []
+        if title == "Quick Launch":
+            body = [Node("div", {"class": "orangehrm-quick-launch"}, children=[
+                Node("div", {"class": "orangehrm-quick-launch-card"}, children=[
+                    Node("button", {"class": "oxd-icon-button orangehrm-quick-launch-icon", "title": label}, ""),
+                    Node("p", {"class": "oxd-text oxd-text--p orangehrm-quick-launch-heading", "title": label}, label)
+                ])
+                for label in ("Assign Leave", "Leave List", "Timesheets", "Apply Leave", "My Leave", "My Timesheet")
+            ], target="quick_launch_panel")]
+        widgets.append(Node("div", {"class": "oxd-grid-item oxd-grid-item--gutters orangehrm-dashboard-widget"}, children=[
+            Node("div", {"class": "orangehrm-dashboard-widget-header"}, children=[
+                Node("p", {"class": "oxd-text oxd-text--p"}, title)
+            ]),
+            Node("div", {"class": "orangehrm-dashboard-widget-body"}, children=body)
+        ]))
+    content = Node("div", {"class": "oxd-grid-3 orangehrm-dashboard-grid"}, children=widgets)
+    return _chrome("Dashboard", "Dashboard", content, flash=flash)
+
+
+PIM_TABS = [
+    ("Configuration", "#", None),
+    ("Employee List", f"{PREFIX}/pim/viewEmployeeList", None),
+    ("Add Employee", f"{PREFIX}/pim/addEmployee", "add_employee_button"),
+    ("Reports", f"{PREFIX}/pim/viewDefinedPredefinedReports", None),
+]
+
+
+def employee_list_page(employees, name_filter="", flash=None):
+    search = Node("form", {"class": "oxd-form", "method": "get", "action": f"{PREFIX}/pim/viewEmployeeList"}, children=[
+        Node("div", {"class": "oxd-form-row"}, children=[
+            _input_group("Employee Name", Node("input", {
+                "class": "oxd-input oxd-input--active", "name": "employeeName", "placeholder": "Type for hints...",
+                "value": name_filter
+            }, target="employee_name_search"))
+        ]),
+        Node("div", {"class": "oxd-form-actions"}, children=[
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--secondary orangehrm-left-space"},
+                 "Search", target="search_button")
+        ])
+    ])
+    rows = [
+        (employee["id"], f"{employee['first']} {employee['middle']}".strip(), employee["last"], employee["job"])
+        for employee in employees
+    ]
+    content = Node("div", {"class": "orangehrm-background-container"}, children=[
+        Node("div", {"class": "oxd-table-filter"}, children=[
+            Node("div", {"class": "oxd-table-filter-header"}, children=[
+                Node("h5", {"class": "oxd-text oxd-text--h5 oxd-table-filter-title"}, "Employee Information",
+                     target="employee_list_heading")
+            ]),
+            search
+        ]),
+        Node("div", {"class": "orangehrm-paper-container"}, children=[
+            Node("div", {"class": "orangehrm-header-container"}, children=[
+                Node("a", {"class": "oxd-button oxd-button--medium oxd-button--secondary", "href": f"{PREFIX}/pim/addEmployee"}, "Add")
+            ]),
+            Node("span", {"class": "oxd-text oxd-text--span"}, f"({len(rows)}) Records Found"),
+            _table(["Id", "First (& Middle) Name", "Last Name", "Job Title"], rows, row_target="employee_table")
+        ])
+    ])
+    return _chrome("PIM", "PIM", content, tabs=PIM_TABS, flash=flash)
+
+
+def add_employee_page():
+    def name_input(name, placeholder, target):
+        return Node("div", {"class": "oxd-input-group"}, children=[Node("input", {
+            "class": f"oxd-input oxd-input--active orangehrm-{name.lower()}", "name": name, "placeholder": placeholder
+        }, target=target)])
+
+    form = Node("form", {"class": "oxd-form", "method": "post", "action": f"{PREFIX}/pim/addEmployee"}, children=[
+        Node("div", {"class": "orangehrm-employee-container"}, children=[
+            Node("div", {"class": "orangehrm-employee-image"}, children=[
+                Node("input", {"type": "file", "class": "oxd-file-input", "name": "photo"}, target="photo_upload_button")
+            ]),
+            Node("div", {"class": "orangehrm-employee-form"}, children=[
+                Node("div", {"class": "oxd-form-row"}, children=[
+                    Node("div", {"class": "--name-grouped-field"}, children=[
+                        name_input("firstName", "First Name", "first_name_field"),
+                        name_input("middleName", "Middle Name", "middle_name_input"),
+                        name_input("lastName", "Last Name", "last_name_field"),
+                    ])
+                ]),
+                Node("div", {"class": "oxd-form-row"}, children=[
+                    _input_group("Employee Id", Node("input", {"class": "oxd-input oxd-input--active", "name": "employeeId"},
+                                                     target="employee_id_field"))
+                ])
+            ])
+        ]),
+        Node("div", {"class": "oxd-form-actions"}, children=[
+            Node("button", {"type": "button", "class": "oxd-button oxd-button--medium oxd-button--ghost"}, "Cancel"),
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--secondary orangehrm-left-space"},
+                 "Save", target="save_button")
+        ])
+    ])
+    content = Node("div", {"class": "orangehrm-card-container"}, children=[
+        Node("h6", {"class": "oxd-text oxd-text--h6 orangehrm-main-title"}, "Add Employee"), form
+    ])
+    return _chrome("PIM", "PIM", content, tabs=PIM_TABS)
+
+
+def employee_details_page(employee, flash=None):
+    content = Node("div", {"class": "orangehrm-edit-employee"}, children=[
+        Node("h6", {"class": "oxd-text oxd-text--h6 orangehrm-main-title"}, "Personal Details"),
+        Node("h6", {"class": "oxd-text oxd-text--h6 --strong"},
+             " ".join(part for part in (employee["first"], employee["middle"], employee["last"]) if part)),
+        Node("p", {"class": "oxd-text oxd-text--p"}, f"Employee Id: {employee['id']}")
+    ])
+    return _chrome("PIM", "PIM", content, tabs=PIM_TABS, flash=flash)
+
+
+LEAVE_TABS = [
+    ("Apply", f"{PREFIX}/leave/applyLeave", "apply_leave_menu"),
+    ("My Leave", f"{PREFIX}/leave/viewMyLeaveList", "my_leave_menu"),
+    ("Entitlements", "#", None),
+    ("Reports", "#", None),
+    ("Leave List", f"{PREFIX}/leave/viewLeaveList", None),
+    ("Assign Leave", f"{PREFIX}/leave/assignLeave", None),
+]
+
+
+def leave_list_page(leaves, title, flash=None):
+    rows = [(leave["from"] + " to " + leave["to"], leave["user"], leave["type"], leave["status"], leave["comments"])
+            for leave in leaves]
+    content = Node("div", {"class": "orangehrm-background-container"}, children=[
+        Node("div", {"class": "oxd-table-filter"}, children=[
+            Node("h5", {"class": "oxd-text oxd-text--h5 oxd-table-filter-title"}, title)
+        ]),
+        Node("div", {"class": "orangehrm-paper-container"}, children=[
+            Node("span", {"class": "oxd-text oxd-text--span"}, f"({len(rows)}) Records Found"),
+            _table(["Date", "Employee Name", "Leave Type", "Status", "Comments"], rows,
+                   row_target="leave_list_table", status_column=3)
+        ])
+    ])
+    return _chrome("Leave", "Leave", content, tabs=LEAVE_TABS, flash=flash)
+
+
+def apply_leave_page():
+    options = [
+        Node("div", {"class": "oxd-select-option", "role": "option", "data-standin-option": leave_type}, leave_type)
+        for leave_type in LEAVE_TYPES
+    ]
+    leave_type = Node("div", {"class": "oxd-input-group"}, children=[
+        Node("div", {"class": "oxd-input-group__label-wrapper"}, children=[Node("label", {"class": "oxd-label"}, "Leave Type")]),
+        Node("div", {"class": "oxd-select-wrapper", "data-standin-select": "leaveType"}, children=[
+            Node("input", {"type": "hidden", "name": "leaveType", "data-standin-value": ""}),
+            Node("div", {"class": "oxd-select-text oxd-select-text--active", "data-standin-toggle": "leave-types"}, children=[
+                Node("div", {"class": "oxd-select-text-input", "tabindex": "0"}, "-- Select --", target="leave_type_dropdown")
+            ]),
+            Node("div", {"class": "oxd-select-dropdown --positon-bottom", "role": "listbox",
+                         "data-standin-menu": "leave-types", "style": "display: none"}, children=options)
+        ])
+    ])
+    form = Node("form", {"class": "oxd-form", "method": "post", "action": f"{PREFIX}/leave/applyLeave"}, children=[
+        leave_type,
+        _input_group("From Date", Node("input", {"class": "oxd-input oxd-input--active", "name": "fromDate",
+                                                 "placeholder": "yyyy-dd-mm"}, target="from_date_input")),
+        _input_group("To Date", Node("input", {"class": "oxd-input oxd-input--active", "name": "toDate",
+                                               "placeholder": "yyyy-dd-mm"}, target="to_date_input")),
+        _input_group("Comments", Node("textarea", {"class": "oxd-textarea oxd-textarea--active oxd-textarea--resize-vertical",
+                                                   "name": "comments"}, target="comments_textarea")),
+        Node("div", {"class": "oxd-form-actions"}, children=[
+            Node("button", {"type": "submit", "class": "oxd-button oxd-button--medium oxd-button--secondary orangehrm-left-space"},
+                 "Apply", target="apply_button")
+        ])
+    ])
+    content = Node("div", {"class": "orangehrm-card-container"}, children=[
+        Node("h6", {"class": "oxd-text oxd-text--h6 orangehrm-main-title"}, "Apply Leave"), form
+    ])
+    return _chrome("Leave", "Leave", content, tabs=LEAVE_TABS)
+
+
+def module_page(module, title):
+    content = Node("div", {"class": "orangehrm-background-container"}, children=[
+        Node("h5", {"class": "oxd-text oxd-text--h5"}, title)
+    ])
+    return _chrome(module, module, content)
+
+
+# ---------------------------------------------------------------- Application
+
+class StandInApp:
+    """
+    Routes requests to pages and the in-memory backend
+
+    Pages render through the selected mutation class. Form handlers map
+    submitted field names back through the same mutation, so the application
+    keeps working when ids and names are renamed.
+    """
+
+    def __init__(self, variant="none"):
+        """
+        :param variant: Mutation class from standin.markup.MUTATORS applied to every page
+        """
+        self.backend = Backend()
+        self.set_variant(variant)
+
+    def set_variant(self, variant):
+        if variant not in MUTATORS:
+            raise ValueError(f"Unknown variant '{variant}', expected one of {', '.join(MUTATORS)}")
+        self.variant = variant
+
+    def render(self, name, root):
+        """
+        Apply the current variant to a page
+
+        :param name: Page name; seeds the mutation so a page always mutates the same way
+        :param root: Node tree of the page
+        :return: (HTML, dict of renamed field names)
+        """
+        renamed = MUTATORS[self.variant](root, random.Random(f"{name}:{self.variant}")) or {}
+        for node in root.walk():
+            node.attrs.pop(TARGET_ATTRIBUTE, None)
+        return "<!DOCTYPE html>\n" + root.render(), renamed
+
+    def _page(self, name, root, headers=None):
+        body, _ = self.render(name, root)
+        return Response(200, body, headers)
+
+    def _form(self, name, root, form):
+        """Map submitted field names of a page back to their original names"""
+        _, renamed = self.render(name, root)
+        original = {value: key for key, value in renamed.items()}
+        return {original.get(key, key): values[0] for key, values in form.items()}
+
+    def _session(self, cookies):
+        token = cookies.get(SESSION_COOKIE)
+        return token, self.backend.sessions.get(token)
+
+    def _take_flash(self, session):
+        flash, session["flash"] = session["flash"], None
+        return flash
+
+    def handle(self, method, path, query, body, cookies):
+        """
+        Serve one request
+
+        :param method: "GET" or "POST"
+        :param path: URL path
+        :param query: Query string
+        :param body: Form-encoded request body ("" for GET)
+        :param cookies: Dict of request cookies
+        :return: Response
+        """
+        params = parse_qs(query)
+        form = parse_qs(body, keep_blank_values=True)
+        path = path.rstrip("/") or "/"
+
+        if path == "/favicon.ico":
+            return Response(200, "", {"Content-Type": "image/x-icon"})
+        # Like the real app, a valid session skips the login form (session caches rely on this)
+        if path in ("/", PREFIX, PREFIX + "/auth", LOGIN_PATH):
+            if self._session(cookies)[1] is not None:
+                return Response.redirect(DASHBOARD_PATH)
+            if path != LOGIN_PATH:
+                return Response.redirect(LOGIN_PATH)
+            return self._page("login", login_page(params.get("error", [None])[0]))
+        if path == PREFIX + "/auth/validate" and method == "POST":
+            fields = self._form("login", login_page(), form)
+            token = self.backend.login(fields.get("username", ""), fields.get("password", ""))
+            if token is None:
+                return Response.redirect(LOGIN_PATH + "?" + urlencode({"error": "Invalid credentials"}))
+            return Response.redirect(DASHBOARD_PATH,
+                                     {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly; SameSite=Lax"})
+
+        token, session = self._session(cookies)
+        if session is None:
+            return Response.redirect(LOGIN_PATH)
+        if path == PREFIX + "/auth/logout":
+            self.backend.sessions.pop(token, None)
+            return Response.redirect(LOGIN_PATH, {"Set-Cookie": f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
+
+        if path == DASHBOARD_PATH:
+            return self._page("dashboard", dashboard_page(self._take_flash(session)))
+
+        if path == PREFIX + "/pim/viewPimModule":
+            return Response.redirect(PREFIX + "/pim/viewEmployeeList")
+        if path == PREFIX + "/pim/viewEmployeeList":
+            name_filter = self._form("employee_list", employee_list_page([]), params).get("employeeName", "").strip()
+            employees = [
+                employee for employee in self.backend.employees
+                if all(word in f"{employee['first']} {employee['middle']} {employee['last']}".lower()
+                       for word in name_filter.lower().split())
+            ]
+            return self._page("employee_list", employee_list_page(employees, name_filter, self._take_flash(session)))
+        if path == PREFIX + "/pim/addEmployee":
+            if method == "POST":
+                fields = self._form("add_employee", add_employee_page(), form)
+                number = self.backend.add_employee(
+                    fields.get("firstName", ""), fields.get("middleName", ""),
+                    fields.get("lastName", ""), fields.get("employeeId", "")
+                )
+                session["flash"] = "Successfully Saved"
+                return Response.redirect(f"{PREFIX}/pim/viewPersonalDetails/empNumber/{number}")
+            return self._page("add_employee", add_employee_page())
+        if path.startswith(PREFIX + "/pim/viewPersonalDetails/empNumber/"):
+            number = path.rsplit("/", 1)[-1]
+            employee = next((e for e in self.backend.employees if str(e["number"]) == number), None)
+            if employee is None:
+                return Response(404, html.escape(f"No employee {number}"))
+            return self._page("employee_details", employee_details_page(employee, self._take_flash(session)))
+
+        if path == PREFIX + "/leave/viewLeaveModule":
+            return Response.redirect(PREFIX + "/leave/viewLeaveList")
+        if path == PREFIX + "/leave/viewLeaveList":
+            return self._page("leave_list", leave_list_page(self.backend.leaves, "Leave List", self._take_flash(session)))
+        if path == PREFIX + "/leave/viewMyLeaveList":
+            leaves = [leave for leave in self.backend.leaves if leave["user"] == session["user"]]
+            return self._page("my_leave_list", leave_list_page(leaves, "My Leave List", self._take_flash(session)))
+        if path == PREFIX + "/leave/applyLeave":
+            if method == "POST":
+                fields = self._form("apply_leave", apply_leave_page(), form)
+                self.backend.apply_leave(session["user"], fields.get("leaveType", ""), fields.get("fromDate", ""),
+                                         fields.get("toDate", ""), fields.get("comments", ""))
+                session["flash"] = "Successfully Saved"
+                return Response.redirect(PREFIX + "/leave/viewMyLeaveList")
+            return self._page("apply_leave", apply_leave_page())
+
+        if path.startswith(PREFIX + "/"):
+            module = path[len(PREFIX) + 1:].split("/", 1)[0].capitalize()
+            return self._page(f"module_{module}", module_page(module, module))
+        return Response(404, "Not Found", {"Content-Type": "text/plain"})
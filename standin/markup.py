@@ -0,0 +1,149 @@
+"""
+Element trees for generated pages and the DOM mutations applied to them
+
+Shared by the local stand-in application and the healing benchmarks, so both
+serve the same kinds of redesign: renamed ids, names and classes, wrapper
+elements, reworded text and reordered siblings.
+"""
+import re
+from html import escape
+
+TARGET_ATTRIBUTE = "data-bench-target"
+
+VOID_TAGS = {"img", "input", "br", "hr", "meta", "link"}
+
+# Visible text and placeholders that a redesign typically rewords
+TEXT_CHANGES = {
+    "Login": "Log In", "Save": "Save Changes", "Cancel": "Discard", "Apply": "Submit",
+    "PIM": "Employees", "Admin": "Administration", "Leave": "Time Off", "Dashboard": "Home",
+    "Username": "User name", "Password": "Passphrase", "From Date": "Start Date", "To Date": "End Date",
+    "Employee Id": "Employee ID", "First Name": "Given Name", "Last Name": "Family Name",
+    "Middle Name": "Second Name", "Comments": "Notes", "Forgot your password?": "Trouble signing in?",
+}
+
+
+class Node:
+    """One element of a synthetic page"""
+
+    def __init__(self, tag, attrs=None, text="", children=None, target=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.text = text
+        self.children = list(children or [])
+        if target:
+            self.attrs[TARGET_ATTRIBUTE] = target
+
+    def walk(self):
+        """Yield this element and its descendants in document order"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def render(self, depth=0):
+        """Serialize to indented HTML"""
+        attrs = "".join(f' {key}="{escape(value)}"' for key, value in self.attrs.items())
+        indent = "  " * depth
+        if self.tag in VOID_TAGS:
+            return f"{indent}<{self.tag}{attrs}>"
+        if not self.children:
+            return f"{indent}<{self.tag}{attrs}>{escape(self.text)}</{self.tag}>"
+        inner = "\n".join(child.render(depth + 1) for child in self.children)
+        text = f"\n{indent}  {escape(self.text)}" if self.text else ""
+        return f"{indent}<{self.tag}{attrs}>{text}\n{inner}\n{indent}</{self.tag}>"
+
+
+# ---------------------------------------------------------------- Mutations
+
+def _rename(value, rng):
+    """A plausible refactor of an id or name"""
+    snake = re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", value).lower()
+    return rng.choice([
+        snake if snake != value else value + "_field",
+        f"emp-{value}",
+        f"{value}-{rng.randrange(16 ** 3):03x}",
+    ])
+
+
+def rename_ids(root, rng):
+    """
+    Rename every id and name attribute, keeping label references consistent
+
+    :return: Dict of original -> new value, so form handlers can map submitted names back
+    """
+    renamed = {}
+    for node in root.walk():
+        for attribute in ("id", "name"):
+            if node.attrs.get(attribute) and node.attrs[attribute] != "app":
+                value = node.attrs[attribute]
+                node.attrs[attribute] = renamed.setdefault(value, _rename(value, rng))
+        if node.attrs.get("for") in renamed:
+            node.attrs["for"] = renamed[node.attrs["for"]]
+    return renamed
+
+
+def rename_classes(root, rng):
+    """Replace class names the way a new design system or CSS modules would"""
+    renamed = {}
+    for node in root.walk():
+        if not node.attrs.get("class"):
+            continue
+        classes = []
+        for name in node.attrs["class"].split():
+            if name not in renamed:
+                renamed[name] = rng.choice([
+                    name.replace("oxd-", "hrm-").replace("orangehrm-", "ohrm-"),
+                    f"{name}_{rng.randrange(16 ** 5):05x}",
+                    f"css-{rng.randrange(16 ** 6):06x}",
+                ])
+            classes.append(renamed[name])
+        node.attrs["class"] = " ".join(classes)
+
+
+def wrap(root, rng):
+    """Put one or two extra wrapper elements around every target"""
+    for node in list(root.walk()):
+        for index, child in enumerate(node.children):
+            if TARGET_ATTRIBUTE in child.attrs:
+                wrapped = child
+                for _ in range(rng.randint(1, 2)):
+                    wrapped = Node(rng.choice(["div", "span"]), {"class": rng.choice(["wrapper", "field-shell", "slot"])},
+                                   children=[wrapped])
+                node.children[index] = wrapped
+
+
+def change_text(root, rng):
+    """Reword visible text, placeholders and labels"""
+    for node in root.walk():
+        if node.text.strip() in TEXT_CHANGES:
+            node.text = TEXT_CHANGES[node.text.strip()]
+        for attribute in ("placeholder", "title", "aria-label"):
+            if node.attrs.get(attribute) in TEXT_CHANGES:
+                node.attrs[attribute] = TEXT_CHANGES[node.attrs[attribute]]
+
+
+def reorder(root, rng):
+    """Shuffle the children of every element that has several"""
+    for node in root.walk():
+        if len(node.children) > 1 and node.tag not in ("html",):
+            rng.shuffle(node.children)
+
+
+def combined(root, rng):
+    """Renamed ids and classes with extra wrappers, the usual shape of a redesign"""
+    renamed = rename_ids(root, rng)
+    rename_classes(root, rng)
+    wrap(root, rng)
+    return renamed
+
+
+MUTATORS = {
+    "none": lambda root, rng: None,
+    "rename_ids": rename_ids,
+    "rename_classes": rename_classes,
+    "wrap": wrap,
+    "text": change_text,
+    "reorder": reorder,
+    "combined": combined,
+}
+
+
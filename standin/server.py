@@ -0,0 +1,147 @@
+"""
+HTTP server for the local OrangeHRM stand-in
+
+Usage:
+    python -m standin.server                       # http://127.0.0.1:8765/
+    python -m standin.server --port 9000 --variant combined
+    BASE_URL=http://127.0.0.1:8765/ behave         # run the suite against it
+    behave -D standin=none                         # or let behave start one in-process
+
+The variant can be switched while the server runs with
+GET /__standin/variant?name=<variant>; GET /__standin/reset restores the seed data.
+"""
+import argparse
+import logging
+import os
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from standin.app import Response, StandInApp
+from standin.markup import MUTATORS
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Hands every request to the StandInApp of its server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        body = ""
+        if method == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8", "replace")
+        cookies = {key: morsel.value for key, morsel in SimpleCookie(self.headers.get("Cookie", "")).items()}
+
+        try:
+            if url.path.startswith("/__standin/"):
+                response = self._control(url.path, parse_qs(url.query))
+            else:
+                response = self.server.app.handle(method, url.path, url.query, body, cookies)
+        except Exception as e:
+            logging.error(f"Stand-in failed to serve {method} {self.path}: {str(e)}")
+            response = Response(500, str(e), {"Content-Type": "text/plain"})
+
+        payload = response.body.encode("utf-8")
+        self.send_response(response.status)
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _control(self, path, params):
+        """Runtime switches used by tests and benchmarks"""
+        app = self.server.app
+        if path == "/__standin/variant":
+            if "name" in params:
+                try:
+                    app.set_variant(params["name"][0])
+                except ValueError as e:
+                    return Response(400, str(e), {"Content-Type": "text/plain"})
+            return Response(200, app.variant, {"Content-Type": "text/plain"})
+        if path == "/__standin/reset":
+            app.backend.reset()
+            return Response(200, "reset", {"Content-Type": "text/plain"})
+        return Response(404, "Not Found", {"Content-Type": "text/plain"})
+
+    def log_message(self, format, *args):
+        logging.debug(f"Stand-in {self.address_string()}: {format % args}")
+
+
+class StandInServer:
+    """
+    Serve the stand-in application from a background thread
+
+    Port 0 picks a free port; base_url is known once start() returns.
+    """
+
+    def __init__(self, host=None, port=None, variant="none"):
+        """
+        :param host: Interface to bind (config.STANDIN_HOST when None)
+        :param port: Port to bind (config.STANDIN_PORT when None, 0 for any free port)
+        :param variant: Mutation class served initially
+        """
+        self.host = host or config.STANDIN_HOST
+        self.port = config.STANDIN_PORT if port is None else port
+        self.app = StandInApp(variant)
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """Bind and start serving, returning the base URL"""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), StandInRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self.app
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="standin-server", daemon=True)
+        self.thread.start()
+        print(f"🧪 OrangeHRM stand-in serving '{self.app.variant}' markup at {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self.httpd is None:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join(timeout=5)
+        self.httpd = None
+        self.thread = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local OrangeHRM stand-in application")
+    parser.add_argument("--host", default=config.STANDIN_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=config.STANDIN_PORT, help="Port to bind (0 = any free port)")
+    parser.add_argument("--variant", default=os.environ.get("STANDIN_VARIANT", "none"), choices=list(MUTATORS),
+                        help="Mutated markup variant to serve")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = StandInServer(args.host, args.port, args.variant)
+    server.start()
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import pytest
+import config
+from benchmarks.healing_benchmark import SnapshotDriver
+from standin.app import StandInApp, login_page
+from utils.ai_self_healing import AISelfHealingDriver
+
+
+@pytest.fixture
+def healing_driver(tmp_path, monkeypatch):
+    """AISelfHealingDriver over the stand-in login page, with its own learned locator store"""
+    # The driver imports reports/learned_locators.json from the working directory into a new store
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "LEARNED_LOCATORS_DB", str(tmp_path / "learned_locators.db"))
+    monkeypatch.setattr(config, "USE_GENAI", False)
+    monkeypatch.setattr(config, "RECORD_DOM_SNAPSHOTS", False)
+    monkeypatch.setattr(config, "HEALING_TIME_BUDGET", 0)
+    html, _ = StandInApp().render("login", login_page())
+    driver = AISelfHealingDriver(SnapshotDriver(html, url="http://localhost/web/index.php/auth/login"))
+    yield driver
+    driver.locator_store.close()
@@ -0,0 +1,49 @@
+from utils.dom_distiller import CHARS_PER_TOKEN, distill, distilled_dom
+from utils.dom_snapshot import DOMSnapshot
+
+LOGIN_FORM = """
+<form class="oxd-form">
+  <div><div><input name="username" placeholder="Username"></div></div>
+  <div><div><input name="password" type="password"></div></div>
+  <div><button type="submit" class="oxd-button">Login</button></div>
+  <a href="/auth/requestPasswordResetCode">Forgot your password?</a>
+</form>
+"""
+
+# Bulky markup the model does not need around the form
+NOISE = "<script>var config = {};</script><style>.x { color: red; }</style>" + "<div><span></span></div>" * 200
+ROWS = "".join(f'<div class="oxd-table-row"><div>Employee {i}</div></div>' for i in range(300))
+
+PAGE = f"<html><head><title>OrangeHRM</title></head><body>{NOISE}{LOGIN_FORM}<div class='oxd-table'>{ROWS}</div></body></html>"
+
+
+def test_outline_keeps_interactive_elements_and_drops_noise():
+    outline = distilled_dom(DOMSnapshot(PAGE)).outline()
+
+    assert '<input name="username" placeholder="Username">' in outline
+    assert '<input name="password" type="password">' in outline
+    assert '<button type="submit" class="oxd-button"> Login' in outline
+    assert '<a href="/auth/requestPasswordResetCode"> Forgot your password?' in outline
+    assert "script" not in outline and "<span" not in outline and "<title" not in outline
+
+
+def test_outline_respects_token_budget():
+    distilled = distill(PAGE)
+
+    for max_tokens in (50, 200, 1000):
+        outline = distilled.outline(max_tokens=max_tokens)
+        lines = outline.splitlines()
+        # The elision marker is the only line allowed past the budget
+        assert sum(len(line) + 1 for line in lines[:-1]) <= max_tokens * CHARS_PER_TOKEN
+        assert lines[-1].startswith("... (")
+
+
+def test_focused_outline_keeps_the_target_within_budget():
+    distilled = distill(PAGE)
+    focus = {"tag": "input", "name": "password", "attrs": {"type": "password"}}
+
+    outline = distilled.outline(max_tokens=100, focus=focus)
+
+    assert '<input name="password" type="password">' in outline
+    assert '<button type="submit" class="oxd-button"> Login' in outline
+    assert len(outline) <= 100 * CHARS_PER_TOKEN + len("... (9999 more elements)")
@@ -0,0 +1,65 @@
+import pytest
+from selenium.webdriver.common.by import By
+from utils.ai_self_healing import AISelfHealingLocator
+from utils.dom_snapshot import DOMSnapshot
+from utils.snapshot_query import query
+
+# The for= label sits in a group with a different field than the one it names
+DETACHED_LABEL = (
+    '<html><body><form><label for="a">First</label><input id="b" class="x"><input id="a"></form></body></html>'
+)
+
+GROUPED_FIELDS = """
+<html><body>
+  <form class="oxd-form">
+    <div class="oxd-input-group"><div><label>Username</label></div><div><input class="oxd-input"></div></div>
+    <div class="oxd-input-group"><div><label>Password</label></div><div><input class="oxd-input" type="password"></div></div>
+    <div class="actions"><button type="submit" class="oxd-button">Login</button></div>
+  </form>
+</body></html>
+"""
+
+
+def test_detached_for_label_does_not_break_locators():
+    snapshot = DOMSnapshot(DETACHED_LABEL)
+    field = snapshot.by_id["a"][0]
+
+    locators = snapshot.locators_for(field)
+
+    assert (By.ID, "a") in locators
+    assert all(query(snapshot, by, value) == [field] for by, value in locators)
+
+
+def test_detached_for_label_does_not_abort_candidate_generation():
+    snapshot = DOMSnapshot(DETACHED_LABEL)
+    locator = AISelfHealingLocator("first_name", "first name input field", (By.ID, "first"))
+
+    candidates = locator.generate_candidates(snapshot)
+
+    assert (By.ID, "a") in candidates
+
+
+@pytest.mark.parametrize("xpath", [
+    "//input[@type='password']",
+    "//button[normalize-space()='Login']",
+])
+def test_locators_are_anchored_and_unique(xpath):
+    snapshot = DOMSnapshot(GROUPED_FIELDS)
+    node = query(snapshot, By.XPATH, xpath)[0]
+
+    locators = snapshot.locators_for(node)
+
+    assert locators
+    for by, value in locators:
+        assert query(snapshot, by, value) == [node]
+        assert not value.startswith("/html")
+
+
+def test_unlabelled_twin_fields_use_their_label_anchor():
+    snapshot = DOMSnapshot(GROUPED_FIELDS)
+    username = snapshot.by_class["oxd-input"][0]
+
+    locators = snapshot.locators_for(username)
+
+    assert any("label[normalize-space()='Username']" in value for _, value in locators)
+    assert all(query(snapshot, by, value) == [username] for by, value in locators)
@@ -0,0 +1,57 @@
+import pytest
+from utils import driver_factory
+from utils.driver_factory import DriverSessionPool
+
+
+class FakeDriver:
+    def __init__(self, browser):
+        self.browser = browser
+        self.implicit_wait = None
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+
+
+@pytest.fixture
+def browsers(monkeypatch):
+    """Browsers that currently fail to start; everything else starts"""
+    broken = set()
+
+    def create_driver(browser, headless=False):
+        if browser in broken:
+            raise OSError(f"{browser} did not start")
+        return FakeDriver(browser)
+
+    monkeypatch.setattr(driver_factory, "create_driver", create_driver)
+    return broken
+
+
+def test_failed_start_names_every_browser_tried(browsers):
+    browsers.update({"chrome", "edge"})
+    pool = DriverSessionPool(browsers=["chrome", "edge"], implicit_wait=5)
+
+    with pytest.raises(RuntimeError, match=r"tried: chrome \(OSError\), edge \(OSError\)"):
+        pool.acquire()
+    assert pool.browsers == ["chrome", "edge"]
+
+
+def test_pool_recovers_after_transient_start_failures(browsers):
+    browsers.update({"chrome", "edge"})
+    pool = DriverSessionPool(browsers=["chrome", "edge"], implicit_wait=5)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+    browsers.clear()
+    driver = pool.acquire()
+
+    assert (driver.browser, driver.implicit_wait) == ("chrome", 5)
+
+
+def test_remembered_browser_is_tried_first_then_the_others(browsers):
+    pool = DriverSessionPool(browsers=["chrome", "edge"])
+    browsers.add("chrome")
+    assert pool.acquire().browser == "edge"
+
+    browsers.add("edge")
+    browsers.discard("chrome")
+    assert pool.acquire().browser == "chrome"
@@ -0,0 +1,49 @@
+import ast
+from selenium.webdriver.common.by import By
+from utils.ai_self_healing import AISelfHealingLocator
+
+
+def _heal_username(healing_driver):
+    locator = AISelfHealingLocator("username_field", "username input field on login page", (By.NAME, "wrongusername"))
+    healing_driver.find_element(locator)
+    return locator
+
+
+def test_reports_are_driver_methods(healing_driver, tmp_path):
+    _heal_username(healing_driver)
+
+    dashboard = healing_driver.generate_dashboard(str(tmp_path / "dashboard.html"))
+    report = healing_driver.generate_html_report(str(tmp_path / "healing_report.html"))
+
+    assert "Self-Healing Dashboard" in open(dashboard, encoding="utf-8").read()
+    assert "username_field" in open(report, encoding="utf-8").read()
+
+
+def test_analyze_locators_counts_heals(healing_driver):
+    _heal_username(healing_driver)
+
+    analysis = healing_driver.analyze_locators()
+
+    assert analysis["most_healed_elements"] == [("username_field", 1)]
+    assert any("username_field" in recommendation for recommendation in analysis["recommendations"])
+
+
+def test_update_source_code_locators_writes_the_learned_primary(healing_driver, tmp_path):
+    locator = _heal_username(healing_driver)
+    page = tmp_path / "login_page.py"
+    page.write_text(
+        "from selenium.webdriver.common.by import By\n\n"
+        "class LoginPage:\n"
+        "    def __init__(self, driver):\n"
+        "        self.username_field = self.create_ai_locator(\n"
+        "            \"username_field\",\n"
+        "            \"username input field on login page\",\n"
+        "            (By.NAME, 'wrongusername'),\n"
+        "        )\n"
+    )
+
+    assert healing_driver.update_source_code_locators(str(page))
+
+    source = page.read_text()
+    ast.parse(source)
+    assert repr(locator.successful_strategy[1]) in source
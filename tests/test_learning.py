@@ -0,0 +1,29 @@
+from selenium.webdriver.common.by import By
+from utils.ai_self_healing import AISelfHealingLocator
+
+
+def test_primary_hits_are_ranked_but_not_learned(healing_driver):
+    primary = (By.CSS_SELECTOR, "button[type='submit']")
+    locator = AISelfHealingLocator("login_button", "login submit button", primary)
+
+    for _ in range(3):
+        healing_driver.element_cache = {}
+        healing_driver.find_element(locator)
+    healing_driver.flush_learning()
+
+    assert healing_driver.strategy_ranker.stats["login_button"][primary].successes == 3
+    assert "login_button" not in healing_driver.learned_locators
+    assert "login_button" not in healing_driver.locator_store.load_locators()
+
+
+def test_healed_winner_is_learned_without_the_primary(healing_driver):
+    primary = (By.NAME, "wrongusername")
+    locator = AISelfHealingLocator("username_field", "username input field on login page", primary)
+
+    healing_driver.find_element(locator)
+    healing_driver.flush_learning()
+
+    learned = healing_driver.learned_locators["username_field"]
+    assert learned and primary not in learned
+    assert learned[0] == locator.successful_strategy
+    assert healing_driver.locator_store.load_locators()["username_field"] == learned
@@ -0,0 +1,129 @@
+import ast
+import json
+import shutil
+import pytest
+from selenium.webdriver.common.by import By
+from utils.code_updater import update_source_code_with_locators
+from utils.locator_store import LearnedLocatorStore, by_attribute_name, normalize_by
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LearnedLocatorStore(str(tmp_path / "learned_locators.db"))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("stored, expected", [
+    ("name", By.NAME),
+    ("css selector", By.CSS_SELECTOR),
+    ("CSS_SELECTOR", By.CSS_SELECTOR),
+    ("XPATH", By.XPATH),
+    ("partial link text", By.PARTIAL_LINK_TEXT),
+    ("shadow", None),
+])
+def test_normalize_by_accepts_values_and_attribute_names(stored, expected):
+    assert normalize_by(stored) == expected
+
+
+def test_by_attribute_name_is_a_valid_by_attribute():
+    for by in (By.ID, By.NAME, By.CSS_SELECTOR, By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        assert getattr(By, by_attribute_name(by)) == by
+
+
+def test_legacy_json_import_reloads_both_spellings(tmp_path):
+    # Older runs wrote the By value ("name"), which getattr(By, ...) could not load back
+    legacy = tmp_path / "learned_locators.json"
+    legacy.write_text(json.dumps({
+        "username_field": [
+            {"by": "name", "value": "username"},
+            {"by": "CSS_SELECTOR", "value": "input[name='username']"},
+            {"by": "css selector", "value": "input[name='username']"},
+            {"by": "shadow", "value": "ignored"}
+        ],
+        "login_button": [{"by": "xpath", "value": "//button[normalize-space()='Login']"}]
+    }))
+    path = str(tmp_path / "learned_locators.db")
+
+    store = LearnedLocatorStore(path, legacy_json=str(legacy))
+    store.close()
+    store = LearnedLocatorStore(path, legacy_json=str(legacy))
+    try:
+        assert store.load_locators() == {
+            "username_field": [(By.NAME, "username"), (By.CSS_SELECTOR, "input[name='username']")],
+            "login_button": [(By.XPATH, "//button[normalize-space()='Login']")]
+        }
+    finally:
+        store.close()
+
+
+def test_save_locators_round_trips_in_order(store):
+    strategies = [(By.XPATH, "//label[normalize-space()='Username']/following::input[1]"), (By.NAME, "username")]
+    store.save_locators("username_field", strategies)
+    store.save_locators("username_field", list(reversed(strategies)))
+
+    assert store.load_locators() == {"username_field": list(reversed(strategies))}
+
+
+PAGE_OBJECT = '''from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+class LoginPage(BasePage):
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.username_field = self.create_ai_locator(
+            "username_field",
+            "username input field on login page",
+            (By.NAME, 'wrongusername'),  # AI-learned primary locator
+        )
+        self.login_button = self.create_ai_locator(
+            "login_button",
+            "login submit button",
+            (By.CSS_SELECTOR, "button[type='submit']"),  # AI-learned primary locator
+        )
+        self.logo = self.create_ai_locator(
+            "logo", "OrangeHRM logo on login page", (By.CSS_SELECTOR, "img.wrong-logo"), (By.TAG_NAME, "img")
+        )
+'''
+
+
+def _first_locators(source):
+    """element name -> first (By attribute, value) of every create_ai_locator call"""
+    locators = {}
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "create_ai_locator":
+            by, value = node.args[2].elts
+            locators[ast.literal_eval(node.args[0])] = (by.attr, ast.literal_eval(value))
+    return locators
+
+
+def test_source_update_keeps_quoted_selectors_valid(tmp_path):
+    page = tmp_path / "login_page.py"
+    page.write_text(PAGE_OBJECT)
+
+    updated = update_source_code_with_locators(str(page), {
+        "username_field": [(By.XPATH, "//input[@placeholder='Username']")],
+        "login_button": [(By.CSS_SELECTOR, "button[type='submit']")],
+        "logo": [(By.XPATH, "//img[@alt=\"orangehrm-logo\"]")]
+    })
+
+    source = page.read_text()
+    assert updated
+    assert _first_locators(source) == {
+        "username_field": ("XPATH", "//input[@placeholder='Username']"),
+        "login_button": ("CSS_SELECTOR", "button[type='submit']"),
+        "logo": ("XPATH", "//img[@alt=\"orangehrm-logo\"]")
+    }
+    assert "(By.CSS_SELECTOR, \"button[type='submit']\"),  # AI-learned primary locator" in source
+    assert '(By.TAG_NAME, "img")' in source
+
+
+def test_source_update_leaves_matching_primary_alone(tmp_path):
+    page = tmp_path / "login_page.py"
+    page.write_text(PAGE_OBJECT)
+    shutil.copy(page, tmp_path / "original.py")
+
+    updated = update_source_code_with_locators(str(page), {"login_button": [(By.CSS_SELECTOR, "button[type='submit']")]})
+
+    assert not updated
+    assert page.read_text() == (tmp_path / "original.py").read_text()
@@ -0,0 +1,78 @@
+import json
+import os
+import pytest
+from utils.report_aggregator import ReportAggregator
+
+
+def _write_report(path, scenario, events, mtime):
+    healed = sum(1 for event in events if event.get("succeeded"))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "scenario": {"name": scenario, "feature": "Login", "status": "passed"},
+            "summary": {"total_attempts": len(events), "successful_healing": healed, "failed_healing": len(events) - healed},
+            "events": events
+        }, f)
+    # Distinct mtimes regardless of the filesystem's timestamp resolution
+    os.utime(path, (mtime, mtime))
+
+
+def _event(element, succeeded=("name", "username")):
+    return {
+        "element": element, "description": f"{element} on login page", "failed": [["name", f"wrong{element}"]],
+        "succeeded": list(succeeded) if succeeded else None, "timestamp": "2026-10-17 09:00:00", "time_taken": 0.2
+    }
+
+
+@pytest.fixture
+def reports(tmp_path):
+    """The default layout: the aggregate database lives in the reports directory itself"""
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    aggregator = ReportAggregator(str(reports_dir / "aggregate.db"))
+    yield tmp_path, reports_dir, aggregator
+    aggregator.close()
+
+
+def test_pending_returns_only_rewritten_reports(reports):
+    root, reports_dir, aggregator = reports
+    first = str(reports_dir / "healing_report_first.json")
+    second = str(reports_dir / "healing_report_second.json")
+    _write_report(first, "Valid login", [_event("username_field")], 1_000_000)
+    _write_report(second, "Invalid login", [_event("password_field", None)], 1_000_000)
+
+    stats = aggregator.update(str(root))
+    assert (stats["ingested"], stats["events"]) == (2, 2)
+    assert aggregator.pending(str(root)) == {}
+
+    _write_report(second, "Invalid login", [_event("password_field"), _event("login_button")], 1_000_100)
+
+    assert list(aggregator.pending(str(root))) == [os.path.normpath(second)]
+
+
+def test_rewritten_report_replaces_its_totals(reports):
+    root, reports_dir, aggregator = reports
+    path = str(reports_dir / "healing_report_first.json")
+    _write_report(path, "Valid login", [_event("username_field", None)], 1_000_000)
+    aggregator.update(str(reports_dir))
+
+    _write_report(path, "Valid login", [_event("username_field"), _event("username_field")], 1_000_100)
+    stats = aggregator.update(str(reports_dir))
+
+    assert stats["ingested"] == 1
+    totals = {row["element"]: row for row in aggregator.element_totals()}
+    assert (totals["username_field"]["attempts"], totals["username_field"]["healed"]) == (2, 2)
+    assert aggregator.summary()["reports"] == 1
+
+
+def test_database_files_are_not_reports(reports):
+    root, reports_dir, aggregator = reports
+    report = str(reports_dir / "healing_report_x.json")
+    _write_report(report, "Scenario", [_event("username_field")], 1_000_000)
+    aggregator.close()
+
+    # Even a database named like a report is never ingested
+    odd = ReportAggregator(str(reports_dir / "healing_report_aggregate.json"))
+    try:
+        assert list(odd.pending(str(root))) == [os.path.normpath(report)]
+    finally:
+        odd.close()
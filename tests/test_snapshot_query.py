@@ -0,0 +1,142 @@
+import os
+import pytest
+from selenium.webdriver.common.by import By
+from utils.dom_snapshot import DOMSnapshot
+from utils.healing_replay import MATCH, replay
+from utils.snapshot_query import UnsupportedQuery, probe_snapshot, query
+
+RECORDING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "login_recording")
+
+PAGE = """
+<html>
+<body>
+  <div id="app" class="layout">
+    <form class="oxd-form" name="login">
+      <div class="group">
+        <label for="user">Username</label>
+        <input id="user" name="username" class="oxd-input oxd-input--active" placeholder="Username">
+      </div>
+      <div class="group">
+        <label>Password</label>
+        <input name="password" type="password" class="oxd-input" data-test="secret">
+      </div>
+      <button type="submit" class="oxd-button main">  Log   in </button>
+      <input type="hidden" name="token" value="x">
+    </form>
+    <ul class="menu">
+      <li><a href="/pim">PIM</a></li>
+      <li><a href="/leave/list">Leave List</a></li>
+      <li style="display: none"><a href="/admin">Admin</a></li>
+    </ul>
+  </div>
+</body>
+</html>
+"""
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    return DOMSnapshot(PAGE, url="http://localhost/login")
+
+
+def _describe(nodes):
+    """Tag plus name, id or text of each node, for readable assertions"""
+    return [
+        f"{node.tag}:{node.attrs.get('name') or node.attrs.get('id') or node.full_text(normalize=False)}"
+        for node in nodes
+    ]
+
+
+@pytest.mark.parametrize("by, value, expected", [
+    (By.ID, "user", ["input:username"]),
+    (By.NAME, "password", ["input:password"]),
+    (By.CLASS_NAME, "oxd-input", ["input:username", "input:password"]),
+    (By.TAG_NAME, "A", ["a:PIM", "a:Leave List", "a:Admin"]),
+    (By.LINK_TEXT, "Leave List", ["a:Leave List"]),
+    (By.PARTIAL_LINK_TEXT, "Lea", ["a:Leave List"]),
+])
+def test_simple_strategies(snapshot, by, value, expected):
+    assert _describe(query(snapshot, by, value)) == expected
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("input[name='username']", ["input:username"]),
+    ("form.oxd-form > div.group input", ["input:username", "input:password"]),
+    ("#app button[type=submit]", ["button:Log in"]),
+    ("input[placeholder^='User']", ["input:username"]),
+    ("input[data-test$=ret]", ["input:password"]),
+    ("input[class*='active']", ["input:username"]),
+    ("input[class~=oxd-input]", ["input:username", "input:password"]),
+    ("label + input", ["input:username", "input:password"]),
+    ("div.group ~ button", ["button:Log in"]),
+    ("ul.menu li:first-child a", ["a:PIM"]),
+    ("ul.menu li:nth-child(2) > a", ["a:Leave List"]),
+    ("li:last-of-type a", ["a:Admin"]),
+    ("button, input[type='password']", ["input:password", "button:Log in"]),
+])
+def test_css_subset(snapshot, selector, expected):
+    assert _describe(query(snapshot, By.CSS_SELECTOR, selector)) == expected
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("//input[@name='username']", ["input:username"]),
+    ("/html/body/div/form/button", ["button:Log in"]),
+    ("//form//input[@type='password']", ["input:password"]),
+    ("//label[text()='Password']/following-sibling::input", ["input:password"]),
+    ("//label[normalize-space()='Password']/following::input[1]", ["input:password"]),
+    ("//button[normalize-space()='Log in']", ["button:Log in"]),
+    ("//button[contains(@class, 'main') and @type='submit']", ["button:Log in"]),
+    ("//a[starts-with(@href, '/leave')]", ["a:Leave List"]),
+    ("//ul/li[2]/a", ["a:Leave List"]),
+    ("//ul/li[last()]/a", ["a:Admin"]),
+    ("//ul/li[position() < 3]/a", ["a:PIM", "a:Leave List"]),
+    ("//input[@name='password']/ancestor::form", ["form:login"]),
+    ("//input[@name='password']/preceding::label[1]", ["label:Password"]),
+    ("//input[@name='password']/..", ["div:Password"]),
+    ("//input[not(@type)]", ["input:username"]),
+    ("//a[.=concat('Leave', ' ', 'List')]", ["a:Leave List"]),
+    ("//a[translate(., 'PIM', 'pim')='pim']", ["a:PIM"]),
+])
+def test_xpath_subset(snapshot, expression, expected):
+    assert _describe(query(snapshot, By.XPATH, expression)) == expected
+
+
+@pytest.mark.parametrize("by, value", [
+    (By.CSS_SELECTOR, "input:focus"),
+    (By.CSS_SELECTOR, "li:nth-child(2n+1)"),
+    (By.CSS_SELECTOR, "div::before"),
+    (By.CLASS_NAME, "oxd-input oxd-input--active"),
+    (By.XPATH, "(//input)[1]"),
+    (By.XPATH, "//input | //button"),
+    (By.XPATH, "//input/namespace::x"),
+    (By.XPATH, "//input[count(@*) > 1]"),
+    (By.XPATH, "//input/@name"),
+    ("shadow selector", "input"),
+])
+def test_unsupported_queries(snapshot, by, value):
+    with pytest.raises(UnsupportedQuery):
+        query(snapshot, by, value)
+
+
+def test_probe_snapshot_counts_and_visibility(snapshot):
+    probes = probe_snapshot(snapshot, [
+        (By.CSS_SELECTOR, "ul.menu a"),
+        (By.XPATH, "//a[@href='/admin']"),
+        (By.NAME, "token"),
+        (By.XPATH, "(//a)[1]"),
+    ])
+
+    menu, admin, token, unsupported = probes
+    assert menu["count"] == 3 and menu["visible"] and menu["element"].full_text(normalize=False) == "PIM"
+    assert admin["count"] == 1 and not admin["visible"]
+    assert token["count"] == 1 and not token["visible"]
+    assert unsupported["count"] == 0 and unsupported["error"]
+    assert menu["fingerprint"]["tag"] == "a" and menu["fingerprint"]["attrs"]["href"] == "/pim"
+
+
+def test_replay_of_recorded_lookups_matches_live_run():
+    results = replay(RECORDING_DIR)
+
+    assert [result["locator"] for result in results] == ["username_field", "password_field", "login_button"]
+    assert all(result["status"] == MATCH for result in results), results
+    assert [result["stage"] for result in results] == ["primary", "dom_analysis", "primary"]
@@ -0,0 +1,85 @@
+from selenium.webdriver.common.by import By
+from utils.strategy_ranker import StrategyRanker, StrategyStats
+
+NOW = 1_000_000_000
+DAY = 24 * 3600
+
+FAST = (By.ID, "username")
+SLOW = (By.XPATH, "//form//input[1]")
+FLAKY = (By.NAME, "username")
+NEVER = (By.CSS_SELECTOR, "input.missing")
+
+
+def _record(ranker, strategy, successes, failures=0, latency=0.1):
+    for _ in range(successes):
+        ranker.record("username_field", strategy, True, latency)
+    for _ in range(failures):
+        ranker.record("username_field", strategy, False)
+
+
+def test_faster_strategy_ranks_first():
+    ranker = StrategyRanker()
+    _record(ranker, SLOW, 20, latency=0.8)
+    _record(ranker, FAST, 20, latency=0.05)
+
+    assert ranker.ordered("username_field") == [FAST, SLOW]
+
+
+def test_failures_push_a_strategy_down():
+    ranker = StrategyRanker()
+    _record(ranker, FLAKY, 10, failures=10, latency=0.05)
+    _record(ranker, FAST, 20, latency=0.05)
+
+    assert ranker.ordered("username_field") == [FAST, FLAKY]
+
+
+def test_strategies_that_never_won_are_not_ranked():
+    ranker = StrategyRanker()
+    _record(ranker, NEVER, 0, failures=3)
+    _record(ranker, FAST, 1)
+
+    assert ranker.ordered("username_field") == [FAST]
+
+
+def test_latency_is_smoothed():
+    stats = StrategyStats()
+    stats.record(True, 1.0, alpha=0.5, now=NOW)
+    stats.record(True, 0.0, alpha=0.5, now=NOW)
+
+    assert stats.latency == 0.5
+    assert (stats.last_success, stats.last_attempt) == (NOW, NOW)
+
+
+def test_evicts_strategies_without_a_recent_win():
+    ranker = StrategyRanker(max_age=14 * DAY)
+    ranker.load({"username_field": {
+        FAST: StrategyStats(5, 0, 0.1, last_success=NOW - DAY),
+        SLOW: StrategyStats(5, 0, 0.8, last_success=NOW - 15 * DAY, last_attempt=NOW - DAY),
+        NEVER: StrategyStats(0, 4, None, last_attempt=NOW - 15 * DAY),
+    }})
+
+    evicted = ranker.evict("username_field", now=NOW)
+
+    assert set(evicted) == {SLOW, NEVER}
+    assert list(ranker.stats["username_field"]) == [FAST]
+    assert ranker.take_pending("username_field") == ({}, {SLOW, NEVER})
+
+
+def test_recently_tried_losers_are_kept():
+    ranker = StrategyRanker(max_age=14 * DAY)
+    ranker.load({"username_field": {NEVER: StrategyStats(0, 2, None, last_attempt=NOW - DAY)}})
+
+    assert ranker.evict("username_field", now=NOW) == []
+    assert NEVER in ranker.stats["username_field"]
+
+
+def test_keeps_only_the_cheapest_strategies_within_the_limit():
+    ranker = StrategyRanker(limit=2)
+    ranker.load({"username_field": {
+        SLOW: StrategyStats(20, 0, 0.8, last_success=NOW),
+        FAST: StrategyStats(20, 0, 0.05, last_success=NOW),
+        FLAKY: StrategyStats(20, 0, 0.2, last_success=NOW),
+    }})
+
+    assert ranker.evict("username_field", now=NOW) == [SLOW]
+    assert ranker.ordered("username_field", evict=False) == [FAST, FLAKY]
@@ -1,10 +1,85 @@
 import logging
 import time
-import json
 import os
 import re
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from contextlib import contextmanager, nullcontext
+from html import escape as html_escape
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, InvalidSelectorException, WebDriverException
 from selenium.webdriver.common.by import By
+import config
+from utils.batch_probe import probe_locators, pick_best_probe
+from utils.dom_snapshot import DOMSnapshot, DOMSnapshotCache
+from utils.dom_observer import read_dom_version
+from utils.element_fingerprint import capture_fingerprint, same_element_identity
+from utils.similarity_ranker import rank_nodes
+from utils.locator_store import LearnedLocatorStore
+from utils.strategy_ranker import StrategyRanker, StrategyStats
+from utils.healing_element import HealingWebElement
+from utils.genai_healer import GenerativeHealer
+from utils.dom_distiller import distilled_dom
+from utils.dom_recorder import DOMRecorder
+from utils.report_renderer import render_healing_report, render_dashboard
+from utils.code_updater import update_source_code_with_locators
+from utils.command_profiler import command_profiler
+from utils.healing_events import event_stream, ProbeEvent, HealEvent, FailureEvent, LearnEvent
+from utils.healing_events import PRIMARY, FALLBACK, DOM_ANALYSIS, GENAI, RERESOLVE, PAGE
+from utils.step_timing import span, LOCATE, LOCATE_PRIMARY, LOCATE_FALLBACK, LOCATE_DOM_ANALYSIS, LOCATE_GENAI
+from utils.step_timing import LOCATE_PAGE_HEALING, NAVIGATION
+
+# Description words that say nothing about which element is meant
+DESCRIPTION_STOPWORDS = {
+    "the", "and", "with", "for", "after", "page", "field", "input", "button", "element",
+    "top", "left", "right", "corner", "main", "item", "module"
+}
+
+# Description words that hint at the element's tag
+TAG_HINTS = {
+    "input": ("input", "textarea"),
+    "field": ("input", "textarea"),
+    "username": ("input",),
+    "password": ("input",),
+    "textarea": ("textarea",),
+    "button": ("button",),
+    "link": ("a",),
+    "heading": ("h1", "h2", "h3", "h4", "h5", "h6"),
+    "title": ("h1", "h2", "h3", "h4", "h5", "h6"),
+    "table": ("table",),
+    "dropdown": ("select",),
+}
+
+# Elements that receive clicks and input; matches on their descendants are credited to them
+INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea"}
+
+def _read_implicit_wait(driver):
+    """
+    Read the implicit wait configured on a raw WebDriver
+    
+    :param driver: Raw Selenium WebDriver instance
+    :return: Implicit wait in seconds (0 if it cannot be read)
+    """
+    try:
+        return driver.timeouts.implicit_wait
+    except Exception as e:
+        logging.debug(f"Could not read implicit wait: {str(e)}")
+        return 0
+
+
+@contextmanager
+def suspended_implicit_wait(driver, restore_seconds):
+    """
+    Probe with the implicit wait set to zero and restore it afterwards
+    
+    :param driver: Raw Selenium WebDriver instance
+    :param restore_seconds: Implicit wait to put back when the block exits
+    """
+    if restore_seconds:
+        driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        if restore_seconds:
+            driver.implicitly_wait(restore_seconds)
+
 
 class AISelfHealingLocator:
     def __init__(self, name, element_description, *initial_locators):
@@ -18,22 +93,119 @@ class AISelfHealingLocator:
         self.name = name
         self.element_description = element_description
         self.locator_strategies = list(initial_locators)
+        self.initial_strategies = list(initial_locators)  # Strategies as written in the page object
         self.successful_strategy = None
         self.failed_strategies = []
+        self.last_fingerprint = None  # Fingerprint captured by a batched probe during the last lookup
+        self.page = None  # Page object that defined this locator, if any
+        self.stage = None  # Healing stage that resolved the last lookup (primary, fallback, dom_analysis, genai)
+        self.winner_latency = None  # Seconds taken by the WebDriver call that found the element in the last lookup
+        self._events = None  # HealingEventStream of the driver running the current lookup
         
         # Debug logging to see what's being passed
         logging.debug(f"Created locator '{name}' with strategies: {self.locator_strategies}")
         
-    def find_element(self, driver):
-        """Try different strategies to find the element with AI enhancement"""
+    def find_element(self, driver, healing_driver=None):
+        """
+        Try different strategies to find the element with AI enhancement
+        
+        Only the primary strategy waits for the element (the implicit wait); every
+        other strategy is probed with the implicit wait suspended, and healing stops
+        once config.HEALING_TIME_BUDGET is spent after the primary miss.
+        
+        :param driver: Raw Selenium WebDriver instance
+        :param healing_driver: Owning AISelfHealingDriver, if any (provides learned locators and wait settings)
+        :return: WebElement
+        """
         # First check if we have learned strategies for this element
-        if hasattr(driver, 'learned_locators') and self.name in driver.learned_locators:
+        learned_locators = getattr(healing_driver, 'learned_locators', None) or getattr(driver, 'learned_locators', {})
+        self.apply_learned_locators(learned_locators)
+        
+        # Only report the strategies that failed during this lookup
+        self.failed_strategies = []
+        self.last_fingerprint = None
+        self.stage = None
+        self.winner_latency = None
+        self._deadline = None
+        self._events = getattr(healing_driver, 'events', None)
+        
+        # The primary strategy is the only one allowed to wait for the page to render
+        element = self._find_primary(driver)
+        if element is not None:
+            return element
+        
+        budget = config.HEALING_TIME_BUDGET
+        self._deadline = time.monotonic() + budget if budget else None
+        
+        if config.BATCH_PROBE:
+            return self._find_element_batched(driver, healing_driver)
+        
+        implicit_wait = getattr(healing_driver, 'implicit_wait', None)
+        if implicit_wait is None:
+            implicit_wait = _read_implicit_wait(driver)
+        
+        with suspended_implicit_wait(driver, implicit_wait):
+            # Now try the remaining strategies without waiting on each miss
+            with span(LOCATE_FALLBACK, self.name):
+                for by, value in self.locator_strategies[1:]:
+                    if self._budget_exhausted():
+                        self._raise_not_found()
+                    start_time = time.perf_counter()
+                    try:
+                        element = driver.find_element(by, value)
+                        self.winner_latency = time.perf_counter() - start_time
+                        self._emit_probe(FALLBACK, 1, (by, value), start_time)
+                        
+                        # Remember the successful strategy
+                        self.successful_strategy = (by, value)
+                        self.stage = FALLBACK
+                        return element
+                        
+                    except (NoSuchElementException, StaleElementReferenceException):
+                        self._emit_probe(FALLBACK, 1, None, start_time)
+                        self.failed_strategies.append((by, value))
+                        continue
+            
+            with span(LOCATE_DOM_ANALYSIS, self.name):
+                # If all predefined strategies failed, analyze the DOM for potential elements
+                ai_locators = self._analyze_dom_for_element(driver, healing_driver)
+                
+                # Try the AI-generated locators
+                for by, value in ai_locators:
+                    if self._budget_exhausted():
+                        break
+                    start_time = time.perf_counter()
+                    try:
+                        element = driver.find_element(by, value)
+                        self.winner_latency = time.perf_counter() - start_time
+                        self._emit_probe(DOM_ANALYSIS, 1, (by, value), start_time)
+                        self._adopt_generated(by, value, DOM_ANALYSIS)
+                        return element
+                        
+                    except (NoSuchElementException, StaleElementReferenceException, InvalidSelectorException):
+                        self._emit_probe(DOM_ANALYSIS, 1, None, start_time)
+                        continue
+            
+            # Last resort: ask the model
+            element = self._heal_with_genai(driver, healing_driver)
+            if element is not None:
+                return element
+                
+        self._raise_not_found()
+
+    def apply_learned_locators(self, learned_locators):
+        """
+        Put the learned strategies of this element in front of the predefined ones
+        
+        :param learned_locators: Dict of element name -> list of (by, value)
+        """
+        if self.name in learned_locators:
             # Create a new list with learned strategies first, then original ones
             # Avoid duplicates
             strategies = []
             
             # Add learned strategies first
-            for strategy in driver.learned_locators[self.name]:
+            for strategy in learned_locators[self.name]:
                 if strategy not in strategies:
                     strategies.append(strategy)
             
@@ -44,175 +216,261 @@ class AISelfHealingLocator:
                     
             # Replace the strategies list with our optimized one
             self.locator_strategies = strategies
-            logging.info(f"Using learned locators for {self.name}: {strategies[0]}")
+            # Runs on every lookup: lazy arguments keep it free when debug logging is off
+            logging.debug("Using learned locators for %s: %s", self.name, strategies[0])
+
+    def _find_primary(self, driver):
+        """
+        Look up the primary strategy, waiting up to the implicit wait for it to appear
         
-        # Now try all strategies
-        for strategy_index, (by, value) in enumerate(self.locator_strategies):
+        :param driver: WebDriver instance
+        :return: WebElement or None if the primary strategy failed
+        """
+        by, value = self.locator_strategies[0]
+        start_time = time.perf_counter()
+        with span(LOCATE_PRIMARY, self.name):
             try:
-                logging.debug(f"Trying to find '{self.name}' with {by}={value}")
                 element = driver.find_element(by, value)
-                
-                # If this isn't the primary strategy but it worked, log it
-                if strategy_index > 0:
-                    logging.warning(
-                        f"Self-healing activated for '{self.name}': "
-                        f"Primary locator failed, using alternative: {by}={value}"
-                    )
-                    print(f"\n🔄 SELF-HEALING ACTIVATED for '{self.name}'")
-                    print(f"   ❌ Failed locator: {self.locator_strategies[0]}")
-                    print(f"   ✅ Successful locator: {by}={value}\n")
-                else:
-                    logging.debug(f"Found '{self.name}' with primary locator: {by}={value}")
-                
-                # Remember the successful strategy
+                self.winner_latency = time.perf_counter() - start_time
+                self._emit_probe(PRIMARY, 1, (by, value), start_time)
                 self.successful_strategy = (by, value)
+                self.stage = PRIMARY
                 return element
-                
             except (NoSuchElementException, StaleElementReferenceException):
-                logging.debug(f"Failed to find '{self.name}' with {by}={value}")
+                self._emit_probe(PRIMARY, 1, None, start_time)
                 self.failed_strategies.append((by, value))
-                continue
+                return None
+
+    def _emit_probe(self, stage, strategies, matched, start_time):
+        """Queue a ProbeEvent for a lookup that started at start_time (time.perf_counter())"""
+        if self._events is not None:
+            self._events.emit(ProbeEvent(self.name, stage, strategies, matched, time.perf_counter() - start_time))
+
+    def _budget_exhausted(self):
+        """Check whether this lookup has used up config.HEALING_TIME_BUDGET"""
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            logging.warning(f"Healing time budget of {config.HEALING_TIME_BUDGET}s exhausted for '{self.name}'")
+            return True
+        return False
+
+    def _find_element_batched(self, driver, healing_driver=None):
+        """
+        Find the element with one WebDriver call per healing stage instead of one per candidate
         
-        # If all predefined strategies failed, try DOM analysis
-        logging.warning(f"All predefined locators failed for '{self.name}'. Attempting DOM analysis...")
-        print(f"\n⚠️ All predefined locators failed for '{self.name}'. Attempting AI DOM analysis...")
+        Every fallback and DOM-analysis candidate is resolved in a single execute_script
+        round trip, which never waits on the implicit wait.
         
-        # Analyze DOM to find potential elements
-        ai_locators = self._analyze_dom_for_element(driver)
+        :param driver: WebDriver instance
+        :param healing_driver: Owning AISelfHealingDriver, if any
+        :return: WebElement
+        """
+        # Probe every remaining predefined strategy in one round trip
+        with span(LOCATE_FALLBACK, self.name):
+            winner = self._probe_batch(driver, self.locator_strategies[1:], FALLBACK)
+        if winner:
+            self.successful_strategy = (winner["by"], winner["value"])
+            self.stage = FALLBACK
+            self.last_fingerprint = winner["fingerprint"]
+            return winner["element"]
         
-        # Try the AI-generated locators
-        for by, value in ai_locators:
-            try:
-                element = driver.find_element(by, value)
-                
-                logging.warning(f"AI-generated locator successful for '{self.name}': {by}={value}")
-                print(f"🤖 AI-GENERATED LOCATOR SUCCESSFUL: {by}={value}")
-                
-                # Remember the successful strategy
-                self.successful_strategy = (by, value)
-                
-                # Add this to our strategies for future use
-                if (by, value) not in self.locator_strategies:
-                    self.locator_strategies.append((by, value))
-                    
-                return element
-                
-            except (NoSuchElementException, StaleElementReferenceException):
-                continue
-                
-        # If we get here, all strategies failed
+        if self._budget_exhausted():
+            self._raise_not_found()
+        
+        with span(LOCATE_DOM_ANALYSIS, self.name):
+            # Drop duplicates and strategies that already failed, keeping the generated order
+            candidates = []
+            for strategy in self._analyze_dom_for_element(driver, healing_driver):
+                if strategy not in candidates and strategy not in self.locator_strategies:
+                    candidates.append(strategy)
+            
+            winner = self._probe_batch(driver, candidates, DOM_ANALYSIS)
+        if winner:
+            self._adopt_generated(winner["by"], winner["value"], DOM_ANALYSIS)
+            self.last_fingerprint = winner["fingerprint"]
+            return winner["element"]
+        
+        # Last resort: ask the model
+        element = self._heal_with_genai(driver, healing_driver)
+        if element is not None:
+            return element
+        
+        self._raise_not_found()
+
+    def _probe_batch(self, driver, strategies, stage):
+        """
+        Probe a list of strategies in one round trip and record the misses
+        
+        :param driver: WebDriver instance
+        :param strategies: Ordered list of (by, value) tuples
+        :param stage: Healing stage the probe belongs to, for the event stream
+        :return: Winning probe dict or None
+        """
+        start_time = time.perf_counter()
+        probes = probe_locators(driver, strategies)
+        winner = pick_best_probe(probes)
+        if winner:
+            self.winner_latency = time.perf_counter() - start_time
+        if probes:
+            self._emit_probe(stage, len(probes), (winner["by"], winner["value"]) if winner else None, start_time)
+        for probe in probes:
+            if probe is winner:
+                break
+            if not probe["count"]:
+                self.failed_strategies.append((probe["by"], probe["value"]))
+        return winner
+
+    def _heal_with_genai(self, driver, healing_driver=None):
+        """
+        Ask the generative healer for locators and keep the first one that matches in the browser
+        
+        Only runs once the predefined strategies and DOM analysis have failed.
+        
+        :param driver: WebDriver instance
+        :param healing_driver: Owning AISelfHealingDriver, which holds the healer
+        :return: WebElement or None
+        """
+        healer = getattr(healing_driver, 'genai_healer', None)
+        if healer is None or healer.disabled:
+            return None
+        
+        with span(LOCATE_GENAI, self.name):
+            logging.info(f"Asking {healer.model} for locators for '{self.name}'")
+            # Centre the outline on where the element was last seen, if known
+            snapshot = self._current_snapshot(driver, healing_driver)
+            fingerprint = getattr(healing_driver, 'fingerprints', {}).get(self.name)
+            outline = distilled_dom(snapshot).outline(max_tokens=config.GENAI_DOM_TOKENS, focus=fingerprint)
+            suggestions = [
+                strategy for strategy in healer.suggest(self.element_description, outline)
+                if strategy not in self.locator_strategies
+            ]
+        
+            # The model can be wrong, so every suggestion is checked in the page
+            winner = self._probe_batch(driver, suggestions, GENAI)
+            if winner:
+                self._adopt_generated(winner["by"], winner["value"], GENAI)
+                self.last_fingerprint = winner["fingerprint"]
+                return winner["element"]
+        
+            logging.warning(f"None of the {len(suggestions)} generated locators matched '{self.name}'")
+            return None
+
+    def _adopt_generated(self, by, value, stage):
+        """Remember a DOM-analysis or model-generated strategy that located the element"""
+        self.successful_strategy = (by, value)
+        self.stage = stage
+        
+        # Add this to our strategies for future use
+        if (by, value) not in self.locator_strategies:
+            self.locator_strategies.append((by, value))
+
+    def _raise_not_found(self):
+        """Raise the final NoSuchElementException once every strategy has failed"""
         strategies_tried = ', '.join([f"{by}='{value}'" for by, value in self.locator_strategies])
         logging.error(f"Self-healing failed for '{self.name}'. Tried: {strategies_tried}")
         raise NoSuchElementException(
             f"Self-healing failed for '{self.name}'. Tried: {strategies_tried}"
         )
 
-    def _analyze_dom_for_element(self, driver):
+    def _analyze_dom_for_element(self, driver, healing_driver=None):
         """
         Analyze the DOM to find potential matching elements when all locators fail
         
         :param driver: WebDriver instance
+        :param healing_driver: Owning AISelfHealingDriver, whose snapshot cache is shared by every heal on the page
         :return: List of potential locator strategies
         """
-        logging.info(f"Analyzing DOM to find '{self.name}' with description: {self.element_description}")
-        print(f"\n🔍 AI ANALYSIS: Searching DOM for '{self.name}'...")
+        snapshot = self._current_snapshot(driver, healing_driver)
+        
+        # Candidates only change when the DOM does, so they live on the snapshot
+        potential_locators = snapshot.candidates.get(self.name)
+        if potential_locators is None:
+            fingerprint = getattr(healing_driver, 'fingerprints', {}).get(self.name)
+            potential_locators = self.generate_candidates(snapshot, fingerprint)
+            snapshot.candidates[self.name] = potential_locators
         
+        return potential_locators
+
+    def _current_snapshot(self, driver, healing_driver=None):
+        """Snapshot of the current DOM, shared through the driver's cache when available"""
+        snapshot_cache = getattr(healing_driver, 'snapshot_cache', None)
+        if snapshot_cache is not None:
+            return snapshot_cache.get(driver, healing_driver.dom_version())
+        return DOMSnapshot(driver.page_source)
+
+    def generate_candidates(self, snapshot, fingerprint=None, max_candidates=20):
+        """
+        Rank snapshot elements against the element description and return their locators
+        
+        Every candidate points at an element that exists in the snapshot, so nothing
+        is probed that cannot match. Elements closest to the last known-good
+        fingerprint come before keyword matches.
+        
+        :param snapshot: DOMSnapshot of the current page
+        :param fingerprint: Last known-good fingerprint of this element, if any
+        :param max_candidates: Maximum number of elements to return locators for
+        :return: List of (by, value) tuples, best match first
+        """
         potential_locators = []
+        if fingerprint:
+            for node, similarity in rank_nodes(snapshot, fingerprint):
+                logging.debug("Fingerprint match for '%s': %s (%.2f)", self.name, node, similarity)
+                for strategy in snapshot.locators_for(node):
+                    if strategy not in potential_locators:
+                        potential_locators.append(strategy)
         
-        # Get page source for analysis
-        page_source = driver.page_source
+        description = self.element_description.lower()
+        words = [re.sub(r"[^a-z0-9]", "", word) for word in description.replace("'s", "").split()]
+        keywords = [word for word in words if len(word) >= 3 and word not in DESCRIPTION_STOPWORDS]
         
-        # Extract all input elements
-        if 'input' in self.element_description.lower() or 'field' in self.element_description.lower() or 'username' in self.element_description.lower() or 'password' in self.element_description.lower():
-            # Try to find input elements
-            input_pattern = re.compile(r'<input[^>]*>', re.IGNORECASE)
-            inputs = input_pattern.findall(page_source)
-            
-            for input_html in inputs:
-                # Check if this input matches our description
-                if 'username' in self.element_description.lower() and ('username' in input_html.lower() or 'user' in input_html.lower() or 'email' in input_html.lower()):
-                    # Extract attributes
-                    id_match = re.search(r'id=["\'](.*?)["\']', input_html)
-                    name_match = re.search(r'name=["\'](.*?)["\']', input_html)
-                    class_match = re.search(r'class=["\'](.*?)["\']', input_html)
-                    
-                    if id_match:
-                        potential_locators.append((By.ID, id_match.group(1)))
-                    if name_match:
-                        potential_locators.append((By.NAME, name_match.group(1)))
-                    if class_match:
-                        potential_locators.append((By.CLASS_NAME, class_match.group(1)))
-                        
-                elif 'password' in self.element_description.lower() and ('password' in input_html.lower() or 'pwd' in input_html.lower()):
-                    # Extract attributes
-                    id_match = re.search(r'id=["\'](.*?)["\']', input_html)
-                    name_match = re.search(r'name=["\'](.*?)["\']', input_html)
-                    class_match = re.search(r'class=["\'](.*?)["\']', input_html)
-                    
-                    if id_match:
-                        potential_locators.append((By.ID, id_match.group(1)))
-                    if name_match:
-                        potential_locators.append((By.NAME, name_match.group(1)))
-                    if class_match:
-                        potential_locators.append((By.CLASS_NAME, class_match.group(1)))
-        
-        # Extract all button elements
-        elif 'button' in self.element_description.lower() or 'login button' in self.element_description.lower():
-            # Try to find button elements
-            button_pattern = re.compile(r'<button[^>]*>.*?</button>', re.IGNORECASE | re.DOTALL)
-            buttons = button_pattern.findall(page_source)
-            
-            for button_html in buttons:
-                # Check if this button matches our description
-                if 'login' in self.element_description.lower() and ('login' in button_html.lower() or 'sign in' in button_html.lower() or 'submit' in button_html.lower()):
-                    # Extract attributes
-                    id_match = re.search(r'id=["\'](.*?)["\']', button_html)
-                    class_match = re.search(r'class=["\'](.*?)["\']', button_html)
-                    type_match = re.search(r'type=["\'](.*?)["\']', button_html)
-                    
-                    if id_match:
-                        potential_locators.append((By.ID, id_match.group(1)))
-                    if class_match:
-                        potential_locators.append((By.CLASS_NAME, class_match.group(1)))
-                    if type_match and type_match.group(1) == 'submit':
-                        potential_locators.append((By.CSS_SELECTOR, f"button[type='submit']"))
-                    
-                    # Extract button text
-                    text_match = re.search(r'<button[^>]*>(.*?)</button>', button_html)
-                    if text_match and text_match.group(1).strip():
-                        text = text_match.group(1).strip()
-                        potential_locators.append((By.XPATH, f"//button[contains(text(), '{text}')]"))
-        
-        # Add generic XPath locators based on element description keywords
-        keywords = self.element_description.lower().split()
+        hinted_tags = set()
+        for hint, tags in TAG_HINTS.items():
+            if hint in words:
+                hinted_tags.update(tags)
+        
+        scores = {}
+        
+        def add(nodes, weight):
+            for node in nodes:
+                if node.in_svg:
+                    continue
+                # A label names the field after it, not itself
+                if node.tag == "label":
+                    node = snapshot.labelled_field(node) or node
+                # Text usually sits in a span inside the clickable element
+                if node.tag not in INTERACTIVE_TAGS:
+                    for depth, ancestor in enumerate(node.ancestors()):
+                        if depth >= 3:
+                            break
+                        if ancestor.tag in INTERACTIVE_TAGS:
+                            node = ancestor
+                            break
+                scores[node.index] = scores.get(node.index, 0) + weight
+        
+        class_tokens = snapshot.class_token_index()
         for keyword in keywords:
-            if len(keyword) > 3:  # Only use meaningful keywords
-                potential_locators.append((By.XPATH, f"//*[contains(@id, '{keyword}')]"))
-                potential_locators.append((By.XPATH, f"//*[contains(@name, '{keyword}')]"))
-                potential_locators.append((By.XPATH, f"//*[contains(@class, '{keyword}')]"))
-                potential_locators.append((By.XPATH, f"//*[contains(text(), '{keyword}')]"))
-        
-        # Add common locators for input fields
-        if 'username' in self.element_description.lower():
-            potential_locators.append((By.NAME, "username"))
-            potential_locators.append((By.CSS_SELECTOR, "input[name='username']"))
-            potential_locators.append((By.XPATH, "//input[@name='username']"))
-            potential_locators.append((By.CSS_SELECTOR, "input[type='text']"))
-            
-        if 'password' in self.element_description.lower():
-            potential_locators.append((By.NAME, "password"))
-            potential_locators.append((By.CSS_SELECTOR, "input[name='password']"))
-            potential_locators.append((By.XPATH, "//input[@name='password']"))
-            potential_locators.append((By.CSS_SELECTOR, "input[type='password']"))
-            
-        if 'button' in self.element_description.lower() or 'login' in self.element_description.lower():
-            potential_locators.append((By.CSS_SELECTOR, "button[type='submit']"))
-            potential_locators.append((By.XPATH, "//button[@type='submit']"))
-            potential_locators.append((By.XPATH, "//button[contains(text(), 'Login')]"))
+            add(snapshot.by_id_token.get(keyword, ()), 3)
+            add(snapshot.by_name_token.get(keyword, ()), 3)
+            add(snapshot.by_attr_token.get(keyword, ()), 3)
+            add(snapshot.by_text.get(keyword, ()), 2)
+            add(class_tokens.get(keyword, ()), 1)
+            # Compound class names such as "oxd-userdropdown-tab" only match as substrings
+            for token, nodes in class_tokens.items():
+                if keyword in token and keyword != token:
+                    add(nodes, 1)
         
-        logging.info(f"DOM analysis found {len(potential_locators)} potential locators for '{self.name}'")
-        print(f"🔍 AI ANALYSIS: Found {len(potential_locators)} potential locators for '{self.name}'")
+        for tag in hinted_tags:
+            add(snapshot.by_tag.get(tag, ()), 2)
+        if 'password' in words:
+            add(snapshot.by_type.get('password', ()), 3)
+        if 'button' in words or 'login' in words or 'submit' in words:
+            add(snapshot.by_type.get('submit', ()), 1)
         
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:max_candidates]
+        
+        for index, score in ranked:
+            for strategy in snapshot.locators_for(snapshot.nodes[index]):
+                if strategy not in potential_locators:
+                    potential_locators.append(strategy)
         return potential_locators
 
 class AISelfHealingDriver:
@@ -229,6 +487,34 @@ class AISelfHealingDriver:
             "healing_events": []
         }
         self.learned_locators = {}  # Store learned locator strategies
+        self.defined_primaries = {}  # Locator name -> primary strategy as written in the page object
+        self.implicit_wait = _read_implicit_wait(driver)
+        self.snapshot_cache = DOMSnapshotCache()  # Parsed page shared by every heal on the same DOM
+        self.fingerprints = {}  # Last known-good element fingerprint per locator name
+        self.fingerprint_versions = {}  # Locator name -> DOM version its fingerprint was captured in
+        self.element_cache = {}  # Locator name -> (DOM version, HealingWebElement)
+        
+        # Model-backed healing tier, used only after the heuristics fail
+        self.genai_healer = None
+        if config.USE_GENAI:
+            self.genai_healer = GenerativeHealer(
+                config.GENAI_ENDPOINT,
+                config.GENAI_MODEL,
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                cache_dir=config.GENAI_CACHE_DIR,
+                timeout=config.GENAI_TIMEOUT
+            )
+        
+        # Probe/heal/failure/learn records, written and printed off the lookup path
+        self.events = event_stream()
+        
+        # Optional latency profile of every WebDriver command this driver sends
+        self.profiler = command_profiler() if config.PROFILE_COMMANDS else None
+        if self.profiler is not None:
+            self.profiler.install(driver)
+        
+        # Optional evidence of every lookup for offline replay
+        self.dom_recorder = DOMRecorder(config.DOM_RECORDINGS_DIR) if config.RECORD_DOM_SNAPSHOTS else None
         
         # Create reports directory if it doesn't exist
         if not os.path.exists("reports"):
@@ -236,20 +522,146 @@ class AISelfHealingDriver:
             logging.info("Created reports directory")
         
         # Load any previously learned locators
+        self.locator_store = LearnedLocatorStore(
+            config.LEARNED_LOCATORS_DB,
+            legacy_json="reports/learned_locators.json",
+            legacy_fingerprints_json="reports/element_fingerprints.json"
+        )
+        self.strategy_ranker = StrategyRanker(
+            alpha=config.STRATEGY_LATENCY_ALPHA,
+            max_age=config.STRATEGY_MAX_AGE_DAYS * 24 * 3600,
+            limit=config.STRATEGY_LIMIT
+        )
         self.load_learned_locators()
+        self.load_fingerprints()
+        
+    def get(self, url):
+        """
+        Navigate to a URL and start tracking DOM mutations on the new document
+        
+        :param url: URL to load
+        :return: DOM version of the loaded page
+        """
+        with span(NAVIGATION, url):
+            self.driver.get(url)
+        return self.dom_version()
+        
+    def dom_version(self):
+        """
+        Current DOM version as (url, document token, mutation generation)
+        
+        The version only changes on navigation or a real DOM mutation, so anything
+        derived from the DOM can be cached under it.
         
+        :return: Version tuple, or None if the page cannot be queried
+        """
+        return read_dom_version(self.driver)
+        
+    def implicitly_wait(self, seconds):
+        """
+        Set the implicit wait on the wrapped driver and remember it for healing lookups
+        
+        :param seconds: Implicit wait in seconds
+        """
+        self.driver.implicitly_wait(seconds)
+        self.implicit_wait = seconds
+
+    def reset_session_state(self):
+        """
+        Bring a reused browser session back to a clean state for the next scenario
+
+        Closes extra windows, clears cookies and web storage, loads about:blank and
+        starts a fresh healing report. Learned locators and fingerprints are kept.
+        """
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+        # Storage is per origin, so clear it before leaving the page
+        try:
+            self.driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except WebDriverException as e:
+            logging.debug(f"Could not clear web storage: {str(e)}")
+
+        # Chromium can drop cookies of every domain at once; elsewhere only the current one
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            self.driver.delete_all_cookies()
+
+        self.driver.get("about:blank")
+        self.snapshot_cache.clear()
+        self.element_cache = {}
+        self.healing_stats = {
+            "healed_count": 0,
+            "failed_count": 0,
+            "healing_events": []
+        }
+
     def find_element(self, locator):
         """
         Find element using AI self-healing locator
         
+        Resolved elements are cached per locator for the current DOM version, so
+        repeated interactions with the same element cost one version check.
+        
         :param locator: AISelfHealingLocator instance
-        :return: WebElement
+        :return: HealingWebElement
+        """
+        # Time not spent in a healing stage is lookup bookkeeping
+        with span(LOCATE, locator.name), self.profiled(locator.name):
+            return self._find_element(locator)
+    
+    def profiled(self, name):
+        """
+        Charge the WebDriver commands of a block to a locator in the command profile
+        
+        :param name: Locator name
+        :return: Context manager (a no-op unless config.PROFILE_COMMANDS is on)
         """
+        return self.profiler.scope(name) if self.profiler is not None else nullcontext()
+    
+    def _find_element(self, locator):
+        """Look up, record, learn from and cache one locator (see find_element)"""
+        # The version read for the cache check is reused to cache the result and to
+        # skip fingerprint captures, so a primary hit costs no extra round trips.
+        # A mutation during the lookup only makes the next check miss.
+        version = None
+        if config.CACHE_ELEMENT_HANDLES:
+            version = self.dom_version()
+            cached = self.element_cache.get(locator.name)
+            if cached and cached[0] is not None and cached[0] == version:
+                logging.debug("Reusing cached element for '%s'", locator.name)
+                return cached[1]
+        
+        self.defined_primaries[locator.name] = locator.initial_strategies[0]
+        
+        # The locator as it stood before this lookup, for the recorder
+        recording = self._recording_entry(locator) if self.dom_recorder else None
+        
+        start_time = time.time()
         try:
-            start_time = time.time()
-            element = locator.find_element(self.driver)
+            element = locator.find_element(self.driver, self)
             end_time = time.time()
             
+            if recording is not None:
+                recording["outcome"] = {
+                    "strategy": locator.successful_strategy,
+                    "healed": locator.successful_strategy != locator.locator_strategies[0],
+                    "time": end_time - start_time
+                }
+                self.dom_recorder.record(self.driver, self.dom_version(), recording)
+            
+            if config.CAPTURE_FINGERPRINTS:
+                self._record_fingerprint(locator, element, version)
+            
+            # Learn from every lookup, not only from heals
+            self._learn_from_lookup(locator, locator.winner_latency)
+            
             # If not using the primary strategy but it worked, count as healed
             if locator.successful_strategy != locator.locator_strategies[0]:
                 self.healing_stats["healed_count"] += 1
@@ -261,15 +673,13 @@ class AISelfHealingDriver:
                     "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                     "time_taken": end_time - start_time
                 })
+                self.events.emit(HealEvent(
+                    locator.name, locator.element_description, locator.stage, locator.locator_strategies[0],
+                    locator.failed_strategies, locator.successful_strategy, end_time - start_time
+                ))
+                self._heal_page_once(locator)
                 
-                # Learn from this successful healing
-                self._learn_successful_strategy(locator)
-                logging.info(f"Self-healing successful for '{locator.name}' using {locator.successful_strategy}")
-                print(f"\n🔄 SELF-HEALING ACTIVATED for '{locator.name}'")
-                print(f"   ❌ Failed locator: {locator.locator_strategies[0]}")
-                print(f"   ✅ Successful locator: {locator.successful_strategy}\n")
-                
-            return element
+            return self._cache_element(locator, element, version)
             
         except NoSuchElementException as e:
             self.healing_stats["failed_count"] += 1
@@ -279,79 +689,361 @@ class AISelfHealingDriver:
                 "failed": locator.failed_strategies,
                 "succeeded": None,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "error": str(e)
+                "error": str(e),
+                "dom_outline": self._failure_outline(locator)
             })
-            logging.error(f"Self-healing failed for '{locator.name}'. All strategies failed.")
-            print(f"\n❌ SELF-HEALING FAILED for '{locator.name}'")
-            print(f"   All {len(locator.failed_strategies)} locator strategies failed\n")
+            self.events.emit(FailureEvent(
+                locator.name, locator.element_description, locator.failed_strategies, str(e), time.time() - start_time
+            ))
+            self._learn_from_lookup(locator)
+            if recording is not None:
+                recording["outcome"] = {"strategy": None, "healed": False, "error": str(e)}
+                self.dom_recorder.record(self.driver, self.dom_version(), recording)
+            self._heal_page_once(locator)
             raise
     
-    def _learn_successful_strategy(self, locator):
+    def _recording_entry(self, locator):
+        """Lookup details saved with a DOM snapshot, taken before the lookup changes the locator"""
+        return {
+            "locator": locator.name,
+            "description": locator.element_description,
+            "page": type(locator.page).__name__ if locator.page is not None else None,
+            "strategies": list(locator.locator_strategies),
+            "learned": list(self.learned_locators.get(locator.name, [])),
+            "fingerprint": self.fingerprints.get(locator.name)
+        }
+    
+    def _heal_page_once(self, trigger):
+        """Run heal_page for the trigger's page object unless that page was already healed"""
+        page = getattr(trigger, 'page', None)
+        if not config.BULK_HEALING or page is None or page.bulk_healed:
+            return
+        page.bulk_healed = True
+        try:
+            with span(LOCATE_PAGE_HEALING, type(page).__name__):
+                self.heal_page(page.locators, trigger)
+        except Exception as e:
+            logging.error(f"Page-level healing failed: {str(e)}")
+    
+    def heal_page(self, locators, trigger=None):
         """
-        Learn from successful healing events
+        Re-check every locator of a page object with one snapshot and one batched probe
         
-        :param locator: AISelfHealingLocator that was successfully healed
+        Each locator is probed with its own strategies plus the snapshot elements
+        closest to its fingerprint. Only a visible, unique match is accepted. It is
+        stored as a learned strategy and its element is cached, so the next lookup
+        resolves at once. Keyword-only candidates are left to the per-element heal,
+        because the page may not contain every element of the page object.
+        
+        :param locators: AISelfHealingLocator instances of one page object
+        :param trigger: Locator whose heal started the pass (skipped)
+        :return: Number of locators that got a new learned strategy
         """
-        if locator.name not in self.learned_locators:
-            self.learned_locators[locator.name] = []
+        locators = [locator for locator in locators if locator is not trigger]
+        if not locators:
+            return 0
+        
+        start_time = time.time()
+        results = self.probe_page_locators(locators)
+        
+        healed = 0
+        for result in results:
+            if self._adopt_probe_result(result):
+                healed += 1
+                locator = result["locator"]
+                self.healing_stats["healed_count"] += 1
+                self.healing_stats["healing_events"].append({
+                    "element": locator.name,
+                    "description": locator.element_description,
+                    "failed": [],
+                    "succeeded": locator.successful_strategy,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "page_level": True
+                })
+                self.events.emit(HealEvent(
+                    locator.name, locator.element_description, result["source"], locator.initial_strategies[0],
+                    [], locator.successful_strategy, page_level=True
+                ))
+        
+        if healed:
+            self.flush_learning()
+        resolved = sum(1 for result in results if result["winner"])
+        logging.info(
+            f"Page-level healing checked {len(locators)} locators "
+            f"in {time.time() - start_time:.2f}s: {resolved} resolved, {healed} healed"
+        )
+        return healed
+    
+    def probe_page_locators(self, locators, keyword_candidates=False):
+        """
+        Resolve several locators against the current page in one snapshot and one batched probe
+        
+        :param locators: AISelfHealingLocator instances
+        :param keyword_candidates: Also probe description-keyword candidates (unverified guesses)
+        :return: List of dicts per locator: locator, version, primary (probe of its
+                 defined primary strategy), winner (first visible, unique probe or None)
+                 and source of the winner ("primary", "learned", "fallback", "fingerprint" or "keyword")
+        """
+        version = self.dom_version()
+        snapshot = self.snapshot_cache.get(self.driver, version)
+        
+        # One flat probe list; each locator owns a slice of it
+        plan = []
+        batch = []
+        for locator in locators:
+            self.defined_primaries[locator.name] = locator.initial_strategies[0]
+            locator.apply_learned_locators(self.learned_locators)
+            learned = self.learned_locators.get(locator.name, [])
+            sources = {}
+            for strategy in locator.locator_strategies:
+                if strategy == locator.initial_strategies[0]:
+                    sources[strategy] = "primary"
+                else:
+                    sources[strategy] = "learned" if strategy in learned else "fallback"
+            sources.setdefault(locator.initial_strategies[0], "primary")
             
-        # Add the successful strategy if not already present
-        if locator.successful_strategy not in self.learned_locators[locator.name]:
-            self.learned_locators[locator.name].insert(0, locator.successful_strategy)
-            logging.info(f"Learned new strategy for '{locator.name}': {locator.successful_strategy}")
-            print(f"📝 LEARNING: Added new strategy for '{locator.name}': {locator.successful_strategy}")
+            fingerprint = self.fingerprints.get(locator.name)
+            if fingerprint:
+                for node, similarity in rank_nodes(snapshot, fingerprint, min_score=config.BULK_MIN_SIMILARITY):
+                    for strategy in snapshot.locators_for(node):
+                        sources.setdefault(strategy, "fingerprint")
+            if keyword_candidates:
+                for strategy in locator.generate_candidates(snapshot):
+                    sources.setdefault(strategy, "keyword")
             
-        # Keep only the top 3 most successful strategies
-        self.learned_locators[locator.name] = self.learned_locators[locator.name][:3]
+            plan.append((locator, len(batch), sources))
+            batch.extend(sources)
+        
+        start_time = time.perf_counter()
+        probes = probe_locators(self.driver, batch)
+        self.events.emit(ProbeEvent(
+            None, PAGE, len(batch), None, time.perf_counter() - start_time
+        ))
+        
+        results = []
+        for locator, offset, sources in plan:
+            own = probes[offset:offset + len(sources)]
+            primary = next(probe for probe in own if (probe["by"], probe["value"]) == locator.initial_strategies[0])
+            winner = next((probe for probe in own if probe["count"] == 1 and probe["visible"]), None)
+            results.append({
+                "locator": locator,
+                "version": version,
+                "primary": primary,
+                "winner": winner,
+                "source": sources[(winner["by"], winner["value"])] if winner else None
+            })
+        return results
+    
+    def _adopt_probe_result(self, result):
+        """
+        Use a probe_page_locators result as if the locator had just been looked up
+        
+        Records the fingerprint, caches the element and learns the strategy unless it
+        is the locator's current first choice.
         
-        # Save learned locators to file
-        self._save_learned_locators()
+        :param result: One result of probe_page_locators
+        :return: True if a new strategy was learned
+        """
+        winner = result["winner"]
+        if winner is None:
+            return False
+        locator = result["locator"]
+        strategy = (winner["by"], winner["value"])
+        locator.successful_strategy = strategy
+        locator.last_fingerprint = winner["fingerprint"]
+        if config.CAPTURE_FINGERPRINTS:
+            self._record_fingerprint(locator, winner["element"], result["version"])
+        self._cache_element(locator, winner["element"], result["version"])
         
-    def _save_learned_locators(self):
-        """Save learned locators to a file"""
+        if strategy == locator.locator_strategies[0]:
+            return False  # The current first choice still works
+        if self.strategy_ranker.record(locator.name, strategy, True) and strategy != locator.initial_strategies[0]:
+            self.events.emit(LearnEvent(locator.name, strategy))
+        self._set_learned(locator.name, self.strategy_ranker.ordered(locator.name))
+        return True
+    
+    def _failure_outline(self, locator):
+        """
+        Compact outline of the page around where a failed element was last seen
+        
+        :param locator: AISelfHealingLocator that could not be healed
+        :return: Outline string, or None if the page cannot be read
+        """
         try:
-            # Create reports directory if it doesn't exist
-            if not os.path.exists("reports"):
-                os.makedirs("reports")
-                
-            # Convert to serializable format
-            serializable_locators = {}
-            for name, strategies in self.learned_locators.items():
-                serializable_locators[name] = []
-                for by, value in strategies:
-                    by_name = str(by).split('.')[-1]  # Extract name like 'NAME', 'ID', etc.
-                    serializable_locators[name].append({"by": by_name, "value": value})
-            
-            # Save to file
-            with open("reports/learned_locators.json", "w") as f:
-                json.dump(serializable_locators, f, indent=2)
-                
-            logging.info(f"Saved learned locators for {len(self.learned_locators)} elements to reports/learned_locators.json")
+            snapshot = self.snapshot_cache.get(self.driver, self.dom_version())
+            return distilled_dom(snapshot).outline(
+                max_bytes=config.FAILURE_OUTLINE_BYTES, focus=self.fingerprints.get(locator.name)
+            )
+        except Exception as e:
+            logging.error(f"Error distilling DOM for '{locator.name}': {str(e)}")
+            return None
+    
+    def _cache_element(self, locator, element, version=None):
+        """
+        Wrap a resolved element so it survives re-renders and cache it for the current DOM version
+        
+        :param locator: AISelfHealingLocator that resolved the element
+        :param element: Raw WebElement
+        :param version: DOM version the element was resolved in (read from the page if omitted)
+        :return: HealingWebElement
+        """
+        element = HealingWebElement(element, self, locator)
+        if config.CACHE_ELEMENT_HANDLES:
+            self.element_cache[locator.name] = (version or self.dom_version(), element)
+        return element
+    
+    def reresolve(self, locator):
+        """
+        Find an element again after its handle went stale
+        
+        The last winning strategy is tried first; the full healing chain only
+        runs if it no longer matches.
+        
+        :param locator: AISelfHealingLocator whose element went stale
+        :return: WebElement
+        """
+        self.element_cache.pop(locator.name, None)
+        if locator.successful_strategy:
+            start_time = time.perf_counter()
+            try:
+                element = self.driver.find_element(*locator.successful_strategy)
+                self.events.emit(ProbeEvent(
+                    locator.name, RERESOLVE, 1, locator.successful_strategy, time.perf_counter() - start_time
+                ))
+                return self._cache_element(locator, element)
+            except NoSuchElementException:
+                self.events.emit(ProbeEvent(locator.name, RERESOLVE, 1, None, time.perf_counter() - start_time))
+                logging.info(f"Last strategy for '{locator.name}' no longer matches, healing again")
+        return self.find_element(locator)
+    
+    def _record_fingerprint(self, locator, element, version=None):
+        """
+        Keep the fingerprint of the element a locator just resolved to
+        
+        Batched probes return the fingerprint with the element. Otherwise it is
+        captured with one extra script call, unless the stored fingerprint was
+        captured in the same DOM version, which it would only repeat.
+        
+        :param locator: AISelfHealingLocator that succeeded
+        :param element: WebElement it resolved to
+        :param version: DOM version the lookup started in (None if unknown)
+        """
+        fingerprint = locator.last_fingerprint
+        if not fingerprint:
+            if (version is not None and locator.name in self.fingerprints
+                    and self.fingerprint_versions.get(locator.name) == version):
+                return
+            fingerprint = capture_fingerprint(self.driver, element)
+        if not fingerprint:
+            return
+        
+        self.fingerprint_versions[locator.name] = version
+        changed = not same_element_identity(self.fingerprints.get(locator.name), fingerprint)
+        self.fingerprints[locator.name] = fingerprint
+        if changed:
+            logging.debug(f"Updated fingerprint for '{locator.name}'")
+            self._save_fingerprints(locator.name)
+    
+    def _save_fingerprints(self, name):
+        """Save one element fingerprint next to the learned locators"""
+        try:
+            self.locator_store.save_fingerprint(name, self.fingerprints[name])
+        except Exception as e:
+            logging.error(f"Error saving fingerprint for '{name}': {str(e)}")
+    
+    def load_fingerprints(self):
+        """Load element fingerprints recorded by previous runs"""
+        try:
+            self.fingerprints = self.locator_store.load_fingerprints()
+            logging.info(f"Loaded fingerprints for {len(self.fingerprints)} elements")
+        except Exception as e:
+            logging.error(f"Error loading element fingerprints: {str(e)}")
+    
+    def _learn_from_lookup(self, locator, latency=None):
+        """
+        Update per-strategy statistics after a lookup and re-rank the learned strategies
+        
+        :param locator: AISelfHealingLocator that was just looked up
+        :param latency: Time of the WebDriver call that found the element, in seconds (successful lookups only)
+        """
+        for strategy in locator.failed_strategies:
+            self.strategy_ranker.record(locator.name, strategy, False)
+        
+        is_new = False
+        if locator.successful_strategy:
+            is_new = self.strategy_ranker.record(locator.name, locator.successful_strategy, True, latency)
+            if is_new and locator.successful_strategy != locator.initial_strategies[0]:
+                self.events.emit(LearnEvent(locator.name, locator.successful_strategy))
+        
+        # Cheapest expected strategy first; stale ones are evicted by the ranker
+        self._set_learned(locator.name, self.strategy_ranker.ordered(locator.name))
+        
+        # New strategies are persisted straight away, statistics on flush_learning()
+        if is_new:
+            self.flush_learning()
+    
+    def flush_learning(self):
+        """
+        Persist learned strategies and statistics of every element changed since the last flush
+        
+        Statistics are merged with what other workers stored in the meantime and the
+        learned strategies are re-ranked on the merged result.
+        """
+        for name in sorted(self.strategy_ranker.dirty):
+            deltas, evicted = self.strategy_ranker.take_pending(name)
+            try:
+                merged = self.locator_store.merge_strategy_stats(name, deltas, evicted)
+                self.strategy_ranker.replace(name, merged)
+                self._set_learned(name, self.strategy_ranker.ordered(name, evict=False))
+            except Exception as e:
+                logging.error(f"Error saving strategy statistics for '{name}': {str(e)}")
+            self._save_learned_locators(name)
+        
+    def _set_learned(self, name, ordered):
+        """
+        Keep the ranked strategies that beat an element's defined primary as its learned locators
+        
+        The primary is ranked like any other strategy, but it is what the page object
+        already says, so it and everything ranked behind it are not learned (and never
+        reach the source updater).
+        
+        :param name: Locator name
+        :param ordered: Strategies of the element, cheapest expected cost first
+        """
+        primary = self.defined_primaries.get(name)
+        if primary in ordered:
+            ordered = ordered[:ordered.index(primary)]
+        if ordered:
+            self.learned_locators[name] = ordered
+        else:
+            self.learned_locators.pop(name, None)
+    
+    def _save_learned_locators(self, name):
+        """Upsert the learned strategies of one element in the learned locator store"""
+        try:
+            strategies = self.learned_locators.get(name, [])
+            self.locator_store.save_locators(name, strategies)
+            logging.info(f"Saved {len(strategies)} learned locators for '{name}' to {self.locator_store.path}")
         except Exception as e:
             logging.error(f"Error saving learned locators: {str(e)}")
     
     def load_learned_locators(self):
-        """Load previously learned locators"""
+        """Load previously learned locators and their lookup statistics"""
         try:
-            if os.path.exists("reports/learned_locators.json"):
-                with open("reports/learned_locators.json", "r") as f:
-                    serialized = json.load(f)
-                    
-                # Convert back to tuples
-                for name, strategies in serialized.items():
-                    self.learned_locators[name] = []
-                    for strategy in strategies:
-                        try:
-                            by_attr = getattr(By, strategy["by"])
-                            self.learned_locators[name].append((by_attr, strategy["value"]))
-                        except AttributeError:
-                            logging.warning(f"Unknown locator type: {strategy['by']} for element {name}")
-                            continue
-                            
+            self.learned_locators = self.locator_store.load_locators()
+            stats = self.locator_store.load_strategy_stats()
+            
+            self.strategy_ranker.load(stats)
+            
+            # Strategies learned before statistics existed start with a single win
+            for name, strategies in self.learned_locators.items():
+                for strategy in strategies:
+                    self.strategy_ranker.seed(name, strategy, StrategyStats(successes=1, last_success=time.time()))
+            if self.learned_locators:
                 logging.info(f"Loaded learned locators for {len(self.learned_locators)} elements")
                 print(f"📚 Loaded {len(self.learned_locators)} learned locator strategies from previous runs")
             else:
-                logging.info("No learned locators file found. Starting fresh.")
+                logging.info("No learned locators stored. Starting fresh.")
         except Exception as e:
             logging.error(f"Error loading learned locators: {str(e)}")
             
@@ -378,486 +1070,160 @@ class AISelfHealingDriver:
         """
         Generate an HTML report of self-healing activities
         
+        Event detail is paginated into script shards next to the report
+        (see utils.report_renderer), so the page stays small however many
+        events the run recorded.
+        
         :param filename: Path to save the HTML report
         :return: Path to the generated report
         """
         report = self.get_healing_report()
-        
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Self-Healing Report</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                h1 { color: #2c3e50; }
-                .summary { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
-                .event { background-color: #ffffff; padding: 15px; border-radius: 5px; margin-bottom: 10px; border-left: 5px solid #3498db; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-                .success { border-left-color: #2ecc71; }
-                .failure { border-left-color: #e74c3c; }
-                .strategies { font-family: monospace; background-color: #f8f9fa; padding: 10px; border-radius: 3px; }
-                .timestamp { color: #7f8c8d; font-size: 0.9em; }
-            </style>
-        </head>
-        <body>
-            <h1>Self-Healing Test Report</h1>
-            
-            <div class="summary">
-                <h2>Summary</h2>
-                <p>Total Attempts: {total}</p>
-                <p>Successful Healing: {success} ({rate:.1f}%)</p>
-                <p>Failed Healing: {failed}</p>
-            </div>
-            
-            <h2>Healing Events</h2>
-        """.format(
-            total=report["summary"]["total_attempts"],
-            success=report["summary"]["successful_healing"],
-            failed=report["summary"]["failed_healing"],
-            rate=report["summary"]["success_rate"]
-        )
-        
-        for event in report["events"]:
-            event_class = "success" if event["succeeded"] else "failure"
-            
-            html += """
-            <div class="event {event_class}">
-                <h3>{element}</h3>
-                <p><strong>Description:</strong> {description}</p>
-                <p><strong>Failed Strategies:</strong></p>
-                <div class="strategies">
-                    {failed_strategies}
-                </div>
-                <p><strong>Successful Strategy:</strong></p>
-                <div class="strategies">
-                    {succeeded_strategy}
-                </div>
-                <p class="timestamp">{timestamp} (took {time_taken:.3f}s)</p>
-            </div>
-            """.format(
-                event_class=event_class,
-                element=event["element"],
-                description=event.get("description", ""),
-                failed_strategies="<br>".join([f"{by}='{value}'" for by, value in event["failed"]]) if event["failed"] else "None",
-                succeeded_strategy=f"{event['succeeded'][0]}='{event['succeeded'][1]}'" if event["succeeded"] else "None",
-                timestamp=event["timestamp"],
-                time_taken=event.get("time_taken", 0)
-            )
-        
-        html += """
-        </body>
-        </html>
-        """
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        with open(filename, "w") as f:
-            f.write(html)
+        render_healing_report(filename, report["summary"], report["events"])
             
         logging.info(f"Generated HTML report: {filename}")
         print(f"📊 Generated HTML report: {filename}")
         return filename
     
-    
-  
-def generate_dashboard(self, filename="reports/dashboard.html"):
-    """
-    Generate a dashboard with charts for healing statistics
+    def generate_dashboard(self, filename="reports/dashboard.html"):
+        """
+        Generate a dashboard with charts for healing statistics
 
-    :param filename: Path to save the dashboard
-    :return: Path to the generated dashboard
-    """
-    try:
-        report = self.get_healing_report()
+        :param filename: Path to save the dashboard
+        :return: Path to the generated dashboard
+        """
+        try:
+            report = self.get_healing_report()
 
-        # Calculate statistics
-        total = report["summary"]["total_attempts"]
-        healed = report["summary"]["successful_healing"]
-        failed = report["summary"]["failed_healing"]
-        success_rate = report["summary"]["success_rate"]
+            render_dashboard(filename, report["summary"], report["events"])
 
-        # Get element-specific stats
-        element_stats = {}
-        for event in report["events"]:
-            element_name = event["element"]
-            if element_name not in element_stats:
-                element_stats[element_name] = {"healed": 0, "failed": 0}
+            logging.info(f"Generated dashboard: {filename}")
+            print(f"📊 Generated dashboard: {filename}")
+            return filename
 
-            if event["succeeded"]:
-                element_stats[element_name]["healed"] += 1
-            else:
-                element_stats[element_name]["failed"] += 1
-
-        # Prepare data for charts
-        element_labels = list(element_stats.keys()) if element_stats else []
-        element_success = [stats["healed"] for stats in element_stats.values()] if element_stats else []
-        element_failed = [stats["failed"] for stats in element_stats.values()] if element_stats else []
-
-        # Default values if no data
-        if not element_labels:
-            element_labels = ["No Data"]
-            element_success = [0]
-            element_failed = [0]
-
-        # Generate HTML
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Self-Healing Dashboard</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                h1 { color: #2c3e50; }
-                .stats { display: flex; justify-content: space-between; margin-bottom: 20px; }
-                .stat-card { background-color: #f8f9fa; padding: 15px; border-radius: 5px; width: 23%; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-                .stat-value { font-size: 24px; font-weight: bold; margin: 10px 0; }
-                .success { color: #2ecc71; }
-                .failure { color: #e74c3c; }
-                .chart { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; height: 300px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-                .chart-container { display: flex; justify-content: space-between; }
-                .chart-half { width: 48%; }
-                .no-data { text-align: center; padding: 50px; color: #7f8c8d; }
-            </style>
-            <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        </head>
-        <body>
-            <h1>Self-Healing Dashboard</h1>
-
-            <div class="stats">
-                <div class="stat-card">
-                    <h3>Total Attempts</h3>
-                    <div class="stat-value">{total}</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Successful Healing</h3>
-                    <div class="stat-value success">{healed}</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Failed Healing</h3>
-                    <div class="stat-value failure">{failed}</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Success Rate</h3>
-                    <div class="stat-value">{rate:.1f}%</div>
-                </div>
-            </div>
+        except Exception as e:
+            logging.error(f"Error generating dashboard: {str(e)}")
+            print(f"❌ Error generating dashboard: {str(e)}")
 
-            <div class="chart-container">
-                <div class="chart chart-half">
-                    <canvas id="healingChart"></canvas>
-                </div>
-                <div class="chart chart-half">
-                    <canvas id="elementsChart"></canvas>
+            # Create a simple error dashboard
+            error_html = f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>Dashboard Error</title>
+                <style>
+                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                    h1 {{ color: #e74c3c; }}
+                    .error {{ background-color: #f8d7da; padding: 15px; border-radius: 5px; color: #721c24; }}
+                </style>
+            </head>
+            <body>
+                <h1>Error Generating Dashboard</h1>
+                <div class="error">
+                    <p>An error occurred while generating the dashboard:</p>
+                    <pre>{html_escape(str(e))}</pre>
                 </div>
-            </div>
-
-            <script>
-                // Create healing chart
-                const ctxHealing = document.getElementById('healingChart').getContext('2d');
-                const healingChart = new Chart(ctxHealing, {{
-                    type: 'pie',
-                    data: {{
-                        labels: ['Successful Healing', 'Failed Healing'],
-                        datasets: [{{
-                            data: [{healed}, {failed}],
-                            backgroundColor: ['#2ecc71', '#e74c3c']
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            title: {{
-                                display: true,
-                                text: 'Healing Success Rate',
-                                font: {{ size: 16 }}
-                            }}
-                        }}
-                    }}
-                }});
-
-                // Create elements chart
-                const ctxElements = document.getElementById('elementsChart').getContext('2d');
-                const elementsChart = new Chart(ctxElements, {{
-                    type: 'bar',
-                    data: {{
-                        labels: {element_labels},
-                        datasets: [
-                            {{
-                                label: 'Successful Healing',
-                                data: {element_success},
-                                backgroundColor: '#2ecc71'
-                            }},
-                            {{
-                                label: 'Failed Healing',
-                                data: {element_failed},
-                                backgroundColor: '#e74c3c'
-                            }}
-                        ]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            title: {{
-                                display: true,
-                                text: 'Healing by Element',
-                                font: {{ size: 16 }}
-                            }}
-                        }},
-                        scales: {{
-                            x: {{
-                                stacked: true
-                            }},
-                            y: {{
-                                stacked: true,
-                                beginAtZero: true
-                            }}
-                        }}
-                    }}
-                }});
-            </script>
-        </body>
-        </html>
-        """.format(
-            total=total,
-            healed=healed,
-            failed=failed,
-            rate=success_rate,
-            element_labels=json.dumps(element_labels),
-            element_success=json.dumps(element_success),
-            element_failed=json.dumps(element_failed)
-        )
+            </body>
+            </html>
+            """
 
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, "w") as f:
-            f.write(html)
+            with open(filename, "w") as f:
+                f.write(error_html)
 
-        logging.info(f"Generated dashboard: {filename}")
-        print(f"📊 Generated dashboard: {filename}")
-        return filename
-
-    except Exception as e:
-        logging.error(f"Error generating dashboard: {str(e)}")
-        print(f"❌ Error generating dashboard: {str(e)}")
-
-        # Create a simple error dashboard
-        error_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Dashboard Error</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                h1 {{ color: #e74c3c; }}
-                .error {{ background-color: #f8d7da; padding: 15px; border-radius: 5px; color: #721c24; }}
-            </style>
-        </head>
-        <body>
-            <h1>Error Generating Dashboard</h1>
-            <div class="error">
-                <p>An error occurred while generating the dashboard:</p>
-                <pre>{str(e)}</pre>
-            </div>
-        </body>
-        </html>
-        """
-
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-        with open(filename, "w") as f:
-            f.write(error_html)
-
-        return filename
+            return filename
     
- 
-
-def analyze_locators(self):
-    """
-    Analyze the current state of locators and provide recommendations
+    def analyze_locators(self):
+        """
+        Analyze the current state of locators and provide recommendations
     
-    :return: Dictionary with analysis results
-    """
-    analysis = {
-        "most_healed_elements": [],
-        "most_reliable_strategies": {},
-        "least_reliable_strategies": {},
-        "recommendations": []
-    }
-    
-    # Count healing events by element
-    element_counts = {}
-    strategy_success = {}
-    strategy_failure = {}
-    
-    for event in self.healing_stats["healing_events"]:
-        element_name = event["element"]
-        if element_name not in element_counts:
-            element_counts[element_name] = 0
-        element_counts[element_name] += 1
-        
-        # Track strategy success/failure
-        if event["succeeded"]:
-            by, value = event["succeeded"]
-            strategy_key = str(by)
-            
-            if strategy_key not in strategy_success:
-                strategy_success[strategy_key] = 0
-            strategy_success[strategy_key] += 1
-        
-        for by, value in event["failed"]:
-            strategy_key = str(by)
-            
-            if strategy_key not in strategy_failure:
-                strategy_failure[strategy_key] = 0
-            strategy_failure[strategy_key] += 1
+        :return: Dictionary with analysis results
+        """
+        analysis = {
+            "most_healed_elements": [],
+            "most_reliable_strategies": {},
+            "least_reliable_strategies": {},
+            "recommendations": []
+        }
     
-    # Find most healed elements
-    if element_counts:
-        sorted_elements = sorted(element_counts.items(), key=lambda x: x[1], reverse=True)
-        analysis["most_healed_elements"] = sorted_elements[:3]
-        
-        # Add recommendations for most healed elements
-        for element, count in sorted_elements[:3]:
-            analysis["recommendations"].append(
-                f"Consider updating the primary locator for '{element}' as it required healing {count} times."
-            )
+        # Count healing events by element
+        element_counts = {}
+        strategy_success = {}
+        strategy_failure = {}
     
-    # Calculate strategy reliability
-    strategy_reliability = {}
-    for strategy in set(list(strategy_success.keys()) + list(strategy_failure.keys())):
-        success = strategy_success.get(strategy, 0)
-        failure = strategy_failure.get(strategy, 0)
-        total = success + failure
-        
-        if total > 0:
-            reliability = (success / total) * 100
-            strategy_reliability[strategy] = reliability
+        for event in self.healing_stats["healing_events"]:
+            element_name = event["element"]
+            if element_name not in element_counts:
+                element_counts[element_name] = 0
+            element_counts[element_name] += 1
     
-    # Find most and least reliable strategies
-    if strategy_reliability:
-        sorted_strategies = sorted(strategy_reliability.items(), key=lambda x: x[1], reverse=True)
-        analysis["most_reliable_strategies"] = dict(sorted_strategies[:3])
-        analysis["least_reliable_strategies"] = dict(sorted_strategies[-3:])
-        
-        # Add recommendations for strategies
-        most_reliable = sorted_strategies[0][0] if sorted_strategies else None
-        least_reliable = sorted_strategies[-1][0] if sorted_strategies else None
-        
-        if most_reliable and least_reliable:
+            # Track strategy success/failure
+            if event["succeeded"]:
+                by, value = event["succeeded"]
+                strategy_key = str(by)
+    
+                if strategy_key not in strategy_success:
+                    strategy_success[strategy_key] = 0
+                strategy_success[strategy_key] += 1
+    
+            for by, value in event["failed"]:
+                strategy_key = str(by)
+    
+                if strategy_key not in strategy_failure:
+                    strategy_failure[strategy_key] = 0
+                strategy_failure[strategy_key] += 1
+    
+        # Find most healed elements
+        if element_counts:
+            sorted_elements = sorted(element_counts.items(), key=lambda x: x[1], reverse=True)
+            analysis["most_healed_elements"] = sorted_elements[:3]
+    
+            # Add recommendations for most healed elements
+            for element, count in sorted_elements[:3]:
+                analysis["recommendations"].append(
+                    f"Consider updating the primary locator for '{element}' as it required healing {count} times."
+                )
+    
+        # Calculate strategy reliability
+        strategy_reliability = {}
+        for strategy in set(list(strategy_success.keys()) + list(strategy_failure.keys())):
+            success = strategy_success.get(strategy, 0)
+            failure = strategy_failure.get(strategy, 0)
+            total = success + failure
+    
+            if total > 0:
+                reliability = (success / total) * 100
+                strategy_reliability[strategy] = reliability
+    
+        # Find most and least reliable strategies
+        if strategy_reliability:
+            sorted_strategies = sorted(strategy_reliability.items(), key=lambda x: x[1], reverse=True)
+            analysis["most_reliable_strategies"] = dict(sorted_strategies[:3])
+            analysis["least_reliable_strategies"] = dict(sorted_strategies[-3:])
+    
+            # Add recommendations for strategies
+            most_reliable = sorted_strategies[0][0] if sorted_strategies else None
+            least_reliable = sorted_strategies[-1][0] if sorted_strategies else None
+    
+            if most_reliable and least_reliable:
+                analysis["recommendations"].append(
+                    f"Consider using {most_reliable} as primary locator strategy instead of {least_reliable} where possible."
+                )
+    
+        # Add learned locator recommendations
+        if self.learned_locators:
             analysis["recommendations"].append(
-                f"Consider using {most_reliable} as primary locator strategy instead of {least_reliable} where possible."
+                f"You have {len(self.learned_locators)} learned locator strategies that can be used to update your source code."
             )
     
-    # Add learned locator recommendations
-    if self.learned_locators:
-        analysis["recommendations"].append(
-            f"You have {len(self.learned_locators)} learned locator strategies that can be used to update your source code."
-        )
+        return analysis
     
-    return analysis
-def update_source_code_locators(self, file_path):
-    """
-    Update locators in source code based on learned strategies
-    
-    :param file_path: Path to the source file (e.g., login_page.py)
-    :return: True if successful, False otherwise
-    """
-    if not hasattr(self, 'learned_locators') or not self.learned_locators:
-        print("ℹ️ No learned locators to update source code with")
-        return False
-        
-    try:
-        print(f"🔍 Attempting to update locators in {file_path}")
+    def update_source_code_locators(self, file_path):
+        """
+        Update locators in source code based on learned strategies
         
-        # Read the source file
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-            
-        # Track if we made any changes
-        changes_made = False
-        
-        # Process the file line by line
-        for i, line in enumerate(lines):
-            # Look for create_ai_locator calls
-            if 'create_ai_locator' in line:
-                # Extract the element name
-                name_match = re.search(r'["\'](.*?)["\']', line)
-                if name_match:
-                    element_name = name_match.group(1)
-                    print(f"🔍 Found element in source code: {element_name}")
-                    
-                    # Check if we have learned locators for this element
-                    if element_name in self.learned_locators and self.learned_locators[element_name]:
-                        print(f"🔍 Found learned locators for {element_name}: {self.learned_locators[element_name]}")
-                        
-                        # Find the closing parenthesis of this call
-                        j = i
-                        parenthesis_count = line.count('(') - line.count(')')
-                        while parenthesis_count > 0 and j < len(lines) - 1:
-                            j += 1
-                            parenthesis_count += lines[j].count('(') - lines[j].count(')')
-                        
-                        if j > i:
-                            # We found a multi-line create_ai_locator call
-                            print(f"🔍 Found multi-line create_ai_locator call from line {i} to {j}")
-                            
-                            # Find the line with the first locator
-                            first_locator_line = None
-                            for line_idx in range(i+1, j):
-                                if '(' in lines[line_idx] and ')' in lines[line_idx] and 'By.' in lines[line_idx]:
-                                    first_locator_line = line_idx
-                                    break
-                            
-                            if first_locator_line is not None:
-                                print(f"🔍 First locator line: {first_locator_line}, content: {lines[first_locator_line].strip()}")
-                                
-                                # Get the best learned locator
-                                best_locator = self.learned_locators[element_name][0]
-                                by_type, value = best_locator
-                                
-                                # Convert by_type to string representation
-                                if isinstance(by_type, str):
-                                    by_str = by_type
-                                else:
-                                    by_str = str(by_type).split('.')[-1]
-                                
-                                # Create the locator string
-                                best_locator_str = f"(By.{by_str}, '{value}')"
-                                
-                                # Check if the best learned locator is different from the current primary
-                                current_primary = lines[first_locator_line].strip()
-                                if best_locator_str not in current_primary:
-                                    print(f"🔍 Best locator {best_locator_str} is different from current primary {current_primary}")
-                                    
-                                    # Replace the primary locator with the best learned one
-                                    indent = len(lines[first_locator_line]) - len(lines[first_locator_line].lstrip())
-                                    new_line = ' ' * indent + best_locator_str + ',  # AI-learned primary locator\n'
-                                    lines[first_locator_line] = new_line
-                                    
-                                    changes_made = True
-                                    print(f"📝 UPDATED SOURCE CODE: Primary locator for '{element_name}' is now {best_locator_str}")
-                                else:
-                                    print(f"🔍 Best locator is already the primary one")
-                            else:
-                                print(f"⚠️ Could not find first locator line")
-        
-        # Write the modified file if changes were made
-        if changes_made:
-            with open(file_path, 'w') as f:
-                f.writelines(lines)
-            print(f"✅ Successfully updated source code in {file_path}")
-            return True
-        else:
-            print(f"ℹ️ No locator updates needed in {file_path}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error updating source code: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+        :param file_path: Path to the source file (e.g., login_page.py)
+        :return: True if successful, False otherwise
+        """
+        return update_source_code_with_locators(file_path, self.learned_locators)
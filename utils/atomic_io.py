@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def atomic_write_bytes(path, data):
+    """
+    Write a binary file so readers never see a partial file
+
+    The content goes to a temporary file in the same directory, which is then
+    renamed over the target with os.replace (atomic on POSIX and Windows).
+
+    :param path: Destination path
+    :param data: File content as bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """
+    Write a text file atomically
+
+    :param path: Destination path
+    :param text: File content
+    :param encoding: Text encoding
+    """
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_json(path, data, indent=2):
+    """
+    Serialize data to a JSON file atomically
+
+    :param path: Destination path
+    :param data: JSON-serializable object
+    :param indent: Indentation passed to json.dumps
+    """
+    atomic_write_text(path, json.dumps(data, indent=indent))
+
+
+@contextmanager
+def atomic_open(path, encoding="utf-8"):
+    """
+    Stream a text file to disk atomically
+
+    Chunks written to the yielded file go to a temporary file that replaces the
+    target only when the block completes; on error the target is left untouched.
+
+    :param path: Destination path
+    :param encoding: Text encoding
+    :return: Context manager yielding a writable text file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,134 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+from utils.element_fingerprint import FINGERPRINT_FUNCTION, FINGERPRINT_ATTRIBUTES
+
+# Resolves an ordered list of [by, value] pairs inside the page and reports,
+# per candidate, how many nodes matched, whether the picked node is visible,
+# the picked node itself (first visible match, else first match) and its fingerprint.
+PROBE_SCRIPT = FINGERPRINT_FUNCTION + """
+var candidates = arguments[0];
+var fingerprintAttributes = arguments[1];
+
+function isVisible(el) {
+    if (!el || el.nodeType !== 1) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none') { return false; }
+    return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+
+function byLinkText(value, partial) {
+    var links = document.getElementsByTagName('a');
+    var matches = [];
+    for (var i = 0; i < links.length; i++) {
+        var text = (links[i].innerText || links[i].textContent || '').trim();
+        if (partial ? text.indexOf(value) !== -1 : text === value) { matches.push(links[i]); }
+    }
+    return matches;
+}
+
+function resolve(by, value) {
+    switch (by) {
+        case 'id':
+            return document.querySelectorAll('#' + CSS.escape(value));
+        case 'name':
+            return document.querySelectorAll('[name="' + CSS.escape(value) + '"]');
+        case 'class name':
+            return document.getElementsByClassName(value);
+        case 'tag name':
+            return document.getElementsByTagName(value);
+        case 'css selector':
+            return document.querySelectorAll(value);
+        case 'link text':
+            return byLinkText(value, false);
+        case 'partial link text':
+            return byLinkText(value, true);
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                var node = snapshot.snapshotItem(i);
+                if (node.nodeType === 1) { nodes.push(node); }
+            }
+            return nodes;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+
+var results = [];
+for (var c = 0; c < candidates.length; c++) {
+    try {
+        var matches = resolve(candidates[c][0], candidates[c][1]);
+        var picked = null;
+        for (var m = 0; m < matches.length; m++) {
+            if (isVisible(matches[m])) { picked = matches[m]; break; }
+        }
+        var visible = picked !== null;
+        if (!visible && matches.length) { picked = matches[0]; }
+        results.push({
+            count: matches.length,
+            visible: visible,
+            element: picked,
+            fingerprint: picked ? __fingerprint(picked, fingerprintAttributes) : null,
+            error: null
+        });
+    } catch (e) {
+        results.push({count: 0, visible: false, element: null, fingerprint: null, error: String(e && e.message || e)});
+    }
+}
+return results;
+"""
+
+
+def probe_locators(driver, strategies):
+    """
+    Evaluate every locator strategy in a single execute_script round trip
+
+    :param driver: Raw Selenium WebDriver instance
+    :param strategies: Ordered list of (by, value) tuples
+    :return: List of dicts (by, value, count, visible, element, fingerprint, error) in the same order
+    """
+    strategies = list(strategies)
+    if not strategies:
+        return []
+
+    try:
+        results = driver.execute_script(
+            PROBE_SCRIPT, [[by, value] for by, value in strategies], FINGERPRINT_ATTRIBUTES
+        ) or []
+    except WebDriverException as e:
+        logging.error(f"Batched probe of {len(strategies)} locators failed: {str(e)}")
+        results = []
+
+    probes = []
+    for index, (by, value) in enumerate(strategies):
+        result = results[index] if index < len(results) else {}
+        probes.append({
+            "by": by,
+            "value": value,
+            "count": result.get("count", 0),
+            "visible": result.get("visible", False),
+            "element": result.get("element"),
+            "fingerprint": result.get("fingerprint"),
+            "error": result.get("error")
+        })
+        if result.get("error"):
+            logging.debug(f"Probe error for {by}={value}: {result['error']}")
+
+    return probes
+
+
+def pick_best_probe(probes):
+    """
+    Choose the winning probe: the first visible match, otherwise the first match
+
+    :param probes: Output of probe_locators
+    :return: The winning probe dict or None if nothing matched
+    """
+    first_match = None
+    for probe in probes:
+        if probe["count"] and probe["element"] is not None:
+            if probe["visible"]:
+                return probe
+            if first_match is None:
+                first_match = probe
+    return first_match
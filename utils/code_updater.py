@@ -1,7 +1,55 @@
-import re
+import ast
 import os
 import traceback
-from selenium.webdriver.common.by import By
+from utils.locator_store import by_attribute_name
+
+LEARNED_COMMENT = "# AI-learned primary locator"
+
+
+def _primary_locator_nodes(tree):
+    """
+    Yield (element name, first locator tuple node) for every self.X = self.create_ai_locator(...) assignment
+
+    The tuple node is None when the call has no (By.X, value) locator after the name and description.
+    """
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.value, ast.Call)):
+            continue
+        target, call = node.targets[0], node.value
+        if not (isinstance(call.func, ast.Attribute) and call.func.attr == "create_ai_locator"):
+            continue
+        if not (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self"):
+            continue
+        first = call.args[2] if len(call.args) > 2 else None
+        if not (isinstance(first, ast.Tuple) and len(first.elts) == 2 and isinstance(first.elts[0], ast.Attribute)
+                and isinstance(first.elts[0].value, ast.Name) and first.elts[0].value.id == "By"):
+            first = None
+        yield target.attr, first
+
+
+def _split_lines(content):
+    """Split source into lines the way the parser numbers them (on newlines only), keeping line endings"""
+    lines = [line + "\n" for line in content.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+
+def _replace_node(lines, node, text):
+    """
+    Replace the source of an AST node in a list of lines (line endings kept)
+
+    A locator that is alone on its line gets the AI-learned comment, as before.
+    """
+    # AST column offsets count UTF-8 bytes
+    first = lines[node.lineno - 1].encode("utf-8")
+    last = lines[node.end_lineno - 1].encode("utf-8")
+    prefix = first[:node.col_offset].decode("utf-8")
+    suffix = last[node.end_col_offset:].decode("utf-8")
+    if not prefix.strip() and suffix.lstrip().startswith(","):
+        ending = suffix[len(suffix.rstrip("\r\n")):] or "\n"
+        suffix = ",  " + LEARNED_COMMENT + ending
+    lines[node.lineno - 1:node.end_lineno] = [prefix + text + suffix]
+
 
 def update_source_code_with_locators(file_path, learned_locators):
     """
@@ -46,102 +94,70 @@ def update_source_code_with_locators(file_path, learned_locators):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                lines = content.splitlines(True)  # Keep line endings
+                lines = _split_lines(content)
         except UnicodeDecodeError:
             # Fall back to latin-1 encoding
             with open(file_path, 'r', encoding='latin-1') as f:
                 content = f.read()
-                lines = content.splitlines(True)  # Keep line endings
+                lines = _split_lines(content)
         
-        # Track if we made any changes
-        changes_made = False
+        # Locate every create_ai_locator assignment and its first (By.X, value) tuple
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as e:
+            print(f"❌ Could not parse {file_path}: {str(e)}")
+            return False
         
-        # Process the file line by line to find locator definitions
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        replacements = []
+        for element_name, current_node in _primary_locator_nodes(tree):
+            print(f"🔍 Found element in source code: {element_name}")
+            
+            # Check if we have learned locators for this element
+            if not learned_locators.get(element_name):
+                continue
+            print(f"🔍 Found learned locators for {element_name}: {learned_locators[element_name]}")
+            
+            if current_node is None:
+                print(f"⚠️ Could not find first locator for {element_name}")
+                continue
+            try:
+                current_by = current_node.elts[0].attr
+                current_value = ast.literal_eval(current_node.elts[1])
+            except (AttributeError, ValueError):
+                print(f"⚠️ Could not parse current locator format: {ast.get_source_segment(content, current_node)}")
+                continue
             
-            # Look for create_ai_locator calls
-            if 'create_ai_locator' in line and 'self.' in line:
-                # Extract the element name using a more precise pattern
-                name_match = re.search(r'self\.([a-zA-Z0-9_]+)\s*=\s*self\.create_ai_locator', line)
-                if name_match:
-                    element_name = name_match.group(1)
-                    print(f"🔍 Found element in source code: {element_name}")
-                    
-                    # Check if we have learned locators for this element
-                    if element_name in learned_locators and learned_locators[element_name]:
-                        print(f"🔍 Found learned locators for {element_name}: {learned_locators[element_name]}")
-                        
-                        # Find the end of this locator definition (closing parenthesis)
-                        start_line = i
-                        parenthesis_count = line.count('(') - line.count(')')
-                        j = i
-                        
-                        while parenthesis_count > 0 and j < len(lines) - 1:
-                            j += 1
-                            parenthesis_count += lines[j].count('(') - lines[j].count(')')
-                        
-                        # Now we have the full locator definition from line i to j
-                        
-                        # Find the line with the first locator (By.X, "value")
-                        first_locator_line = None
-                        first_locator_pattern = r'\s*\(\s*By\.[A-Z_]+\s*,\s*[\'"](.*?)[\'"]\s*\)'
-                        
-                        for line_idx in range(start_line, j + 1):
-                            if re.search(first_locator_pattern, lines[line_idx]):
-                                first_locator_line = line_idx
-                                break
-                        
-                        if first_locator_line is not None:
-                            current_locator = lines[first_locator_line].strip()
-                            print(f"🔍 First locator line ({first_locator_line}): {current_locator}")
-                            
-                            # Get the best learned locator
-                            best_locator = learned_locators[element_name][0]
-                            by_type, value = best_locator
-                            
-                            # Convert by_type to string representation
-                            if isinstance(by_type, str):
-                                by_str = by_type.upper() if by_type in ['id', 'name', 'class', 'tag', 'css', 'xpath'] else by_type
-                            else:
-                                by_str = str(by_type).split('.')[-1]
-                            
-                            # Create the locator string
-                            best_locator_str = f"(By.{by_str}, '{value}')"
-                            
-                            # Debug output
-                            print(f"🔍 Current locator: {current_locator}")
-                            print(f"🔍 Best locator: {best_locator_str}")
-                            
-                            # More precise check to see if the locators are different
-                            # Extract the current locator's By type and value
-                            current_by_match = re.search(r'By\.([A-Z_]+)', current_locator)
-                            current_value_match = re.search(r'[\'"]([^\'"]*)[\'"]', current_locator)
-                            
-                            if current_by_match and current_value_match:
-                                current_by = current_by_match.group(1)
-                                current_value = current_value_match.group(1)
-                                
-                                # Compare the actual values, not just string presence
-                                if current_by != by_str or current_value != value:
-                                    print(f"🔄 Locators are different: {current_by}='{current_value}' vs {by_str}='{value}'")
-                                    
-                                    # Replace the primary locator with the best learned one
-                                    indent = len(lines[first_locator_line]) - len(lines[first_locator_line].lstrip())
-                                    new_line = ' ' * indent + best_locator_str + ',  # AI-learned primary locator\n'
-                                    lines[first_locator_line] = new_line
-                                    
-                                    changes_made = True
-                                    print(f"📝 UPDATED SOURCE CODE: Primary locator for '{element_name}' is now {best_locator_str}")
-                                else:
-                                    print(f"🔍 Best locator is already the primary one (same By type and value)")
-                            else:
-                                print(f"⚠️ Could not parse current locator format: {current_locator}")
-                        else:
-                            print(f"⚠️ Could not find first locator line for {element_name}")
+            # Get the best learned locator
+            by_type, value = learned_locators[element_name][0]
             
-            i += 1
+            # Convert the By value ("css selector") to its attribute name ("CSS_SELECTOR")
+            by_str = by_attribute_name(by_type)
+            
+            # repr() quotes and escapes the value, so selectors containing quotes stay valid Python
+            best_locator_str = f"(By.{by_str}, {value!r})"
+            print(f"🔍 Current locator: (By.{current_by}, {current_value!r})")
+            print(f"🔍 Best locator: {best_locator_str}")
+            
+            # Compare the actual values, not just string presence
+            if current_by != by_str or current_value != value:
+                print(f"🔄 Locators are different: {current_by}={current_value!r} vs {by_str}={value!r}")
+                replacements.append((current_node, best_locator_str))
+                print(f"📝 UPDATED SOURCE CODE: Primary locator for '{element_name}' is now {best_locator_str}")
+            else:
+                print(f"🔍 Best locator is already the primary one (same By type and value)")
+        
+        # Replace from the bottom up so earlier positions stay valid
+        for node, best_locator_str in sorted(replacements, key=lambda item: item[0].lineno, reverse=True):
+            _replace_node(lines, node, best_locator_str)
+        changes_made = bool(replacements)
+        
+        # Never write a file that no longer parses
+        if changes_made:
+            try:
+                ast.parse("".join(lines))
+            except SyntaxError as e:
+                print(f"❌ Updated source of {file_path} would not parse, leaving it unchanged: {str(e)}")
+                return False
         
         # Write the modified file if changes were made
         if changes_made:
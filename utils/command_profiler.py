@@ -0,0 +1,193 @@
+import logging
+import time
+from contextlib import contextmanager
+import config
+from utils.batch_probe import PROBE_SCRIPT
+from utils.dom_observer import DOM_VERSION_SCRIPT
+from utils.element_fingerprint import CAPTURE_SCRIPT
+from utils.page_activity import ACTIVITY_STATE_SCRIPT, ACTIVITY_TRACKER_SCRIPT
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Scripts sent by this framework, reported as executeScript:<name> instead of one opaque command type
+KNOWN_SCRIPTS = {
+    PROBE_SCRIPT: "probe",
+    DOM_VERSION_SCRIPT: "dom_version",
+    CAPTURE_SCRIPT: "fingerprint",
+    ACTIVITY_STATE_SCRIPT: "page_activity",
+    ACTIVITY_TRACKER_SCRIPT: "page_activity",
+}
+
+
+def command_name(command, params):
+    """
+    Name a WebDriver command for the report
+
+    :param command: Selenium command name (findElement, w3cExecuteScript, clickElement, ...)
+    :param params: Command parameters
+    :return: The command name, qualified for scripts and CDP calls
+    """
+    if command in ("executeScript", "w3cExecuteScript", "executeAsyncScript", "w3cExecuteScriptAsync"):
+        script = (params or {}).get("script")
+        return f"executeScript:{KNOWN_SCRIPTS.get(script, 'other')}"
+    if command == "executeCdpCommand":
+        return f"executeCdpCommand:{(params or {}).get('cmd')}"
+    return command
+
+
+class CommandStats:
+    """Count, total, maximum and latency histogram of one command type or call site"""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        ms = seconds * 1000
+        for index, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction):
+        """
+        Latency below which the given fraction of commands completed, from the histogram
+
+        :return: Upper bound of the bucket in seconds (the maximum for the open-ended bucket)
+        """
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return min(BUCKETS_MS[index] / 1000, self.max) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count, "total": self.total, "max": self.max,
+            "p50": self.percentile(0.5), "p95": self.percentile(0.95),
+            "histogram": dict(zip([f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"], self.buckets))
+        }
+
+
+class CommandProfiler:
+    """
+    Times every WebDriver command sent by the healing drivers of this process
+
+    install() wraps a raw driver's execute(), which every driver and element
+    command goes through. Each command is charged to its type and to the call
+    site it came from: the behave step (set by the hooks) and the locator whose
+    lookup or element command sent it (set with scope()).
+    """
+
+    def __init__(self):
+        self.commands = {}  # command name -> CommandStats
+        self.sites = {}  # (step, locator) -> {"stats": CommandStats, "commands": {name: count}}
+        self.step = None
+        self.locator = None
+
+    def install(self, driver):
+        """
+        Wrap a raw WebDriver's command executor
+
+        :param driver: Raw Selenium WebDriver
+        """
+        if getattr(driver, "_command_profiler", None) is self:
+            return
+        if not hasattr(driver, "execute"):
+            logging.debug(f"Not profiling {type(driver).__name__}: it has no command executor")
+            return
+        execute = driver.execute
+
+        def profiled_execute(command, params=None):
+            start_time = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command_name(command, params), time.perf_counter() - start_time)
+
+        driver.execute = profiled_execute
+        driver._command_profiler = self
+
+    @contextmanager
+    def scope(self, locator):
+        """Charge the commands of a block to a locator (the innermost scope wins)"""
+        previous, self.locator = self.locator, locator
+        try:
+            yield
+        finally:
+            self.locator = previous
+
+    def record(self, name, seconds):
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = CommandStats()
+        stats.add(seconds)
+
+        site = self.sites.get((self.step, self.locator))
+        if site is None:
+            site = self.sites[(self.step, self.locator)] = {"stats": CommandStats(), "commands": {}}
+        site["stats"].add(seconds)
+        site["commands"][name] = site["commands"].get(name, 0) + 1
+
+    def top_sites(self, limit):
+        """Call sites ordered by total command time, most expensive first"""
+        return sorted(self.sites.items(), key=lambda item: item[1]["stats"].total, reverse=True)[:limit]
+
+    def to_dict(self, limit=None):
+        return {
+            "commands": {name: stats.to_dict() for name, stats in self.commands.items()},
+            "sites": [
+                {"step": step, "locator": locator, "commands": site["commands"], **site["stats"].to_dict()}
+                for (step, locator), site in self.top_sites(limit or len(self.sites))
+            ]
+        }
+
+
+def print_command_profile(profiler, limit=None):
+    """Print the per-command latency table and the most expensive call sites"""
+    limit = limit or config.PROFILE_TOP_N
+    total = sum(stats.total for stats in profiler.commands.values())
+    count = sum(stats.count for stats in profiler.commands.values())
+    if not count:
+        return
+    print("\n" + "-" * 80)
+    print(f"🛰️ WEBDRIVER COMMANDS: {count} round trips, {total:.2f}s")
+    print("-" * 80)
+    print(f"  {'Command':<34} {'Count':>6} {'Total s':>8} {'Mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'Max ms':>7}")
+    for name, stats in sorted(profiler.commands.items(), key=lambda item: item[1].total, reverse=True):
+        print(
+            f"  {name[:34]:<34} {stats.count:>6} {stats.total:>8.2f} {stats.total / stats.count * 1000:>8.1f} "
+            f"{stats.percentile(0.5) * 1000:>7.1f} {stats.percentile(0.95) * 1000:>7.1f} {stats.max * 1000:>7.1f}"
+        )
+
+    print(f"\n🔥 TOP {limit} CALL SITES (step / locator):")
+    for (step, locator), site in profiler.top_sites(limit):
+        stats = site["stats"]
+        commands = ", ".join(
+            f"{name}×{n}" for name, n in sorted(site["commands"].items(), key=lambda item: item[1], reverse=True)[:4]
+        )
+        print(f"  • {stats.total:>7.2f}s {stats.count:>5} cmds  {(step or '(outside steps)')[:40]:<40} "
+              f"{(locator or '-')[:24]:<24} {commands}")
+    print("-" * 80)
+
+
+_profiler = None
+
+
+def command_profiler():
+    """Profiler shared by every healing driver of this process"""
+    global _profiler
+    if _profiler is None:
+        _profiler = CommandProfiler()
+    return _profiler
@@ -0,0 +1,291 @@
+import logging
+import re
+import time
+from html.parser import HTMLParser
+from utils.dom_snapshot import VOID_TAGS
+from utils.element_fingerprint import stable_classes
+
+# Subtrees that are dropped with everything inside them
+DROPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head", "iframe", "canvas"}
+
+# Attributes that help identify an element; everything else is discarded
+KEPT_ATTRIBUTES = ("id", "name", "type", "role", "aria-label", "placeholder", "title", "alt", "href", "for")
+
+# Elements kept even when they carry no identifying attribute or text
+INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea", "option", "label", "form", "img", "table"}
+
+# Max characters of text and of each attribute value kept per element
+TEXT_LIMIT = 80
+VALUE_LIMIT = 60
+
+# Max stable classes kept per element
+CLASS_LIMIT = 2
+
+# Rough size of one model token in characters
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class DistilledNode:
+    """One element that survived distillation"""
+
+    __slots__ = ("tag", "attrs", "text", "children", "parent", "depth", "index", "_size")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs  # Only KEPT_ATTRIBUTES plus "class" (stable classes)
+        self.text = ""
+        self.children = []
+        self.parent = parent
+        self.depth = 0
+        self.index = 0
+        self._size = None
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def is_identifying(self):
+        """Whether the element is worth keeping on its own"""
+        return bool(self.text) or self.tag in INTERACTIVE_TAGS or any(
+            key in self.attrs for key in ("id", "name", "role", "aria-label", "placeholder", "title")
+        )
+
+    def line(self):
+        """Single-line rendering without indentation"""
+        attrs = "".join(f' {key}="{value}"' for key, value in self.attrs.items())
+        return f"<{self.tag}{attrs}>" + (f" {self.text}" if self.text else "")
+
+    def subtree_size(self):
+        """Characters needed to render this element and its descendants"""
+        if self._size is None:
+            self._size = self.depth * 2 + len(self.line()) + 1 + sum(child.subtree_size() for child in self.children)
+        return self._size
+
+    def walk(self):
+        """Yield this element and its descendants in document order"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+class _DistillingParser(HTMLParser):
+    """Streaming parser that keeps identifying attributes and visible text only"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = DistilledNode("#document", {}, None)
+        self.stack = [self.root]
+        self.skip_depth = 0
+        self.elements = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in DROPPED_TAGS:
+            self.skip_depth = 1
+            return
+
+        self.elements += 1
+        kept = {}
+        values = dict(attrs)
+        for key in KEPT_ATTRIBUTES:
+            if values.get(key):
+                kept[key] = values[key][:VALUE_LIMIT]
+        classes = stable_classes((values.get("class") or "").split())[:CLASS_LIMIT]
+        if classes:
+            kept["class"] = " ".join(classes)
+
+        node = DistilledNode(tag, kept, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closing tag has no end tag, so it must not open a skipped level
+        if self.skip_depth or tag in DROPPED_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and not self.skip_depth and self.stack[-1].tag == tag:
+            self._close(len(self.stack) - 1)
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth -= 1
+            return
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                self._close(depth)
+                return
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        text = _WHITESPACE.sub(" ", data).strip()
+        node = self.stack[-1]
+        if text and node is not self.root and len(node.text) < TEXT_LIMIT:
+            node.text = (node.text + " " + text).strip()[:TEXT_LIMIT]
+
+    def close(self):
+        super().close()
+        self._close(1)
+
+    def _close(self, depth):
+        """Pop elements down to depth, pruning each one as it is completed"""
+        while len(self.stack) > depth:
+            self._prune(self.stack.pop())
+
+    @staticmethod
+    def _prune(node):
+        """
+        Drop empty wrappers and collapse single-child wrapper chains
+
+        Runs when an element closes, so the kept tree never holds the full page.
+        """
+        # Elements close in document order, so the node is its parent's last child
+        parent = node.parent
+        if node.is_identifying():
+            return
+        if not node.children:
+            parent.children.pop()
+        elif len(node.children) == 1 and not node.classes:
+            # A wrapper with nothing of its own adds a level and nothing else
+            child = node.children[0]
+            child.parent = parent
+            parent.children[-1] = child
+
+
+class DistilledDOM:
+    """Compact outline of a page, renderable within a byte or token budget"""
+
+    def __init__(self, root, source_bytes, elements, build_time):
+        self.root = root
+        self.source_bytes = source_bytes
+        self.elements = elements  # Elements seen in the source
+        self.build_time = build_time
+        self.nodes = []
+        for index, node in enumerate(n for n in root.walk() if n is not root):
+            node.index = index
+            node.depth = node.parent.depth + 1 if node.parent is not root else 0
+            self.nodes.append(node)
+
+    def find_focus(self, fingerprint):
+        """
+        Find the element that best matches a fingerprint
+
+        :param fingerprint: Fingerprint dict of the element to focus on
+        :return: DistilledNode or None if nothing resembles it
+        """
+        if not fingerprint:
+            return None
+        classes = set(fingerprint.get("classes") or [])
+        text = (fingerprint.get("text") or "")[:TEXT_LIMIT]
+        attrs = fingerprint.get("attrs") or {}
+
+        best, best_score = None, 0
+        for node in self.nodes:
+            score = 0
+            if fingerprint.get("id") and node.attrs.get("id") == fingerprint["id"]:
+                score += 5
+            if fingerprint.get("name") and node.attrs.get("name") == fingerprint["name"]:
+                score += 5
+            if text and node.text == text:
+                score += 3
+            score += sum(2 for key, value in attrs.items() if node.attrs.get(key) == value[:VALUE_LIMIT])
+            score += len(classes.intersection(node.classes))
+            if score and node.tag == fingerprint.get("tag"):
+                score += 1
+            if score > best_score:
+                best, best_score = node, score
+        return best
+
+    def outline(self, max_tokens=None, max_bytes=None, focus=None):
+        """
+        Render the outline, one indented element per line
+
+        With a focus element the outline covers the largest enclosing region that
+        fits the budget, preceded by the chain of ancestors leading to it.
+        Without one, elements are emitted in document order until the budget is used.
+
+        :param max_tokens: Budget in model tokens (approximate)
+        :param max_bytes: Budget in characters
+        :param focus: Fingerprint dict of the element to center the outline on
+        :return: Outline string
+        """
+        budget = min(
+            max_tokens * CHARS_PER_TOKEN if max_tokens else float("inf"),
+            max_bytes if max_bytes else float("inf")
+        )
+
+        region = self.root
+        ancestors = []
+        focus_node = self.find_focus(focus)
+        if focus_node is not None:
+            region = focus_node
+            while region.parent is not self.root and region.parent.subtree_size() <= budget - self._path_size(region.parent):
+                region = region.parent
+            ancestors = []
+            node = region.parent
+            while node is not self.root:
+                ancestors.append(node)
+                node = node.parent
+            ancestors.reverse()
+
+        nodes = ancestors + [n for n in region.walk() if n is not self.root]
+        lines = []
+        used = 0
+        for position, node in enumerate(nodes):
+            line = "  " * node.depth + node.line()
+            if used + len(line) + 1 > budget:
+                lines.append(f"... ({len(nodes) - position} more elements)")
+                break
+            lines.append(line)
+            used += len(line) + 1
+        return "\n".join(lines)
+
+    @staticmethod
+    def _path_size(node):
+        size = 0
+        node = node.parent
+        while node is not None and node.parent is not None:
+            size += node.depth * 2 + len(node.line()) + 1
+            node = node.parent
+        return size
+
+
+def distill(html, chunk_size=65536):
+    """
+    Distill page source into a compact outline tree in one streaming pass
+
+    :param html: Page source, or an iterable of source chunks
+    :param chunk_size: Size of the pieces fed to the parser when html is a string
+    :return: DistilledDOM
+    """
+    start_time = time.time()
+    parser = _DistillingParser()
+    source_bytes = 0
+    chunks = (html[i:i + chunk_size] for i in range(0, len(html), chunk_size)) if isinstance(html, str) else html
+    for chunk in chunks:
+        source_bytes += len(chunk)
+        parser.feed(chunk)
+    parser.close()
+
+    distilled = DistilledDOM(parser.root, source_bytes, parser.elements, time.time() - start_time)
+    logging.debug(
+        f"Distilled {source_bytes} bytes ({parser.elements} elements) into {len(distilled.nodes)} elements "
+        f"in {distilled.build_time * 1000:.1f}ms"
+    )
+    return distilled
+
+
+def distilled_dom(snapshot):
+    """Return the distilled outline of a DOMSnapshot, building it on first use"""
+    if snapshot.distilled is None:
+        snapshot.distilled = distill(snapshot.html or "")
+    return snapshot.distilled
@@ -0,0 +1,42 @@
+import logging
+from selenium.common.exceptions import WebDriverException
+
+# Attribute changes that can alter which element a locator resolves to.
+# Class and style churn (focus rings, hover states) is deliberately ignored.
+OBSERVED_ATTRIBUTES = ["id", "name", "type", "href", "role", "aria-label", "placeholder", "title", "disabled"]
+
+# Installs a MutationObserver once per document and returns [url, document token, generation].
+# The token changes on every navigation because the window object is replaced.
+DOM_VERSION_SCRIPT = """
+var state = window.__selfHealingDom;
+if (!state) {
+    state = window.__selfHealingDom = {
+        token: Date.now().toString(36) + Math.random().toString(36).slice(2),
+        generation: 0
+    };
+    var observer = new MutationObserver(function () { state.generation++; });
+    observer.observe(document.documentElement || document, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: arguments[0]
+    });
+}
+return [location.href, state.token, state.generation];
+"""
+
+
+def read_dom_version(driver):
+    """
+    Read the DOM version of the current page, installing the observer if needed
+
+    :param driver: Raw Selenium WebDriver instance
+    :return: (url, document token, generation) tuple, or None if it cannot be read
+    """
+    try:
+        url, token, generation = driver.execute_script(DOM_VERSION_SCRIPT, OBSERVED_ATTRIBUTES)
+        return url, token, generation
+    except (WebDriverException, TypeError, ValueError) as e:
+        logging.debug(f"Could not read DOM version: {str(e)}")
+        return None
@@ -0,0 +1,114 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from utils.atomic_io import atomic_write_bytes
+
+INDEX_FILE = "index.jsonl"
+SNAPSHOT_DIR = "snapshots"
+
+
+class DOMRecorder:
+    """
+    Saves the page behind every locator lookup for offline replay
+
+    Page sources are gzipped and stored under their SHA-256, so a page that is
+    looked up many times is written once. Each lookup appends one JSON line to
+    index.jsonl with the URL, the locator as it stood before the lookup and the
+    outcome. The page source is only fetched again when the DOM version changes.
+    """
+
+    def __init__(self, directory):
+        """
+        :param directory: Recording directory (created on first write)
+        """
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._version = None
+        self._digest = None
+        self.stats = {"lookups": 0, "snapshots_written": 0, "snapshots_reused": 0}
+
+    def _snapshot_path(self, digest):
+        return os.path.join(self.directory, SNAPSHOT_DIR, digest[:2], f"{digest}.html.gz")
+
+    def store_snapshot(self, html):
+        """
+        Store a page source unless an identical one is already stored
+
+        :param html: Page source
+        :return: SHA-256 hex digest identifying the snapshot
+        """
+        data = (html or "").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._snapshot_path(digest)
+        if os.path.exists(path):
+            self.stats["snapshots_reused"] += 1
+        else:
+            # mtime=0 keeps the compressed bytes identical for identical pages
+            atomic_write_bytes(path, gzip.compress(data, mtime=0))
+            self.stats["snapshots_written"] += 1
+        return digest
+
+    def record(self, driver, version, entry):
+        """
+        Record one lookup
+
+        :param driver: Raw Selenium WebDriver the lookup ran on
+        :param version: DOM version the lookup ended on, or None if unknown
+        :param entry: JSON-serializable lookup details (locator, strategies, outcome, ...)
+        """
+        try:
+            if version is None or version != self._version or self._digest is None:
+                self._digest = self.store_snapshot(driver.page_source)
+                self._version = version
+            else:
+                self.stats["snapshots_reused"] += 1
+
+            record = dict(entry)
+            record["snapshot"] = self._digest
+            record["url"] = version[0] if version else driver.current_url
+            record.setdefault("timestamp", time.time())
+            # One short append per line; concurrent workers interleave whole lines
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            self.stats["lookups"] += 1
+        except Exception as e:
+            logging.error(f"Error recording DOM snapshot for '{entry.get('locator')}': {str(e)}")
+
+
+def load_recordings(directory):
+    """
+    Read the lookup records of a recording directory
+
+    :param directory: Directory written by DOMRecorder
+    :return: List of record dicts in recording order (malformed lines are skipped)
+    """
+    index_path = os.path.join(directory, INDEX_FILE)
+    records = []
+    if not os.path.exists(index_path):
+        return records
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logging.warning(f"Skipping malformed record on line {line_number} of {index_path}")
+    return records
+
+
+def load_snapshot_html(directory, digest):
+    """
+    Read a stored page source
+
+    :param directory: Directory written by DOMRecorder
+    :param digest: Snapshot digest from a record
+    :return: Page source
+    """
+    path = os.path.join(directory, SNAPSHOT_DIR, digest[:2], f"{digest}.html.gz")
+    with gzip.open(path, "rb") as f:
+        return f.read().decode("utf-8")
@@ -0,0 +1,456 @@
+import logging
+import re
+import time
+from collections import defaultdict
+from itertools import islice
+from html.parser import HTMLParser
+from selenium.webdriver.common.by import By
+from utils.element_fingerprint import stable_classes
+
+# Elements that never have a closing tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+
+# Subtrees that never hold healable elements
+SKIPPED_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+# Attributes indexed as free-text descriptions of the element
+DESCRIPTIVE_ATTRIBUTES = ("aria-label", "placeholder", "title", "alt", "role", "aria-labelledby")
+
+# Attributes that can anchor a generated XPath when they are unique among elements of the same tag
+ANCHOR_ATTRIBUTES = ("data-testid", "data-test", "aria-label", "placeholder", "title", "alt", "href")
+
+# Longest positional path generated below a uniquely identified ancestor
+MAX_ANCHORED_STEPS = 4
+
+# Form fields located through the text of their label, and how far above a label its field group can be
+FIELD_TAGS = ("input", "textarea", "select")
+LABEL_SEARCH_DEPTH = 3
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-zA-Z]+")
+_CAMEL_SPLIT = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def tokenize(value):
+    """
+    Split an attribute value or text into lowercase tokens
+
+    "oxd-userdropdown-name firstName" -> {"oxd", "userdropdown", "name", "firstname", "first"}
+
+    :param value: String to tokenize
+    :return: Set of lowercase tokens
+    """
+    tokens = set()
+    for part in _TOKEN_SPLIT.split(value or ""):
+        if not part:
+            continue
+        tokens.add(part.lower())
+        for piece in _CAMEL_SPLIT.findall(part):
+            tokens.add(piece.lower())
+    return tokens
+
+
+def normalize_text(text):
+    """Collapse whitespace and lowercase text for comparisons"""
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+class DOMNode:
+    """A single element of a DOMSnapshot"""
+
+    __slots__ = ("index", "tag", "attrs", "parent", "children", "depth", "position", "own_text", "in_svg")
+
+    def __init__(self, index, tag, attrs, parent, position):
+        self.index = index
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.position = position  # 1-based index among siblings with the same tag
+        self.own_text = []
+        self.in_svg = tag == "svg" or (parent is not None and parent.in_svg)
+
+    @property
+    def id(self):
+        return self.attrs.get("id")
+
+    @property
+    def name(self):
+        return self.attrs.get("name")
+
+    @property
+    def classes(self):
+        return (self.attrs.get("class") or "").split()
+
+    @property
+    def text(self):
+        """Normalized text directly inside this element"""
+        return normalize_text(" ".join(self.own_text))
+
+    def full_text(self, normalize=True):
+        """
+        Text of this element and all its descendants
+
+        :param normalize: Lowercase the text as well as collapsing whitespace
+        :return: Text string
+        """
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            parts.extend(node.own_text)
+            stack.extend(reversed(node.children))
+        text = " ".join(parts)
+        return normalize_text(text) if normalize else _WHITESPACE.sub(" ", text).strip()
+
+    def ancestors(self):
+        """Yield ancestors from the parent up to the root"""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def steps_below(self, ancestor):
+        """
+        Position-qualified XPath steps from an ancestor down to this element
+
+        :param ancestor: DOMNode this element descends from
+        :return: Relative path such as "div[2]/input[1]"
+        """
+        steps = []
+        node = self
+        while node is not ancestor:
+            steps.append(f"{node.tag}[{node.position}]")
+            node = node.parent
+        return "/".join(reversed(steps))
+
+    def __repr__(self):
+        return f"<DOMNode {self.tag} id={self.id!r} name={self.name!r} classes={self.classes!r}>"
+
+
+class _SnapshotParser(HTMLParser):
+    """Single-pass parser that builds the node list and every index of a DOMSnapshot"""
+
+    def __init__(self, snapshot):
+        super().__init__(convert_charrefs=True)
+        self.snapshot = snapshot
+        self.stack = []
+        self.skip_depth = 0
+        self.root_positions = defaultdict(int)
+        self.child_positions = {}
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in SKIPPED_TEXT_TAGS:
+            self.skip_depth = 1
+            return
+
+        parent = self.stack[-1] if self.stack else None
+        counters = self.child_positions.setdefault(parent.index, defaultdict(int)) if parent else self.root_positions
+        counters[tag] += 1
+
+        node = DOMNode(len(self.snapshot.nodes), tag, {k: v if v is not None else "" for k, v in attrs}, parent, counters[tag])
+        if parent is not None:
+            parent.children.append(node)
+        self.snapshot._add(node)
+
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closing tag has no end tag, so it must not open a skipped level
+        if self.skip_depth or tag in SKIPPED_TEXT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and not self.skip_depth and self.stack and self.stack[-1].tag == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth -= 1
+            return
+        # Pop back to the matching element, tolerating unclosed children
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        if self.skip_depth or not self.stack or not data.strip():
+            return
+        node = self.stack[-1]
+        node.own_text.append(data)
+        for token in tokenize(data):
+            self.snapshot.by_text[token].append(node)
+
+
+class DOMSnapshot:
+    """
+    Parsed, indexed view of a page built in one pass over page_source
+
+    Candidate generation uses dictionary lookups on these indexes instead of
+    rescanning the raw HTML with regular expressions.
+    """
+
+    def __init__(self, html, url=None):
+        """
+        :param html: Page source to parse
+        :param url: URL the source was taken from (informational)
+        """
+        start_time = time.time()
+        self.url = url
+        self.html = html  # Kept for consumers that re-read the source, such as utils.dom_distiller
+        self.nodes = []
+        self.by_tag = defaultdict(list)
+        self.by_id = defaultdict(list)
+        self.by_name = defaultdict(list)
+        self.by_type = defaultdict(list)
+        self.by_class = defaultdict(list)
+        self.by_id_token = defaultdict(list)
+        self.by_name_token = defaultdict(list)
+        self.by_attr_token = defaultdict(list)
+        self.by_text = defaultdict(list)
+        self.candidates = {}  # Generated candidates per locator name
+        self.features = None  # Vectorized element features, built on demand by utils.similarity_ranker
+        self.distilled = None  # Compact outline, built on demand by utils.dom_distiller
+
+        parser = _SnapshotParser(self)
+        parser.feed(html or "")
+        parser.close()
+
+        self.build_time = time.time() - start_time
+        logging.debug(f"Built DOM snapshot with {len(self.nodes)} elements in {self.build_time * 1000:.1f}ms")
+
+    def _add(self, node):
+        """Register a node in every index"""
+        self.nodes.append(node)
+        self.by_tag[node.tag].append(node)
+        attrs = node.attrs
+
+        if attrs.get("id"):
+            self.by_id[attrs["id"]].append(node)
+            for token in tokenize(attrs["id"]):
+                self.by_id_token[token].append(node)
+        if attrs.get("name"):
+            self.by_name[attrs["name"]].append(node)
+            for token in tokenize(attrs["name"]):
+                self.by_name_token[token].append(node)
+        if attrs.get("type"):
+            self.by_type[attrs["type"].lower()].append(node)
+        for class_name in node.classes:
+            self.by_class[class_name].append(node)
+        for attribute in DESCRIPTIVE_ATTRIBUTES:
+            if attrs.get(attribute):
+                for token in tokenize(attrs[attribute]):
+                    self.by_attr_token[token].append(node)
+
+    def class_token_index(self):
+        """Index of class-name tokens, built on first use"""
+        if not hasattr(self, "_class_tokens"):
+            self._class_tokens = defaultdict(list)
+            for class_name, nodes in self.by_class.items():
+                for token in tokenize(class_name):
+                    self._class_tokens[token].extend(nodes)
+        return self._class_tokens
+
+    def is_unique(self, by, value):
+        """Check whether an ID or NAME locator identifies exactly one element"""
+        if by == By.ID:
+            return len(self.by_id.get(value, ())) == 1
+        if by == By.NAME:
+            return len(self.by_name.get(value, ())) == 1
+        return False
+
+    def locators_for(self, node):
+        """
+        Build locators that uniquely identify a node, most readable first
+
+        XPaths are anchored on the node itself, its text, its label or a uniquely
+        identified ancestor. None of them depends on the document root, so a
+        learned XPath survives unrelated layout changes; a node that nothing
+        stable identifies gets no XPath at all.
+
+        :param node: DOMNode from this snapshot
+        :return: List of (by, value) tuples
+        """
+        locators = []
+        if node.id and self.is_unique(By.ID, node.id):
+            locators.append((By.ID, node.id))
+        if node.name and self.is_unique(By.NAME, node.name):
+            locators.append((By.NAME, node.name))
+        if node.in_svg:
+            return locators
+
+        xpaths = []
+        text = node.full_text()
+        if text and "'" not in text and len(text) <= 60 and (node.tag in ("a", "button") or not node.children):
+            if sum(1 for n in self.by_tag[node.tag] if n.full_text() == text) == 1:
+                xpaths.append(f"//{node.tag}[normalize-space()='{node.full_text(normalize=False)}']")
+
+        step = self._anchor_step(node, own=True)
+        if step:
+            xpaths.append(f"//{step}")
+
+        label = self.label_for(node) if node.tag in FIELD_TAGS else None
+        if label is not None:
+            anchor = f"//label[normalize-space()='{label.full_text(normalize=False)}']"
+            end = label.index + sum(1 for _ in _descendants(label))
+            if next((n for n in islice(self.nodes, end + 1, None) if n.tag == node.tag), None) is node:
+                xpaths.append(f"{anchor}/following::{node.tag}[1]")
+            else:
+                # A for= label need not share a field group with its field; then there is no group anchor
+                group = self._field_group(label)
+                levels = next((i for i, ancestor in enumerate(label.ancestors(), 1) if ancestor is group), None)
+                if group is not None and levels is not None and any(ancestor is group for ancestor in node.ancestors()):
+                    xpaths.append(f"{anchor}/ancestor::*[{levels}]//{node.tag}")
+
+        for depth, ancestor in enumerate(node.ancestors(), 1):
+            if depth > MAX_ANCHORED_STEPS:
+                break
+            step = self._anchor_step(ancestor)
+            if step:
+                xpaths.append(f"//{step}/{node.steps_below(ancestor)}")
+                break
+
+        for xpath in xpaths:
+            if (By.XPATH, xpath) not in locators:
+                locators.append((By.XPATH, xpath))
+        return locators
+
+    def _anchor_step(self, node, own=False):
+        """
+        XPath step that selects only this node: a unique id or name, a descriptive
+        attribute or a stable class that no other element with its tag has
+
+        :param node: DOMNode from this snapshot
+        :param own: The node is the locator target, whose id and name are already direct locators
+        :return: Step such as "div[@id='app']", or None
+        """
+        if not own:
+            for attribute, by in (("id", By.ID), ("name", By.NAME)):
+                value = node.attrs.get(attribute)
+                if value and "'" not in value and self.is_unique(by, value):
+                    return f"{node.tag}[@{attribute}='{value}']"
+        same_tag = self.by_tag[node.tag]
+        for attribute in ANCHOR_ATTRIBUTES:
+            value = node.attrs.get(attribute)
+            if value and "'" not in value and sum(1 for n in same_tag if n.attrs.get(attribute) == value) == 1:
+                return f"{node.tag}[@{attribute}='{value}']"
+        for class_name in stable_classes(node.classes):
+            if sum(1 for n in self.by_class[class_name] if n.tag == node.tag) == 1:
+                return f"{node.tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        return None
+
+    def _field_group(self, label):
+        """
+        The nearest ancestor of a label that holds a form field, if it holds only that label and field
+
+        :param label: Label DOMNode
+        :return: Group DOMNode or None
+        """
+        for depth, ancestor in enumerate(label.ancestors()):
+            if depth >= LABEL_SEARCH_DEPTH:
+                return None
+            fields = [n for n in _descendants(ancestor) if n.tag in FIELD_TAGS]
+            if fields:
+                labels = sum(1 for n in _descendants(ancestor) if n.tag == "label")
+                return ancestor if len(fields) == 1 and labels == 1 else None
+        return None
+
+    def labelled_field(self, label):
+        """
+        The form field a label names: its for= target, or the only field in the label's group
+
+        :param label: Label DOMNode
+        :return: Field DOMNode or None
+        """
+        target = label.attrs.get("for")
+        if target and len(self.by_id.get(target, ())) == 1 and self.by_id[target][0].tag in FIELD_TAGS:
+            return self.by_id[target][0]
+        group = self._field_group(label)
+        if group is None:
+            return None
+        return next(n for n in _descendants(group) if n.tag in FIELD_TAGS)
+
+    def label_for(self, node):
+        """
+        The label naming a form field, if its text is unique on the page
+
+        :param node: Form field DOMNode
+        :return: Label DOMNode or None
+        """
+        for depth, ancestor in enumerate(node.ancestors()):
+            if depth >= LABEL_SEARCH_DEPTH + MAX_ANCHORED_STEPS:
+                return None
+            labels = [n for n in _descendants(ancestor) if n.tag == "label"]
+            if not labels:
+                continue
+            label = labels[0] if len(labels) == 1 else None
+            if label is None or self.labelled_field(label) is not node:
+                return None
+            text = label.full_text()
+            if not text or "'" in text or sum(1 for n in self.by_tag["label"] if n.full_text() == text) != 1:
+                return None
+            return label
+        return None
+
+
+def _descendants(node):
+    stack = list(node.children)
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(current.children)
+
+
+class DOMSnapshotCache:
+    """
+    Keeps the snapshot of the current page so every heal on that page shares one parse
+
+    Entries are keyed on the DOM version reported by the injected MutationObserver,
+    so an unchanged page is served without fetching page_source at all. Without a
+    version the page source itself is the key.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._snapshot = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, driver, version=None):
+        """
+        Return a snapshot of the current page, reusing the cached one if the DOM is unchanged
+
+        :param driver: Raw Selenium WebDriver instance
+        :param version: DOM version tuple (url, token, generation) or None if unknown
+        :return: DOMSnapshot
+        """
+        if version is not None and self._snapshot is not None and version == self._key:
+            self.hits += 1
+            return self._snapshot
+
+        source = driver.page_source
+        key = version if version is not None else (len(source), hash(source))
+        if self._snapshot is not None and key == self._key:
+            self.hits += 1
+            return self._snapshot
+
+        self.misses += 1
+        url = version[0] if version is not None else driver.current_url
+        self._snapshot = DOMSnapshot(source, url=url)
+        self._key = key
+        return self._snapshot
+
+    def clear(self):
+        """Drop the cached snapshot"""
+        self._key = None
+        self._snapshot = None
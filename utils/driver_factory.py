@@ -2,6 +2,9 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.edge.service import Service as EdgeService
 from utils.ai_self_healing import AISelfHealingDriver
+from utils.page_activity import install_activity_tracker
+import config
+import logging
 import os
 
 def create_driver(browser_name="chrome", headless=False):
@@ -48,9 +51,122 @@ def create_driver(browser_name="chrome", headless=False):
         
         driver.maximize_window()
         
+        # Count requests from the first byte of every page (Chromium only)
+        install_activity_tracker(driver)
+        
         # Wrap the driver with our self-healing driver
         return AISelfHealingDriver(driver)
     
     except Exception as e:
         print(f"Error creating driver: {str(e)}")
         raise
+
+
+class DriverSessionPool:
+    """
+    Keeps warm browser sessions and hands them out one scenario at a time
+    
+    Released sessions are reset (cookies, storage, extra windows, about:blank)
+    instead of quit. A session is recycled after max_uses scenarios or after an
+    error. The first browser that starts is remembered and tried first, so a
+    failing browser is not tried again while it keeps working; the configured
+    browsers stay available as fallbacks.
+    """
+    
+    def __init__(self, browsers=None, headless=None, implicit_wait=None, max_uses=None):
+        """
+        :param browsers: Browsers to try, in order of preference (defaults to config.BROWSER, then the others)
+        :param headless: Run browsers headless (defaults to config.HEADLESS)
+        :param implicit_wait: Implicit wait applied to new sessions, in seconds
+        :param max_uses: Scenarios per session before it is recycled (defaults to config.SESSION_MAX_USES)
+        """
+        if browsers is None:
+            browsers = [config.BROWSER] + [b for b in ("chrome", "edge") if b != config.BROWSER]
+        self.browsers = list(browsers)
+        self.headless = config.HEADLESS if headless is None else headless
+        self.implicit_wait = implicit_wait
+        self.max_uses = config.SESSION_MAX_USES if max_uses is None else max_uses
+        self.browser = None  # Browser that started successfully
+        self.idle = []
+        self.in_use = set()
+        self.uses = {}  # driver -> number of scenarios served
+    
+    def _create(self):
+        """Start a new session with the remembered browser, or find one that starts"""
+        candidates = list(self.browsers)
+        if self.browser:
+            candidates = [self.browser] + [b for b in candidates if b != self.browser]
+        # Start-up errors can be transient, so failures only count for this attempt
+        failures = []
+        last_error = None
+        for browser in candidates:
+            try:
+                driver = create_driver(browser, headless=self.headless)
+            except Exception as e:
+                print(f"⚠️ Error creating {browser} driver: {str(e)}")
+                failures.append(f"{browser} ({type(e).__name__})")
+                last_error = e
+                continue
+            
+            if self.browser != browser:
+                self.browser = browser
+                print(f"🌐 Using {browser.capitalize()} browser")
+            if self.implicit_wait is not None:
+                driver.implicitly_wait(self.implicit_wait)
+            self.uses[driver] = 0
+            return driver
+        
+        raise RuntimeError(f"No browser could be started (tried: {', '.join(failures) or 'none configured'})") from last_error
+    
+    def acquire(self):
+        """
+        Get a clean session, reusing a warm one when available
+        
+        :return: AISelfHealingDriver
+        """
+        driver = self.idle.pop() if self.idle else self._create()
+        self.in_use.add(driver)
+        return driver
+    
+    def release(self, driver, error=False):
+        """
+        Return a session to the pool
+        
+        :param driver: AISelfHealingDriver obtained from acquire()
+        :param error: The session hit an error and must not be reused
+        """
+        self.in_use.discard(driver)
+        self.uses[driver] = self.uses.get(driver, 0) + 1
+        
+        if error or self.uses[driver] >= self.max_uses:
+            reason = "after an error" if error else f"after {self.uses[driver]} uses"
+            logging.info(f"Recycling browser session {reason}")
+            self._quit(driver)
+            return
+        
+        try:
+            driver.reset_session_state()
+        except Exception as e:
+            logging.warning(f"Could not reset browser session, recycling it: {str(e)}")
+            self._quit(driver)
+            return
+        self.idle.append(driver)
+    
+    def _quit(self, driver):
+        self.uses.pop(driver, None)
+        try:
+            driver.driver.quit()
+            print("🔒 Browser closed")
+        except Exception as e:
+            print(f"⚠️ Error closing browser: {str(e)}")
+        try:
+            driver.locator_store.close()
+        except Exception as e:
+            logging.error(f"Error closing learned locator store: {str(e)}")
+    
+    def close_all(self):
+        """Quit every session, idle or in use"""
+        for driver in self.idle + list(self.in_use):
+            self._quit(driver)
+        self.idle = []
+        self.in_use = set()
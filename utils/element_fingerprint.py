@@ -0,0 +1,118 @@
+import logging
+import re
+from selenium.common.exceptions import WebDriverException
+
+# Attributes kept in a fingerprint besides id, name and class
+FINGERPRINT_ATTRIBUTES = ["type", "role", "aria-label", "placeholder", "title", "alt", "href"]
+
+# State modifiers and generated class names say nothing about which element it is
+UNSTABLE_CLASS = re.compile(r"--(active|focus|hover|error|disabled|selected|open|checked|loading)$|[0-9]{3,}")
+
+# Number of ancestors recorded in the parent chain
+PARENT_DEPTH = 4
+
+# Max characters of text kept in a fingerprint
+TEXT_LIMIT = 80
+
+# JavaScript function shared by the capture script and the batched probe script
+FINGERPRINT_FUNCTION = """
+function __fingerprint(el, attributes) {
+    if (!el || el.nodeType !== 1) { return null; }
+    var unstable = /--(active|focus|hover|error|disabled|selected|open|checked|loading)$|[0-9]{3,}/;
+    function stableClasses(node) {
+        return Array.prototype.filter.call(node.classList || [], function (c) { return !unstable.test(c); });
+    }
+    function label(node) {
+        var classes = stableClasses(node);
+        return node.tagName.toLowerCase() + (classes.length ? '.' + classes[0] : '');
+    }
+    var attrs = {};
+    for (var i = 0; i < attributes.length; i++) {
+        var value = el.getAttribute(attributes[i]);
+        if (value) { attrs[attributes[i]] = value; }
+    }
+    var parents = [];
+    var depth = 0;
+    var parent = el.parentElement;
+    while (parent) {
+        if (parents.length < %d) { parents.push(label(parent)); }
+        depth++;
+        parent = parent.parentElement;
+    }
+    var position = 1;
+    for (var sibling = el.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+        if (sibling.tagName === el.tagName) { position++; }
+    }
+    var rect = el.getBoundingClientRect();
+    return {
+        tag: el.tagName.toLowerCase(),
+        id: el.getAttribute('id') || null,
+        name: el.getAttribute('name') || null,
+        classes: stableClasses(el),
+        text: (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim().slice(0, %d),
+        attrs: attrs,
+        parents: parents,
+        depth: depth,
+        position: position,
+        rect: {x: Math.round(rect.left), y: Math.round(rect.top), width: Math.round(rect.width), height: Math.round(rect.height)}
+    };
+}
+""" % (PARENT_DEPTH, TEXT_LIMIT)
+
+CAPTURE_SCRIPT = FINGERPRINT_FUNCTION + "return __fingerprint(arguments[0], arguments[1]);"
+
+
+def capture_fingerprint(driver, element):
+    """
+    Capture the fingerprint of a live element in one execute_script call
+
+    :param driver: Raw Selenium WebDriver instance
+    :param element: WebElement to fingerprint
+    :return: Fingerprint dict or None if it cannot be captured
+    """
+    try:
+        return driver.execute_script(CAPTURE_SCRIPT, element, FINGERPRINT_ATTRIBUTES)
+    except WebDriverException as e:
+        logging.debug(f"Could not capture element fingerprint: {str(e)}")
+        return None
+
+
+def stable_classes(classes):
+    """Drop state modifiers and generated names from a class list"""
+    return [c for c in classes if not UNSTABLE_CLASS.search(c)]
+
+
+def fingerprint_from_node(node):
+    """
+    Build a fingerprint for a DOMSnapshot node (no bounding box is available offline)
+
+    :param node: DOMNode
+    :return: Fingerprint dict with the same keys as a captured one
+    """
+    parents = []
+    for ancestor in node.ancestors():
+        if len(parents) >= PARENT_DEPTH:
+            break
+        classes = stable_classes(ancestor.classes)
+        parents.append(ancestor.tag + ("." + classes[0] if classes else ""))
+
+    return {
+        "tag": node.tag,
+        "id": node.id or None,
+        "name": node.name or None,
+        "classes": stable_classes(node.classes),
+        "text": node.full_text(normalize=False)[:TEXT_LIMIT],
+        "attrs": {key: node.attrs[key] for key in FINGERPRINT_ATTRIBUTES if node.attrs.get(key)},
+        "parents": parents,
+        "depth": node.depth,
+        "position": node.position,
+        "rect": None
+    }
+
+
+def same_element_identity(first, second):
+    """Check whether two fingerprints describe the same element, ignoring position and size"""
+    if not first or not second:
+        return False
+    keys = ("tag", "id", "name", "classes", "text", "attrs", "parents")
+    return all(first.get(key) == second.get(key) for key in keys)
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from utils.atomic_io import atomic_write_json
+from utils.locator_store import normalize_by
+
+# Bump when the prompt changes so cached answers to the old prompt are not reused
+PROMPT_VERSION = 2
+
+SYSTEM_PROMPT = (
+    "You repair broken Selenium locators. You get a description of one element and an indented "
+    "outline of the current page (one element per line, identifying attributes and text only). Reply with JSON only: "
+    '{"locators": [{"by": "css selector" | "xpath" | "id" | "name" | "link text", "value": "..."}]} '
+    "listing up to 3 locators for that element, most robust first. Prefer ids, names, stable "
+    "attributes and visible text over positions. Reply with an empty list if the element is absent."
+)
+
+# Shorthand strategy names models tend to use
+BY_ALIASES = {"css": "css selector", "link": "link text", "class": "class name", "tag": "tag name"}
+
+
+def parse_locators(content):
+    """
+    Pull (by, value) pairs out of a model reply
+
+    :param content: Message content returned by the model
+    :return: List of (by, value) tuples with Selenium By values
+    """
+    match = re.search(r"\{.*\}", content or "", re.DOTALL)
+    if not match:
+        return []
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        logging.warning("Generative healer returned malformed JSON")
+        return []
+
+    locators = []
+    for item in data.get("locators", []):
+        if not isinstance(item, dict) or not item.get("value"):
+            continue
+        by = str(item.get("by", "")).strip().lower()
+        by = normalize_by(BY_ALIASES.get(by, by))
+        if by and (by, item["value"]) not in locators:
+            locators.append((by, item["value"]))
+    return locators
+
+
+class GenerativeHealer:
+    """
+    Asks an OpenAI-compatible chat completions endpoint for locators
+
+    Answers are cached on disk under the SHA-256 of (prompt version, model,
+    description, DOM fragment), so a rerun against the same page never sends
+    the same query twice.
+    """
+
+    def __init__(self, endpoint, model, api_key=None, cache_dir="reports/genai_cache", timeout=20):
+        """
+        :param endpoint: Chat completions URL, e.g. https://api.openai.com/v1/chat/completions
+        :param model: Model name sent with each request
+        :param api_key: Bearer token; omitted from requests when empty (local stubs)
+        :param cache_dir: Directory of the response cache
+        :param timeout: Request timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.model = model
+        self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.stats = {"requests": 0, "cache_hits": 0, "errors": 0}
+        self.disabled = False  # Set when the endpoint rejects our credentials
+
+    def cache_key(self, description, fragment):
+        """SHA-256 identifying one query"""
+        payload = json.dumps([PROMPT_VERSION, self.model, description, fragment])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def suggest(self, description, fragment):
+        """
+        Get locator suggestions for an element, from the cache when possible
+
+        :param description: Semantic description of the element
+        :param fragment: Distilled DOM outline of the current page
+        :return: List of (by, value) tuples, best first (empty on failure)
+        """
+        if self.disabled:
+            return []
+        key = self.cache_key(description, fragment)
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    cached = json.load(f)
+                self.stats["cache_hits"] += 1
+                logging.info(f"Generative healer cache hit {key[:12]} for '{description}'")
+                return [tuple(locator) for locator in cached["locators"]]
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable generative healer cache entry {path}: {str(e)}")
+
+        try:
+            content = self._complete(description, fragment)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logging.error(f"Generative healer request failed: {str(e)}")
+            return []
+
+        locators = parse_locators(content)
+        atomic_write_json(path, {
+            "model": self.model,
+            "description": description,
+            "locators": locators,
+            "created_at": time.time()
+        })
+        return locators
+
+    def _complete(self, description, fragment):
+        """Send one chat completion request and return the message content"""
+        body = {
+            "model": self.model,
+            "temperature": 0,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Element: {description}\n\nPage outline:\n{fragment}"}
+            ]
+        }
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        request = urllib.request.Request(
+            self.endpoint, data=json.dumps(body).encode("utf-8"), headers=headers, method="POST"
+        )
+        self.stats["requests"] += 1
+        start_time = time.time()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                reply = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 403):
+                self.disabled = True
+                logging.error(f"Generative healer disabled: {self.endpoint} rejected the API key")
+            raise RuntimeError(f"HTTP {e.code} from {self.endpoint}: {e.read()[:200]!r}") from e
+        logging.info(f"Generative healer answered in {time.time() - start_time:.2f}s")
+        return reply["choices"][0]["message"]["content"]
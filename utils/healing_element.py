@@ -0,0 +1,54 @@
+import logging
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+from utils.step_timing import span, ACTION
+
+
+class HealingWebElement(WebElement):
+    """
+    WebElement that re-resolves itself when the page replaces the node
+
+    Every element command that fails with StaleElementReferenceException asks the
+    owning AISelfHealingDriver for a fresh handle (last winning strategy first,
+    full healing chain if that misses) and is retried once on the new node.
+    """
+
+    def __init__(self, element, healing_driver, locator):
+        """
+        :param element: Resolved WebElement
+        :param healing_driver: AISelfHealingDriver that resolved it
+        :param locator: AISelfHealingLocator it was resolved from
+        """
+        super().__init__(element.parent, element.id)
+        self._healing_driver = healing_driver
+        self._locator = locator
+
+    def _refresh(self):
+        logging.info(f"Element '{self._locator.name}' went stale, re-resolving")
+        fresh = self._healing_driver.reresolve(self._locator)
+        self._id = fresh.id
+
+    def _execute(self, command, params=None):
+        with span(ACTION, command), self._healing_driver.profiled(self._locator.name):
+            try:
+                return super()._execute(command, dict(params) if params else None)
+            except StaleElementReferenceException:
+                self._refresh()
+                return super()._execute(command, params)
+
+    # These go through execute_script with the element as an argument, not _execute
+    def is_displayed(self):
+        with span(ACTION, "isDisplayed"), self._healing_driver.profiled(self._locator.name):
+            try:
+                return super().is_displayed()
+            except StaleElementReferenceException:
+                self._refresh()
+                return super().is_displayed()
+
+    def get_attribute(self, name):
+        with span(ACTION, "getAttribute"), self._healing_driver.profiled(self._locator.name):
+            try:
+                return super().get_attribute(name)
+            except StaleElementReferenceException:
+                self._refresh()
+                return super().get_attribute(name)
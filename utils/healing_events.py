@@ -0,0 +1,296 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import config
+
+# Stages a lookup can be resolved in, in the order the healing chain tries them
+PRIMARY = "primary"
+FALLBACK = "fallback"
+DOM_ANALYSIS = "dom_analysis"
+GENAI = "genai"
+RERESOLVE = "reresolve"
+PAGE = "page"
+
+
+class HealingEvent:
+    """
+    Base of every record on the event stream
+
+    Records only hold values; formatting happens on the writer thread. t is
+    time.monotonic() at the moment the record was created.
+    """
+
+    type = None
+    __slots__ = ("t", "locator")
+
+    def __init__(self, locator):
+        self.t = time.monotonic()
+        self.locator = locator
+
+    def to_dict(self):
+        record = {"type": self.type}
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get("__slots__", ()):
+                record[name] = getattr(self, name)
+        return record
+
+
+class ProbeEvent(HealingEvent):
+    """One WebDriver lookup or batched probe of a list of strategies"""
+
+    type = "probe"
+    __slots__ = ("stage", "strategies", "matched", "latency")
+
+    def __init__(self, locator, stage, strategies, matched, latency):
+        """
+        :param locator: Locator name (None for a page-level probe)
+        :param stage: Healing stage (PRIMARY, FALLBACK, ...)
+        :param strategies: Number of strategies probed
+        :param matched: Winning (by, value) or None
+        :param latency: Seconds the WebDriver round trip took
+        """
+        super().__init__(locator)
+        self.stage = stage
+        self.strategies = strategies
+        self.matched = matched
+        self.latency = latency
+
+
+class HealEvent(HealingEvent):
+    """A locator resolved through something other than its primary strategy"""
+
+    type = "heal"
+    __slots__ = ("description", "stage", "primary", "failed", "succeeded", "time_taken", "page_level")
+
+    def __init__(self, locator, description, stage, primary, failed, succeeded, time_taken=None, page_level=False):
+        super().__init__(locator)
+        self.description = description
+        self.stage = stage
+        self.primary = primary
+        self.failed = list(failed)
+        self.succeeded = succeeded
+        self.time_taken = time_taken
+        self.page_level = page_level
+
+
+class FailureEvent(HealingEvent):
+    """Every strategy of a locator failed"""
+
+    type = "failure"
+    __slots__ = ("description", "failed", "error", "time_taken")
+
+    def __init__(self, locator, description, failed, error, time_taken):
+        super().__init__(locator)
+        self.description = description
+        self.failed = list(failed)
+        self.error = error
+        self.time_taken = time_taken
+
+
+class LearnEvent(HealingEvent):
+    """A strategy was added to the learned strategies of a locator"""
+
+    type = "learn"
+    __slots__ = ("strategy",)
+
+    def __init__(self, locator, strategy):
+        super().__init__(locator)
+        self.strategy = strategy
+
+
+class ConsoleReporter:
+    """Subscriber that prints heals, failures, DOM-analysis probes and learned strategies"""
+
+    def __call__(self, event):
+        if event.type == "heal":
+            if event.page_level:
+                message = f"🩹 PAGE HEALING: '{event.locator}' now uses {event.succeeded}"
+            else:
+                message = (
+                    f"\n🔄 SELF-HEALING ACTIVATED for '{event.locator}' ({event.stage})\n"
+                    f"   ❌ Failed locator: {event.primary}\n"
+                    f"   ✅ Successful locator: {event.succeeded}\n"
+                )
+            logging.warning(f"Self-healing successful for '{event.locator}' ({event.stage}): {event.succeeded}")
+        elif event.type == "failure":
+            message = (
+                f"\n❌ SELF-HEALING FAILED for '{event.locator}'\n"
+                f"   All {len(event.failed)} locator strategies failed\n"
+            )
+        elif event.type == "learn":
+            message = f"📝 LEARNING: Added new strategy for '{event.locator}': {event.strategy}"
+            logging.info(f"Learned new strategy for '{event.locator}': {event.strategy}")
+        elif event.type == "probe" and event.stage in (DOM_ANALYSIS, GENAI) and event.locator:
+            source = "AI ANALYSIS" if event.stage == DOM_ANALYSIS else "GENERATIVE HEALING"
+            outcome = f"matched {event.matched[0]}={event.matched[1]}" if event.matched else "no match"
+            message = f"🔍 {source}: {event.strategies} candidate locators for '{event.locator}', {outcome}"
+        else:
+            return
+        print(message)
+
+
+class HealingEventStream:
+    """
+    Buffered stream of healing records, written as JSON Lines in the background
+
+    emit() only queues the record. A writer thread serializes queued records in
+    batches, appends them to the log and hands each one to the subscribers, so
+    lookups never wait on JSON encoding, the file or the terminal. The first line
+    of every stream maps monotonic time to wall-clock time.
+    """
+
+    def __init__(self, path=None, console=False, flush_interval=0.5):
+        """
+        :param path: JSON Lines file to append to (None = no file)
+        :param console: Subscribe a ConsoleReporter
+        :param flush_interval: Seconds the writer waits before writing a partial batch
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.subscribers = [ConsoleReporter()] if console else []
+        self.stats = {"emitted": 0, "written": 0}
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.path or self.subscribers)
+
+    def subscribe(self, callback):
+        """
+        Call a function with every record, on the writer thread
+
+        :param callback: Function taking a HealingEvent
+        """
+        self.subscribers.append(callback)
+
+    def emit(self, event):
+        """
+        Queue one record
+
+        :param event: HealingEvent
+        """
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._start()
+        self.stats["emitted"] += 1
+        self._queue.put(event)
+
+    def flush(self, timeout=5):
+        """Wait until every record emitted so far is written and delivered"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Write what is queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(json.dumps({
+                    "type": "stream", "pid": os.getpid(), "t": time.monotonic(), "wall_time": time.time()
+                }) + "\n")
+            self._thread = threading.Thread(target=self._run, name="healing-events", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Drain whatever else is waiting so one write covers the burst
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            markers = []
+            events = []
+            for item in batch:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    events.append(item)
+            self._deliver(events)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _deliver(self, events):
+        if self._file is not None and events:
+            try:
+                self._file.write("".join(json.dumps(event.to_dict(), default=str) + "\n" for event in events))
+                self._file.flush()
+                self.stats["written"] += len(events)
+            except Exception as e:
+                logging.error(f"Error writing healing events to {self.path}: {str(e)}")
+        for event in events:
+            for subscriber in self.subscribers:
+                try:
+                    subscriber(event)
+                except Exception as e:
+                    logging.error(f"Healing event subscriber failed: {str(e)}")
+
+
+_stream = None
+
+
+def event_stream():
+    """Stream shared by every healing driver of this process, created from config on first use"""
+    global _stream
+    if _stream is None:
+        _stream = HealingEventStream(config.EVENT_LOG or None, console=config.CONSOLE_EVENTS)
+    return _stream
+
+
+def open_event_stream(path=None, console=None):
+    """
+    Replace the process-wide stream, e.g. to write into a worker's report directory
+
+    :param path: JSON Lines file (None = no file)
+    :param console: Print to the console (config.CONSOLE_EVENTS when None)
+    :return: HealingEventStream
+    """
+    global _stream
+    close_event_stream()
+    _stream = HealingEventStream(path, console=config.CONSOLE_EVENTS if console is None else console)
+    return _stream
+
+
+def close_event_stream():
+    """Flush and stop the process-wide stream"""
+    global _stream
+    if _stream is not None:
+        _stream.close()
+        _stream = None
+
+
+atexit.register(close_event_stream)
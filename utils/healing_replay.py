@@ -0,0 +1,108 @@
+import logging
+import time
+from utils.ai_self_healing import AISelfHealingLocator
+from utils.batch_probe import pick_best_probe
+from utils.dom_recorder import load_recordings, load_snapshot_html
+from utils.dom_snapshot import DOMSnapshot
+from utils.snapshot_query import probe_snapshot
+
+# Replay outcomes compared with what the live run did
+MATCH = "match"  # Same element as the live run
+CHANGED = "changed"  # A different element than the live run
+REGRESSED = "regressed"  # The live run found the element, the replay did not
+IMPROVED = "improved"  # The live run failed, the replay found an element
+MISSED = "missed"  # Neither found it
+UNVERIFIED = "unverified"  # The live run's strategy cannot be evaluated offline
+
+
+def _strategies(values):
+    return [tuple(value) for value in values or []]
+
+
+def replay_record(record, snapshot):
+    """
+    Run the heuristic healing chain for one recorded lookup against its snapshot
+
+    Mirrors AISelfHealingLocator's batched lookup: learned strategies, then the
+    predefined ones, then DOM-analysis candidates. The generative tier is not
+    replayed.
+
+    :param record: Record written by DOMRecorder
+    :param snapshot: DOMSnapshot of the recorded page
+    :return: Dict with the replayed winner, the stage it came from, the outcome and timing
+    """
+    start_time = time.perf_counter()
+    locator = AISelfHealingLocator(record["locator"], record.get("description", ""), *_strategies(record["strategies"]))
+    learned = _strategies(record.get("learned"))
+    if learned:
+        locator.apply_learned_locators({locator.name: learned})
+
+    stage = "primary"
+    probes = probe_snapshot(snapshot, locator.locator_strategies)
+    winner = pick_best_probe(probes)
+    if winner is not None and probes.index(winner) > 0:
+        stage = "fallback"
+    candidates = []
+    if winner is None:
+        stage = "dom_analysis"
+        candidates = [
+            strategy for strategy in locator.generate_candidates(snapshot, record.get("fingerprint"))
+            if strategy not in locator.locator_strategies
+        ]
+        winner = pick_best_probe(probe_snapshot(snapshot, candidates))
+    if winner is None:
+        stage = None
+    elapsed = time.perf_counter() - start_time
+
+    # The element the live run settled on, located in the same snapshot
+    expected = None
+    live_strategy = (record.get("outcome") or {}).get("strategy")
+    if live_strategy:
+        expected = pick_best_probe(probe_snapshot(snapshot, [tuple(live_strategy)]))
+
+    if not live_strategy:
+        status = IMPROVED if winner is not None else MISSED
+    elif expected is None:
+        status = UNVERIFIED
+    elif winner is None:
+        status = REGRESSED
+    else:
+        status = MATCH if winner["element"] is expected["element"] else CHANGED
+
+    return {
+        "locator": locator.name,
+        "url": record.get("url"),
+        "snapshot": record["snapshot"],
+        "status": status,
+        "stage": stage,
+        "winner": (winner["by"], winner["value"]) if winner else None,
+        "live": tuple(live_strategy) if live_strategy else None,
+        "candidates": len(candidates),
+        "errors": [probe["error"] for probe in probes if probe["error"]],
+        "time": elapsed
+    }
+
+
+def replay(directory, locator_names=None):
+    """
+    Replay every recorded lookup of a recording directory
+
+    Snapshots are parsed once per digest and shared by all records of that page.
+
+    :param directory: Directory written by DOMRecorder
+    :param locator_names: Only replay these locators (all when empty)
+    :return: List of replay_record results in recording order
+    """
+    snapshots = {}
+    results = []
+    for record in load_recordings(directory):
+        if locator_names and record.get("locator") not in locator_names:
+            continue
+        digest = record.get("snapshot")
+        try:
+            if digest not in snapshots:
+                snapshots[digest] = DOMSnapshot(load_snapshot_html(directory, digest), url=record.get("url"))
+            results.append(replay_record(record, snapshots[digest]))
+        except Exception as e:
+            logging.error(f"Could not replay lookup of '{record.get('locator')}' on {record.get('url')}: {str(e)}")
+    return results
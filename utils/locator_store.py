@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from selenium.webdriver.common.by import By
+from utils.strategy_ranker import StrategyStats
+
+SCHEMA_VERSION = 3
+
+# Selenium strategy value ("css selector") -> By attribute name ("CSS_SELECTOR")
+BY_ATTRIBUTE_NAMES = {
+    value: name for name, value in vars(By).items()
+    if name.isupper() and isinstance(value, str)
+}
+
+# Statements that bring the schema from version N-1 to version N
+MIGRATIONS = {
+    1: """
+CREATE TABLE IF NOT EXISTS learned_locators (
+    element TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (element, strategy, value)
+);
+CREATE INDEX IF NOT EXISTS learned_locators_by_element ON learned_locators (element, position);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    element TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+""",
+    2: """
+CREATE TABLE IF NOT EXISTS strategy_stats (
+    element TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    value TEXT NOT NULL,
+    successes INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    latency REAL,
+    last_success REAL,
+    PRIMARY KEY (element, strategy, value)
+);
+""",
+    3: """
+ALTER TABLE strategy_stats ADD COLUMN last_attempt REAL;
+UPDATE strategy_stats SET last_attempt = COALESCE(last_success, CAST(strftime('%s', 'now') AS REAL));
+""",
+}
+
+
+def normalize_by(by):
+    """
+    Map a stored strategy to the Selenium By value
+
+    Accepts both the value ("css selector", as written by older runs) and the
+    attribute name ("CSS_SELECTOR").
+
+    :param by: Strategy string
+    :return: Selenium By value or None if it is unknown
+    """
+    if by in BY_ATTRIBUTE_NAMES:
+        return by
+    value = getattr(By, str(by).upper(), None)
+    return value if isinstance(value, str) else None
+
+
+def by_attribute_name(by):
+    """
+    Map a Selenium By value to the attribute name used in source code
+
+    :param by: Selenium By value, e.g. "css selector"
+    :return: Attribute name, e.g. "CSS_SELECTOR"
+    """
+    return BY_ATTRIBUTE_NAMES.get(by, str(by).upper().replace(" ", "_"))
+
+
+class LearnedLocatorStore:
+    """
+    SQLite-backed store of learned locator strategies and element fingerprints
+
+    The database runs in WAL mode so parallel workers can read while another
+    process writes. Every write is a per-element transaction, and statistics
+    are merged rather than overwritten.
+    """
+
+    def __init__(self, path, legacy_json=None, legacy_fingerprints_json=None):
+        """
+        :param path: Path of the SQLite database
+        :param legacy_json: learned_locators.json to import when the database is new
+        :param legacy_fingerprints_json: element_fingerprints.json to import when the database is new
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA busy_timeout=30000")
+        created = self._migrate()
+
+        if created and legacy_json and os.path.exists(legacy_json):
+            self.import_json(legacy_json)
+        if created and legacy_fingerprints_json and os.path.exists(legacy_fingerprints_json):
+            with open(legacy_fingerprints_json, "r") as f:
+                for element, fingerprint in json.load(f).items():
+                    self.save_fingerprint(element, fingerprint)
+
+    def _migrate(self):
+        """
+        Create or upgrade the schema
+
+        :return: True if the database was created by this call
+        """
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return False
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Learned locator store {self.path} has schema version {version}, "
+                f"newer than supported version {SCHEMA_VERSION}"
+            )
+
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have migrated while we waited for the lock
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                for statement in MIGRATIONS[target].split(";"):
+                    if statement.strip():
+                        self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        logging.info(f"Initialized learned locator store {self.path} (schema v{SCHEMA_VERSION})")
+        return version == 0
+
+    def load_locators(self):
+        """
+        Load every learned strategy
+
+        :return: Dict of element name -> list of (by, value) in priority order
+        """
+        learned = {}
+        rows = self.connection.execute(
+            "SELECT element, strategy, value FROM learned_locators ORDER BY element, position"
+        )
+        for element, strategy, value in rows:
+            learned.setdefault(element, []).append((strategy, value))
+        return learned
+
+    def save_locators(self, element, strategies):
+        """
+        Replace the learned strategies of one element
+
+        :param element: Locator name
+        :param strategies: List of (by, value) in priority order
+        """
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.connection.execute("DELETE FROM learned_locators WHERE element = ?", (element,))
+            self.connection.executemany(
+                "INSERT INTO learned_locators (element, position, strategy, value, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (element, strategy, value) DO UPDATE SET position = excluded.position, updated_at = excluded.updated_at",
+                [(element, position, by, value, now) for position, (by, value) in enumerate(strategies)]
+            )
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def load_fingerprints(self):
+        """
+        Load every stored fingerprint
+
+        :return: Dict of element name -> fingerprint dict
+        """
+        return {
+            element: json.loads(data)
+            for element, data in self.connection.execute("SELECT element, data FROM fingerprints")
+        }
+
+    def save_fingerprint(self, element, fingerprint):
+        """
+        Upsert the fingerprint of one element
+
+        :param element: Locator name
+        :param fingerprint: Fingerprint dict
+        """
+        self.connection.execute(
+            "INSERT INTO fingerprints (element, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (element) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            (element, json.dumps(fingerprint), time.time())
+        )
+
+    def load_strategy_stats(self):
+        """
+        Load the lookup statistics of every (element, strategy) pair
+
+        :return: Dict of element -> {(by, value): StrategyStats}
+        """
+        stats = {}
+        rows = self.connection.execute(
+            "SELECT element, strategy, value, successes, failures, latency, last_success, last_attempt FROM strategy_stats"
+        )
+        for element, strategy, value, successes, failures, latency, last_success, last_attempt in rows:
+            stats.setdefault(element, {})[(strategy, value)] = StrategyStats(
+                successes, failures, latency, last_success, last_attempt
+            )
+        return stats
+
+    def merge_strategy_stats(self, element, deltas, evicted=()):
+        """
+        Add one process's statistics to the stored ones and return the merged result
+
+        Counts are summed and the newest latency, last win and last try are kept, so
+        parallel workers can flush the same element without losing updates.
+
+        :param element: Locator name
+        :param deltas: Dict of (by, value) -> StrategyStats recorded since the last merge
+        :param evicted: (by, value) tuples to delete
+        :return: Dict of (by, value) -> StrategyStats as stored after the merge
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.connection.executemany(
+                "DELETE FROM strategy_stats WHERE element = ? AND strategy = ? AND value = ?",
+                [(element, by, value) for by, value in evicted]
+            )
+            self.connection.executemany(
+                "INSERT INTO strategy_stats (element, strategy, value, successes, failures, latency, last_success, last_attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (element, strategy, value) DO UPDATE SET "
+                "successes = successes + excluded.successes, "
+                "failures = failures + excluded.failures, "
+                "latency = COALESCE(excluded.latency, latency), "
+                "last_success = MAX(COALESCE(last_success, excluded.last_success), COALESCE(excluded.last_success, last_success)), "
+                "last_attempt = MAX(COALESCE(last_attempt, excluded.last_attempt), COALESCE(excluded.last_attempt, last_attempt))",
+                [
+                    (element, by, value, entry.successes, entry.failures, entry.latency, entry.last_success, entry.last_attempt)
+                    for (by, value), entry in deltas.items()
+                ]
+            )
+            rows = self.connection.execute(
+                "SELECT strategy, value, successes, failures, latency, last_success, last_attempt FROM strategy_stats "
+                "WHERE element = ?",
+                (element,)
+            ).fetchall()
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return {
+            (strategy, value): StrategyStats(successes, failures, latency, last_success, last_attempt)
+            for strategy, value, successes, failures, latency, last_success, last_attempt in rows
+        }
+
+    def import_json(self, path):
+        """
+        Import a learned_locators.json file written by earlier versions
+
+        :param path: Path to the JSON file
+        :return: Number of elements imported
+        """
+        with open(path, "r") as f:
+            serialized = json.load(f)
+
+        imported = 0
+        for element, strategies in serialized.items():
+            converted = []
+            for strategy in strategies:
+                by = normalize_by(strategy.get("by"))
+                if by is None:
+                    logging.warning(f"Unknown locator type: {strategy.get('by')} for element {element}")
+                    continue
+                if (by, strategy["value"]) not in converted:
+                    converted.append((by, strategy["value"]))
+            if converted:
+                self.save_locators(element, converted)
+                imported += 1
+
+        logging.info(f"Imported learned locators for {imported} elements from {path}")
+        return imported
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
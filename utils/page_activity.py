@@ -0,0 +1,97 @@
+import json
+import logging
+import time
+from selenium.common.exceptions import WebDriverException
+from utils.dom_observer import OBSERVED_ATTRIBUTES
+
+# Counts in-flight fetch/XHR calls and stamps the time of the last request or DOM mutation.
+# Idempotent, so it can be registered for every new document (CDP) and injected again on demand.
+# Only attributes in OBSERVED_ATTRIBUTES count, so class and style churn (animations, hover and
+# focus states) does not keep the page from ever going quiet. The filter is inlined because the
+# CDP registration cannot pass arguments.
+ACTIVITY_TRACKER_SCRIPT = """
+(function () {
+    if (window.__selfHealingActivity) { return; }
+    var state = window.__selfHealingActivity = {pending: 0, last: Date.now()};
+    function touch() { state.last = Date.now(); }
+    function settle() { state.pending = Math.max(0, state.pending - 1); touch(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            touch();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { settle(); return response; },
+                function (error) { settle(); throw error; }
+            );
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        touch();
+        this.addEventListener('loadend', settle);
+        return originalSend.apply(this, arguments);
+    };
+
+    new MutationObserver(touch).observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+        attributeFilter: """ + json.dumps(OBSERVED_ATTRIBUTES) + """
+    });
+})();
+"""
+
+# Returns [readyState, pending requests, milliseconds since the last activity]
+ACTIVITY_STATE_SCRIPT = ACTIVITY_TRACKER_SCRIPT + """
+var state = window.__selfHealingActivity;
+return [document.readyState, state.pending, Date.now() - state.last];
+"""
+
+
+def install_activity_tracker(driver):
+    """
+    Register the tracker for every document the browser loads (Chromium only)
+
+    Without this the tracker is injected by the first wait on each page, and
+    requests started before that are not counted.
+
+    :param driver: Raw Selenium WebDriver instance
+    :return: True if the tracker was registered
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ACTIVITY_TRACKER_SCRIPT})
+        return True
+    except (AttributeError, WebDriverException) as e:
+        logging.debug(f"Could not register page activity tracker: {str(e)}")
+        return False
+
+
+def wait_for_quiescence(driver, idle=0.3, timeout=10):
+    """
+    Wait until the page is loaded, has no pending fetch/XHR and has not mutated for `idle` seconds
+
+    :param driver: Raw Selenium WebDriver instance
+    :param idle: Quiet window in seconds
+    :param timeout: Maximum wait in seconds
+    :return: True if the page went quiet, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    idle_ms = idle * 1000
+    while True:
+        try:
+            ready_state, pending, quiet_ms = driver.execute_script(ACTIVITY_STATE_SCRIPT)
+            if ready_state == "complete" and not pending and quiet_ms >= idle_ms:
+                return True
+            # Sleep only as long as the page still has to stay quiet
+            delay = max((idle_ms - quiet_ms) / 1000, 0.05)
+        except (WebDriverException, TypeError, ValueError) as e:
+            # A navigation replaced the document mid-check; look again on the new one
+            logging.debug(f"Could not read page activity: {str(e)}")
+            delay = 0.05
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
@@ -0,0 +1,361 @@
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPORT_PATTERN = "healing_report_*.json"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    scenario TEXT,
+    feature TEXT,
+    status TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL,
+    healed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    scenario TEXT,
+    worker TEXT,
+    element TEXT NOT NULL,
+    strategy TEXT,
+    value TEXT,
+    healed INTEGER NOT NULL,
+    page_level INTEGER NOT NULL,
+    time_taken REAL,
+    timestamp TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_source ON events (source);
+CREATE INDEX IF NOT EXISTS events_by_timestamp ON events (timestamp);
+CREATE TABLE IF NOT EXISTS element_totals (
+    element TEXT PRIMARY KEY,
+    description TEXT,
+    attempts INTEGER NOT NULL,
+    healed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    page_level INTEGER NOT NULL,
+    time_taken REAL NOT NULL,
+    last_seen TEXT
+);
+CREATE TABLE IF NOT EXISTS strategy_totals (
+    element TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    value TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    PRIMARY KEY (element, strategy, value)
+);
+"""
+
+
+def parse_report(path):
+    """
+    Read one per-scenario healing report into the rows the aggregate stores
+
+    Runs in a pool process when many reports are new, so it only takes and
+    returns plain data.
+
+    :param path: Path of a healing_report_*.json file
+    :return: Dict with scenario, summary and events, or with error if it cannot be read
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        summary = report.get("summary", {})
+        return {
+            "scenario": report.get("scenario") or {"name": os.path.basename(path)},
+            "summary": {
+                "attempts": summary.get("total_attempts", 0),
+                "healed": summary.get("successful_healing", 0),
+                "failed": summary.get("failed_healing", 0),
+            },
+            "events": [event for event in report.get("events", []) if event.get("element")],
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def find_reports(reports_dir, exclude=()):
+    """
+    Stat every healing report under a directory
+
+    :param reports_dir: Directory scanned recursively (parallel runs write into subdirectories)
+    :param exclude: File paths to skip
+    :return: Dict of path -> (mtime, size)
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    found = {}
+    for directory, subdirectories, files in os.walk(reports_dir):
+        for name in fnmatch.filter(files, REPORT_PATTERN):
+            path = os.path.join(directory, name)
+            if os.path.abspath(path) in excluded:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found[os.path.normpath(path)] = (stat.st_mtime, stat.st_size)
+    return found
+
+
+class ReportAggregator:
+    """
+    Incremental, SQLite-backed aggregate of every healing report ever written
+
+    Each ingested file is indexed by path, mtime and size, so an update parses
+    only reports that are new or were rewritten. Per-element and per-strategy
+    totals are rolled up as events arrive; a rewritten report first has its
+    previous events subtracted. Reports deleted from disk keep their history.
+    """
+
+    def __init__(self, path, parallel_threshold=32, workers=None):
+        """
+        :param path: Path of the SQLite database
+        :param parallel_threshold: New reports needed before they are parsed in a process pool
+        :param workers: Pool size (CPU count when None)
+        """
+        self.path = path
+        self.parallel_threshold = parallel_threshold
+        self.workers = workers
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA busy_timeout=30000")
+        self._migrate()
+
+    def _migrate(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Report aggregate {self.path} has schema version {version}, "
+                f"newer than supported version {SCHEMA_VERSION}"
+            )
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        logging.info(f"Initialized report aggregate {self.path} (schema v{SCHEMA_VERSION})")
+
+    def pending(self, reports_dir):
+        """
+        Reports under a directory that are not ingested in their current version
+
+        :param reports_dir: Directory to scan
+        :return: Dict of path -> (mtime, size) of new or rewritten reports
+        """
+        known = {
+            path: (mtime, size)
+            for path, mtime, size in self.connection.execute("SELECT path, mtime, size FROM ingested_files")
+        }
+        # Only the database itself is skipped; reports may live right next to it
+        exclude = [self.path, self.path + "-wal", self.path + "-shm"]
+        return {
+            path: stat for path, stat in find_reports(reports_dir, exclude).items()
+            if known.get(path) != stat
+        }
+
+    def update(self, reports_dir):
+        """
+        Ingest every new or rewritten report under a directory
+
+        :param reports_dir: Directory to scan
+        :return: Dict with the number of reports and events ingested, failures and the time taken
+        """
+        start_time = time.perf_counter()
+        pending = self.pending(reports_dir)
+        paths = sorted(pending)
+
+        if len(paths) >= self.parallel_threshold:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                parsed = list(pool.map(parse_report, paths, chunksize=16))
+        else:
+            parsed = [parse_report(path) for path in paths]
+
+        ingested = events = errors = 0
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            for path, report in zip(paths, parsed):
+                mtime, size = pending[path]
+                self._forget(path)
+                if "error" in report:
+                    logging.warning(f"Skipping unreadable report {path}: {report['error']}")
+                    errors += 1
+                    self._index(path, mtime, size, {}, {}, report["error"])
+                    continue
+                self._index(path, mtime, size, report["scenario"], report["summary"])
+                for event in report["events"]:
+                    self._add_event(path, report["scenario"], event)
+                ingested += 1
+                events += len(report["events"])
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+
+        return {
+            "ingested": ingested, "events": events, "errors": errors,
+            "time": time.perf_counter() - start_time
+        }
+
+    def _index(self, path, mtime, size, scenario, summary, error=None):
+        self.connection.execute(
+            "INSERT INTO ingested_files (path, mtime, size, ingested_at, scenario, feature, status, worker, "
+            "attempts, healed, failed, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, mtime, size, time.time(), scenario.get("name"), scenario.get("feature"),
+                scenario.get("status"), _text(scenario.get("worker")), summary.get("attempts", 0),
+                summary.get("healed", 0), summary.get("failed", 0), error
+            )
+        )
+
+    def _add_event(self, path, scenario, event):
+        succeeded = event.get("succeeded")
+        self.connection.execute(
+            "INSERT INTO events (source, scenario, worker, element, strategy, value, healed, page_level, "
+            "time_taken, timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, scenario.get("name"), _text(scenario.get("worker")), event["element"],
+                succeeded[0] if succeeded else None, succeeded[1] if succeeded else None,
+                1 if succeeded else 0, 1 if event.get("page_level") else 0, event.get("time_taken"),
+                event.get("timestamp"), json.dumps(event)
+            )
+        )
+        self._roll_up(event, 1)
+
+    def _roll_up(self, event, sign):
+        """Add (sign=1) or subtract (sign=-1) one event from the element and strategy totals"""
+        succeeded = event.get("succeeded")
+        self.connection.execute(
+            "INSERT INTO element_totals (element, description, attempts, healed, failed, page_level, time_taken, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (element) DO UPDATE SET "
+            "description = COALESCE(excluded.description, description), "
+            "attempts = attempts + excluded.attempts, healed = healed + excluded.healed, "
+            "failed = failed + excluded.failed, page_level = page_level + excluded.page_level, "
+            "time_taken = time_taken + excluded.time_taken, "
+            "last_seen = MAX(COALESCE(last_seen, excluded.last_seen), COALESCE(excluded.last_seen, last_seen))",
+            (
+                event["element"], event.get("description"), sign, sign if succeeded else 0,
+                0 if succeeded else sign, sign if event.get("page_level") else 0,
+                sign * (event.get("time_taken") or 0.0), event.get("timestamp")
+            )
+        )
+        rows = [(event["element"], by, value, 0, sign) for by, value in event.get("failed") or []]
+        if succeeded:
+            rows.append((event["element"], succeeded[0], succeeded[1], sign, 0))
+        self.connection.executemany(
+            "INSERT INTO strategy_totals (element, strategy, value, wins, failures) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (element, strategy, value) DO UPDATE SET "
+            "wins = wins + excluded.wins, failures = failures + excluded.failures",
+            rows
+        )
+
+    def _forget(self, path):
+        """Subtract and delete everything a previously ingested version of a report contributed"""
+        rows = self.connection.execute("SELECT data FROM events WHERE source = ?", (path,)).fetchall()
+        for (data,) in rows:
+            self._roll_up(json.loads(data), -1)
+        self.connection.execute("DELETE FROM events WHERE source = ?", (path,))
+        self.connection.execute("DELETE FROM ingested_files WHERE path = ?", (path,))
+
+    def summary(self):
+        """
+        Totals over every ingested report
+
+        :return: Dict in the shape of a healing report summary plus report and event counts
+        """
+        reports, attempts, healed, failed = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(attempts), 0), COALESCE(SUM(healed), 0), COALESCE(SUM(failed), 0) "
+            "FROM ingested_files WHERE error IS NULL"
+        ).fetchone()
+        events = self.connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return {
+            "reports": reports,
+            "events": events,
+            "total_attempts": attempts,
+            "successful_healing": healed,
+            "failed_healing": failed,
+            "success_rate": (healed / (attempts or 1)) * 100
+        }
+
+    def element_totals(self, limit=None):
+        """
+        Rolled-up healing totals per element, most attempted first
+
+        :param limit: Maximum number of elements (all when None)
+        :return: List of dicts
+        """
+        rows = self.connection.execute(
+            "SELECT element, description, attempts, healed, failed, page_level, time_taken, last_seen "
+            "FROM element_totals WHERE attempts > 0 ORDER BY attempts DESC, element LIMIT ?",
+            (limit if limit is not None else -1,)
+        )
+        keys = ("element", "description", "attempts", "healed", "failed", "page_level", "time_taken", "last_seen")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def strategy_totals(self, element=None, limit=None):
+        """
+        Rolled-up wins and failures per (element, strategy), most wins first
+
+        :param element: Only this element (all when None)
+        :param limit: Maximum number of rows (all when None)
+        :return: List of dicts
+        """
+        rows = self.connection.execute(
+            "SELECT element, strategy, value, wins, failures FROM strategy_totals "
+            "WHERE (wins > 0 OR failures > 0) AND (? IS NULL OR element = ?) "
+            "ORDER BY wins DESC, failures DESC, element LIMIT ?",
+            (element, element, limit if limit is not None else -1)
+        )
+        keys = ("element", "strategy", "value", "wins", "failures")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def iter_events(self, batch_size=1000):
+        """
+        Every ingested event in timestamp order, read in batches
+
+        :param batch_size: Rows fetched per round trip
+        :return: Iterator of event dicts with scenario, worker and source added
+        """
+        cursor = self.connection.execute(
+            "SELECT scenario, worker, source, data FROM events ORDER BY timestamp, id"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for scenario, worker, source, data in rows:
+                yield dict(json.loads(data), scenario=scenario, worker=worker, source=source)
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+
+def _text(value):
+    return None if value is None else str(value)
@@ -0,0 +1,209 @@
+import glob
+import json
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+import config
+from utils.atomic_io import atomic_open
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+CHART_JS = "https://cdn.jsdelivr.net/npm/chart.js"
+
+_environment = None
+
+
+def template_environment():
+    """Jinja2 environment for the report templates, created on first use"""
+    global _environment
+    if _environment is None:
+        _environment = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html"]),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    return _environment
+
+
+class EventTotals:
+    """
+    Per-element and per-strategy totals accumulated while events stream past
+
+    Produces the same rows as ReportAggregator.element_totals() and
+    strategy_totals(), so charts and tables never need the events themselves.
+    """
+
+    def __init__(self):
+        self.elements = {}  # element -> totals dict
+        self.strategies = {}  # (element, strategy, value) -> [wins, failures]
+
+    def add(self, event):
+        name = event["element"]
+        succeeded = event.get("succeeded")
+        totals = self.elements.get(name)
+        if totals is None:
+            totals = self.elements[name] = {
+                "element": name, "description": event.get("description"), "attempts": 0, "healed": 0,
+                "failed": 0, "page_level": 0, "time_taken": 0.0, "last_seen": None
+            }
+        totals["attempts"] += 1
+        totals["healed" if succeeded else "failed"] += 1
+        totals["page_level"] += 1 if event.get("page_level") else 0
+        totals["time_taken"] += event.get("time_taken") or 0.0
+        timestamp = event.get("timestamp")
+        if timestamp and (totals["last_seen"] is None or timestamp > totals["last_seen"]):
+            totals["last_seen"] = timestamp
+
+        for by, value in event.get("failed") or []:
+            self.strategies.setdefault((name, str(by), str(value)), [0, 0])[1] += 1
+        if succeeded:
+            self.strategies.setdefault((name, str(succeeded[0]), str(succeeded[1])), [0, 0])[0] += 1
+
+    def element_totals(self):
+        return sorted(self.elements.values(), key=lambda totals: (-totals["attempts"], totals["element"]))
+
+    def strategy_totals(self, limit=None):
+        rows = [
+            {"element": element, "strategy": strategy, "value": value, "wins": wins, "failures": failures}
+            for (element, strategy, value), (wins, failures) in self.strategies.items()
+        ]
+        rows.sort(key=lambda row: (-row["wins"], -row["failures"], row["element"]))
+        return rows[:limit] if limit is not None else rows
+
+
+def write_event_shards(events, shard_dir, page_size, totals=None):
+    """
+    Write events to numbered script shards, one page at a time
+
+    Each shard is a JSON array wrapped in a call to the report's page loader,
+    so the report can load it with a <script> tag even when opened from disk.
+    Only the event being written is held in memory.
+
+    :param events: Iterable of event dicts (a list or a streaming cursor)
+    :param shard_dir: Directory for the shards (stale shards are removed)
+    :param page_size: Events per shard
+    :param totals: EventTotals to accumulate into while writing
+    :return: List of page index entries: number, file name, count, healed, failed, first and last timestamp
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(shard_dir, "page-*.js")):
+        os.remove(stale)
+
+    pages = []
+    shard = None
+    try:
+        for event in events:
+            if shard is None or pages[-1]["count"] == page_size:
+                if shard is not None:
+                    shard.write("\n]);\n")
+                    shard.close()
+                number = len(pages) + 1
+                name = f"page-{number:05d}.js"
+                shard = open(os.path.join(shard_dir, name), "w", encoding="utf-8")
+                shard.write(f"healingReport.page({number}, [\n")
+                pages.append({
+                    "number": number, "file": name, "count": 0, "healed": 0, "failed": 0,
+                    "first": event.get("timestamp"), "last": None
+                })
+            page = pages[-1]
+            if page["count"]:
+                shard.write(",\n")
+            shard.write(json.dumps(event, default=str))
+            page["count"] += 1
+            page["healed" if event.get("succeeded") else "failed"] += 1
+            page["last"] = event.get("timestamp")
+            if totals is not None:
+                totals.add(event)
+        if shard is not None:
+            shard.write("\n]);\n")
+    finally:
+        if shard is not None:
+            shard.close()
+    return pages
+
+
+def _chart_data(summary, elements, limit):
+    top = elements[:limit]
+    return {
+        "outcomes": [summary["successful_healing"], summary["failed_healing"]],
+        "labels": [element["element"] for element in top] or ["No Data"],
+        "healed": [element["healed"] for element in top] or [0],
+        "failed": [element["failed"] for element in top] or [0]
+    }
+
+
+def _stream(template_name, filename, context):
+    template = template_environment().get_template(template_name)
+    stream = template.stream(**context)
+    stream.enable_buffering(size=64)
+    with atomic_open(filename) as f:
+        stream.dump(f)
+    return filename
+
+
+def render_healing_report(filename, summary, events, elements=None, strategies=None,
+                          title="Self-Healing Test Report", page_size=None):
+    """
+    Render a paginated healing report
+
+    Events are written to <report>_events/page-NNNNN.js shards that the page
+    loads one at a time; the HTML itself only holds the summary, the chart data
+    and the element and strategy totals, so its size does not grow with the
+    number of events. Totals not passed in are computed while the shards are
+    written.
+
+    :param filename: HTML file to write
+    :param summary: Report summary (total_attempts, successful_healing, failed_healing, success_rate)
+    :param events: Iterable of healing event dicts, streamed once
+    :param elements: Precomputed per-element totals (ReportAggregator.element_totals() rows)
+    :param strategies: Precomputed per-strategy totals (ReportAggregator.strategy_totals() rows)
+    :param title: Page title
+    :param page_size: Events per shard (config.REPORT_PAGE_SIZE when None)
+    :return: Path of the report
+    """
+    page_size = page_size or config.REPORT_PAGE_SIZE
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    shard_dir = os.path.join(os.path.dirname(filename), f"{stem}_events")
+    totals = EventTotals() if elements is None or strategies is None else None
+
+    pages = write_event_shards(events, shard_dir, page_size, totals)
+    if elements is None:
+        elements = totals.element_totals()
+    if strategies is None:
+        strategies = totals.strategy_totals(config.REPORT_CHART_TOP_N)
+
+    return _stream("healing_report.html", filename, {
+        "title": title,
+        "summary": summary,
+        "elements": elements,
+        "strategies": strategies,
+        "chart": _chart_data(summary, elements, config.REPORT_CHART_TOP_N),
+        "chart_js": CHART_JS,
+        "shard_base": f"{stem}_events/",
+        "pages": pages,
+        "event_count": sum(page["count"] for page in pages)
+    })
+
+
+def render_dashboard(filename, summary, events=None, elements=None, title="Self-Healing Dashboard"):
+    """
+    Render the statistics dashboard from precomputed totals
+
+    :param filename: HTML file to write
+    :param summary: Report summary
+    :param events: Iterable of events to total per element when elements is not given
+    :param elements: Precomputed per-element totals
+    :param title: Page title
+    :return: Path of the dashboard
+    """
+    if elements is None:
+        totals = EventTotals()
+        for event in events or ():
+            totals.add(event)
+        elements = totals.element_totals()
+
+    return _stream("healing_dashboard.html", filename, {
+        "title": title,
+        "summary": summary,
+        "chart": _chart_data(summary, elements, config.REPORT_CHART_TOP_N),
+        "chart_js": CHART_JS
+    })
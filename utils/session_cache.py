@@ -0,0 +1,188 @@
+import json
+import logging
+import time
+from selenium.common.exceptions import WebDriverException
+
+# Copies localStorage into a plain object
+READ_LOCAL_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+# Writes the given items into localStorage (arguments[0] is a key -> value object)
+WRITE_LOCAL_STORAGE_SCRIPT = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+# Same as WRITE_LOCAL_STORAGE_SCRIPT, run by Chromium before any page script (%s is a JSON object)
+PRELOAD_LOCAL_STORAGE_SCRIPT = """
+(function (items) {
+    try {
+        for (var key in items) { window.localStorage.setItem(key, items[key]); }
+    } catch (e) {}
+})(%s);
+"""
+
+# Cookie fields accepted by CDP Network.setCookie, keyed by their WebDriver name
+CDP_COOKIE_FIELDS = {
+    "name": "name",
+    "value": "value",
+    "domain": "domain",
+    "path": "path",
+    "secure": "secure",
+    "httpOnly": "httpOnly",
+    "sameSite": "sameSite",
+    "expiry": "expires",
+}
+
+
+class AuthSession:
+    """Cookies and localStorage of one logged-in user"""
+
+    def __init__(self, cookies, local_storage, captured_at=None):
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.captured_at = captured_at if captured_at is not None else time.time()
+
+    def is_expired(self, ttl, now=None):
+        """
+        Check whether the session is too old or one of its cookies has expired
+
+        :param ttl: Maximum age in seconds (0 = no limit)
+        :param now: Current epoch time
+        :return: True if the session should not be restored
+        """
+        now = now if now is not None else time.time()
+        if ttl and now - self.captured_at > ttl:
+            return True
+        return any(cookie.get("expiry") is not None and cookie["expiry"] <= now for cookie in self.cookies)
+
+
+class AuthSessionCache:
+    """
+    Keeps the authenticated state of each (base URL, user) after a real login
+
+    A cached session is restored into a fresh or pooled driver with one
+    navigation: cookies go in through CDP before the page loads (Chromium) or
+    through add_cookie after loading the base URL elsewhere. A session counts
+    as valid when the restored page does not redirect to the login route.
+    """
+
+    def __init__(self, ttl=1800, login_path="/auth/login"):
+        """
+        :param ttl: Seconds a captured session is trusted (0 = until the server rejects it)
+        :param login_path: URL fragment of the login page, used to detect expired sessions
+        """
+        self.ttl = ttl
+        self.login_path = login_path
+        self.sessions = {}  # (base_url, user) -> AuthSession
+
+    @staticmethod
+    def _key(base_url, user):
+        return base_url.rstrip("/"), user
+
+    def capture(self, driver, base_url, user):
+        """
+        Remember the session of a driver that has just logged in
+
+        :param driver: AISelfHealingDriver or raw WebDriver on a page of the application
+        :param base_url: Application base URL
+        :param user: User name the session belongs to
+        :return: True if the session was captured
+        """
+        raw = getattr(driver, "driver", driver)
+        try:
+            cookies = raw.get_cookies()
+            local_storage = raw.execute_script(READ_LOCAL_STORAGE_SCRIPT) or {}
+        except WebDriverException as e:
+            logging.warning(f"Could not capture session for '{user}': {str(e)}")
+            return False
+        if not cookies:
+            logging.warning(f"No cookies to cache for '{user}' on {base_url}")
+            return False
+
+        self.sessions[self._key(base_url, user)] = AuthSession(cookies, local_storage)
+        logging.info(f"Cached session of '{user}' on {base_url} ({len(cookies)} cookies, {len(local_storage)} storage items)")
+        return True
+
+    def invalidate(self, base_url, user):
+        """Forget the cached session of a user"""
+        self.sessions.pop(self._key(base_url, user), None)
+
+    def restore(self, driver, base_url, user):
+        """
+        Put a cached session into a driver and open the application
+
+        :param driver: AISelfHealingDriver or raw WebDriver
+        :param base_url: Application base URL
+        :param user: User name the session belongs to
+        :return: True if the driver is now logged in, False if a real login is needed
+        """
+        session = self.sessions.get(self._key(base_url, user))
+        if session is None:
+            return False
+        if session.is_expired(self.ttl):
+            logging.info(f"Cached session of '{user}' expired")
+            self.invalidate(base_url, user)
+            return False
+
+        raw = getattr(driver, "driver", driver)
+        try:
+            if not self._restore_with_cdp(driver, raw, base_url, session):
+                self._restore_with_navigation(driver, raw, base_url, session)
+        except WebDriverException as e:
+            logging.warning(f"Could not restore session of '{user}': {str(e)}")
+            self.invalidate(base_url, user)
+            return False
+
+        if self.login_path in raw.current_url:
+            logging.info(f"Cached session of '{user}' was rejected by the server")
+            self.invalidate(base_url, user)
+            return False
+
+        logging.info(f"Restored cached session of '{user}' on {base_url}")
+        return True
+
+    def _restore_with_cdp(self, driver, raw, base_url, session):
+        """
+        Set cookies and storage before the first request, then navigate once
+
+        :return: False if the browser does not support CDP
+        """
+        if not hasattr(raw, "execute_cdp_cmd"):
+            return False
+        try:
+            raw.execute_cdp_cmd("Network.enable", {})
+        except WebDriverException:
+            return False
+
+        for cookie in session.cookies:
+            params = {cdp: cookie[name] for name, cdp in CDP_COOKIE_FIELDS.items() if cookie.get(name) is not None}
+            if not cookie.get("domain"):
+                params["url"] = base_url
+            raw.execute_cdp_cmd("Network.setCookie", params)
+
+        script_id = None
+        if session.local_storage:
+            source = PRELOAD_LOCAL_STORAGE_SCRIPT % json.dumps(session.local_storage)
+            script_id = raw.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source}).get("identifier")
+        try:
+            driver.get(base_url)
+        finally:
+            if script_id is not None:
+                raw.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+        return True
+
+    def _restore_with_navigation(self, driver, raw, base_url, session):
+        """Load the site so cookies can be added for its domain, then reload it"""
+        driver.get(base_url)
+        for cookie in session.cookies:
+            raw.add_cookie({key: value for key, value in cookie.items() if key != "sameSite" or value in ("Strict", "Lax", "None")})
+        if session.local_storage:
+            raw.execute_script(WRITE_LOCAL_STORAGE_SCRIPT, session.local_storage)
+        driver.get(base_url)
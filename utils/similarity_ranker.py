@@ -0,0 +1,146 @@
+import logging
+import time
+import zlib
+import numpy as np
+from utils.dom_snapshot import normalize_text, tokenize
+from utils.element_fingerprint import fingerprint_from_node
+
+# Width of the hashed feature space
+FEATURE_DIMENSIONS = 1024
+
+# Relative weight of each feature group; every group is spread over its tokens
+GROUP_WEIGHTS = {
+    "tag": 1.0,
+    "id": 2.0,
+    "name": 2.0,
+    "class": 1.0,
+    "attr": 1.5,
+    "text": 1.5,
+    "parent": 1.0,
+}
+
+# Score lost per level of depth / per sibling position away from the target
+DEPTH_PENALTY = 0.02
+POSITION_PENALTY = 0.01
+
+# Document structure that is never a healing target
+IGNORED_TAGS = {"html", "head", "body", "meta", "link", "title", "base", "br", "hr"}
+
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fingerprint_features(fingerprint):
+    """
+    Turn a fingerprint into weighted, hashed feature indices
+
+    :param fingerprint: Fingerprint dict (captured or built from a snapshot node)
+    :return: Tuple of (column indices, weights)
+    """
+    groups = {group: set() for group in GROUP_WEIGHTS}
+    if fingerprint.get("tag"):
+        groups["tag"].add(fingerprint["tag"])
+    for key in ("id", "name"):
+        if fingerprint.get(key):
+            groups[key].add(fingerprint[key])
+            groups[key].update(tokenize(fingerprint[key]))
+    for class_name in fingerprint.get("classes") or []:
+        groups["class"].add(class_name)
+        groups["class"].update(tokenize(class_name))
+    for key, value in (fingerprint.get("attrs") or {}).items():
+        groups["attr"].add(f"{key}={value.lower()}")
+        groups["attr"].update(f"{key}~{token}" for token in tokenize(value))
+    text = normalize_text(fingerprint.get("text"))
+    if text:
+        groups["text"].update(_trigrams(text))
+    for level, label in enumerate(fingerprint.get("parents") or []):
+        groups["parent"].add(f"{level}:{label}")
+        groups["parent"].add(label)
+
+    columns = []
+    weights = []
+    for group, tokens in groups.items():
+        if not tokens:
+            continue
+        weight = GROUP_WEIGHTS[group] / np.sqrt(len(tokens))
+        for token in tokens:
+            columns.append(zlib.crc32(f"{group}:{token}".encode("utf-8")) % FEATURE_DIMENSIONS)
+            weights.append(weight)
+    return columns, weights
+
+
+class SnapshotFeatures:
+    """Row-normalized feature matrix of every element in a DOMSnapshot"""
+
+    def __init__(self, snapshot):
+        start_time = time.time()
+        count = len(snapshot.nodes)
+        rows, columns, weights = [], [], []
+        self.depths = np.zeros(count, dtype=np.float32)
+        self.positions = np.zeros(count, dtype=np.float32)
+        self.eligible = np.ones(count, dtype=bool)
+
+        for node in snapshot.nodes:
+            self.depths[node.index] = node.depth
+            self.positions[node.index] = node.position
+            if node.in_svg or node.tag in IGNORED_TAGS:
+                self.eligible[node.index] = False
+                continue
+            node_columns, node_weights = fingerprint_features(fingerprint_from_node(node))
+            rows.extend([node.index] * len(node_columns))
+            columns.extend(node_columns)
+            weights.extend(node_weights)
+
+        self.matrix = np.zeros((count, FEATURE_DIMENSIONS), dtype=np.float32)
+        if rows:
+            np.add.at(self.matrix, (np.array(rows), np.array(columns)), np.array(weights, dtype=np.float32))
+        norms = np.linalg.norm(self.matrix, axis=1)
+        norms[norms == 0] = 1.0
+        self.matrix /= norms[:, None]
+
+        self.build_time = time.time() - start_time
+        logging.debug(f"Vectorized {count} elements in {self.build_time * 1000:.1f}ms")
+
+
+def snapshot_features(snapshot):
+    """Return the feature matrix of a snapshot, building it on first use"""
+    if snapshot.features is None:
+        snapshot.features = SnapshotFeatures(snapshot)
+    return snapshot.features
+
+
+def rank_nodes(snapshot, fingerprint, top_k=5, min_score=0.3):
+    """
+    Score every element of the page against a fingerprint in one matrix operation
+
+    :param snapshot: DOMSnapshot of the current page
+    :param fingerprint: Last known-good fingerprint of the element
+    :param top_k: Number of best elements to return
+    :param min_score: Minimum score for an element to be returned
+    :return: List of (node, score) tuples, best first
+    """
+    features = snapshot_features(snapshot)
+    if not snapshot.nodes:
+        return []
+
+    target = np.zeros(FEATURE_DIMENSIONS, dtype=np.float32)
+    columns, weights = fingerprint_features(fingerprint)
+    np.add.at(target, np.array(columns, dtype=np.int64), np.array(weights, dtype=np.float32))
+    norm = np.linalg.norm(target)
+    if norm == 0:
+        return []
+    target /= norm
+
+    scores = features.matrix @ target
+    if fingerprint.get("depth") is not None:
+        scores -= DEPTH_PENALTY * np.abs(features.depths - fingerprint["depth"])
+    if fingerprint.get("position") is not None:
+        scores -= POSITION_PENALTY * np.abs(features.positions - fingerprint["position"])
+    scores[~features.eligible] = -np.inf
+
+    k = min(top_k, len(scores))
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [(snapshot.nodes[i], float(scores[i])) for i in best if scores[i] >= min_score]
@@ -0,0 +1,618 @@
+import re
+from selenium.webdriver.common.by import By
+from utils.element_fingerprint import fingerprint_from_node
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Inline styles that hide an element
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+
+
+class UnsupportedQuery(ValueError):
+    """Raised for locator syntax the offline engine does not evaluate"""
+
+
+def is_visible(node):
+    """
+    Best offline guess at visibility: no hidden attribute, hiding inline style or hidden input
+
+    :param node: DOMNode
+    :return: True unless the markup itself hides the element or an ancestor
+    """
+    if node.tag == "input" and (node.attrs.get("type") or "").lower() == "hidden":
+        return False
+    current = node
+    while current is not None:
+        if current.tag == "head" or "hidden" in current.attrs:
+            return False
+        if _HIDDEN_STYLE.search(current.attrs.get("style") or ""):
+            return False
+        current = current.parent
+    return True
+
+
+def _raw_text(node):
+    """Text of a node and its descendants with whitespace collapsed, like innerText().trim()"""
+    return node.full_text(normalize=False)
+
+
+def _root_nodes(snapshot):
+    return [node for node in snapshot.nodes if node.parent is None]
+
+
+def _descendants(node):
+    stack = list(reversed(node.children))
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
+
+# ---------------------------------------------------------------- CSS selectors
+
+_CSS_TOKEN = re.compile(r"""
+    (?P<combinator>\s*[>+~]\s*)
+  | (?P<space>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>-?[_a-zA-Z][\w-]*)
+  | \.(?P<cls>-?[_a-zA-Z][\w-]*)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s"']+))\s*)?\]
+  | :(?P<pseudo>[\w-]+)(?:\((?P<arg>[^)]*)\))?
+""", re.VERBOSE)
+
+_SUPPORTED_PSEUDOS = {"first-child", "last-child", "nth-child", "first-of-type", "last-of-type", "nth-of-type"}
+
+
+def _split_outside_quotes(value, separator):
+    """Split on a separator character that is not inside brackets, parentheses or quotes"""
+    parts, depth, quote, start = [], 0, None, 0
+    for index, char in enumerate(value):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(value[start:index])
+            start = index + 1
+    parts.append(value[start:])
+    return parts
+
+
+def _parse_css(selector):
+    """
+    Parse one complex selector into [(combinator, compound), ...], leftmost first
+
+    :raises UnsupportedQuery: For syntax outside the supported subset
+    """
+    parts = []
+    compound = None
+    combinator = None
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _CSS_TOKEN.match(selector, position)
+        if not match:
+            raise UnsupportedQuery(f"Unsupported CSS selector: {selector!r}")
+        position = match.end()
+        if match.group("combinator") or match.group("space"):
+            if compound is not None:
+                parts.append((combinator, compound))
+                compound = None
+            combinator = (match.group("combinator") or " ").strip() or " "
+            continue
+
+        if compound is None:
+            compound = {"tag": None, "ids": [], "classes": [], "attrs": [], "pseudos": []}
+        if match.group("tag"):
+            if compound["tag"] is not None or compound["ids"] or compound["classes"] or compound["attrs"]:
+                raise UnsupportedQuery(f"Unsupported CSS selector: {selector!r}")
+            compound["tag"] = match.group("tag").lower()
+        elif match.group("id"):
+            compound["ids"].append(match.group("id"))
+        elif match.group("cls"):
+            compound["classes"].append(match.group("cls"))
+        elif match.group("attr"):
+            value = next((v for v in (match.group("dq"), match.group("sq"), match.group("bare")) if v is not None), None)
+            compound["attrs"].append((match.group("attr").lower(), match.group("op"), value))
+        else:
+            pseudo = match.group("pseudo")
+            if pseudo not in _SUPPORTED_PSEUDOS:
+                raise UnsupportedQuery(f"Unsupported CSS pseudo-class :{pseudo}")
+            compound["pseudos"].append((pseudo, match.group("arg")))
+
+    if compound is None:
+        raise UnsupportedQuery(f"Unsupported CSS selector: {selector!r}")
+    parts.append((combinator, compound))
+    return parts
+
+
+def _siblings(node, snapshot):
+    return node.parent.children if node.parent is not None else _root_nodes(snapshot)
+
+
+def _matches_compound(node, compound, snapshot):
+    if compound["tag"] not in (None, "*") and node.tag != compound["tag"]:
+        return False
+    if any(node.attrs.get("id") != value for value in compound["ids"]):
+        return False
+    classes = node.classes
+    if any(value not in classes for value in compound["classes"]):
+        return False
+    for name, op, value in compound["attrs"]:
+        if name not in node.attrs:
+            return False
+        actual = node.attrs[name]
+        if op is None:
+            continue
+        if op == "=" and actual != value:
+            return False
+        if op == "~=" and value not in actual.split():
+            return False
+        if op == "^=" and not (value and actual.startswith(value)):
+            return False
+        if op == "$=" and not (value and actual.endswith(value)):
+            return False
+        if op == "*=" and not (value and value in actual):
+            return False
+        if op == "|=" and not (actual == value or actual.startswith(value + "-")):
+            return False
+    for pseudo, argument in compound["pseudos"]:
+        siblings = _siblings(node, snapshot)
+        if pseudo.endswith("of-type"):
+            siblings = [sibling for sibling in siblings if sibling.tag == node.tag]
+        index = siblings.index(node) + 1
+        if pseudo.startswith("first") and index != 1:
+            return False
+        if pseudo.startswith("last") and index != len(siblings):
+            return False
+        if pseudo.startswith("nth"):
+            try:
+                if index != int(argument):
+                    return False
+            except (TypeError, ValueError):
+                raise UnsupportedQuery(f"Unsupported :{pseudo}({argument})")
+    return True
+
+
+def _matches_complex(node, parts, snapshot):
+    """Match a node against parsed parts, right to left"""
+    combinator, compound = parts[-1]
+    if not _matches_compound(node, compound, snapshot):
+        return False
+    if len(parts) == 1:
+        return True
+    rest = parts[:-1]
+    if combinator == ">":
+        return node.parent is not None and _matches_complex(node.parent, rest, snapshot)
+    if combinator == " ":
+        return any(_matches_complex(ancestor, rest, snapshot) for ancestor in node.ancestors())
+    siblings = _siblings(node, snapshot)
+    previous = siblings[:siblings.index(node)]
+    if combinator == "+":
+        return bool(previous) and _matches_complex(previous[-1], rest, snapshot)
+    return any(_matches_complex(sibling, rest, snapshot) for sibling in previous)
+
+
+def query_css(snapshot, selector):
+    """
+    Evaluate a CSS selector against a snapshot
+
+    Supports type, universal, #id, .class and attribute selectors, the four
+    combinators, selector lists and the child/of-type position pseudo-classes.
+
+    :param snapshot: DOMSnapshot
+    :param selector: CSS selector
+    :return: Matching DOMNodes in document order
+    """
+    matches = set()
+    for group in _split_outside_quotes(selector, ","):
+        parts = _parse_css(group)
+        last = parts[-1][1]
+        # Start from the smallest index that the rightmost compound must be in
+        if last["ids"]:
+            pool = snapshot.by_id.get(last["ids"][0], ())
+        elif last["classes"]:
+            pool = snapshot.by_class.get(last["classes"][0], ())
+        elif last["tag"] not in (None, "*"):
+            pool = snapshot.by_tag.get(last["tag"], ())
+        else:
+            pool = snapshot.nodes
+        matches.update(node.index for node in pool if _matches_complex(node, parts, snapshot))
+    return [snapshot.nodes[index] for index in sorted(matches)]
+
+
+# ---------------------------------------------------------------- XPath
+
+_XPATH_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>!=|<=|>=|=|<|>|\(|\)|,|@|\.\.|\.|\*)
+      | (?P<name>[a-zA-Z_][\w.-]*(?:\(\))?)
+    )""", re.VERBOSE)
+
+_AXES = {
+    "child", "descendant", "descendant-or-self", "parent", "ancestor", "ancestor-or-self",
+    "following-sibling", "preceding-sibling", "following", "preceding", "self"
+}
+
+
+class _XPathExpression:
+    """Recursive-descent evaluator for the predicate language used by locators"""
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = []
+        position = 0
+        while position < len(source):
+            if not source[position:].strip():
+                break
+            match = _XPATH_TOKEN.match(source, position)
+            if not match or match.end() == position:
+                raise UnsupportedQuery(f"Unsupported XPath predicate: {source!r}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+        self.tree = self._or()
+        if self.position != len(self.tokens):
+            raise UnsupportedQuery(f"Unsupported XPath predicate: {source!r}")
+
+    def _peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _take(self, value=None):
+        token = self._peek()
+        if value is not None and token[1] != value:
+            raise UnsupportedQuery(f"Expected {value!r} in XPath predicate: {self.source!r}")
+        self.position += 1
+        return token
+
+    def _or(self):
+        left = self._and()
+        while self._peek() == ("name", "or"):
+            self._take()
+            right = self._and()
+            left = (lambda l, r: lambda ctx: bool(l(ctx)) or bool(r(ctx)))(left, right)
+        return left
+
+    def _and(self):
+        left = self._comparison()
+        while self._peek() == ("name", "and"):
+            self._take()
+            right = self._comparison()
+            left = (lambda l, r: lambda ctx: bool(l(ctx)) and bool(r(ctx)))(left, right)
+        return left
+
+    def _comparison(self):
+        left = self._value()
+        kind, op = self._peek()
+        if kind == "op" and op in ("=", "!=", "<", ">", "<=", ">="):
+            self._take()
+            right = self._value()
+            return (lambda l, r, o: lambda ctx: _compare(l(ctx), r(ctx), o))(left, right, op)
+        return left
+
+    def _value(self):
+        kind, value = self._take()
+        if kind == "string":
+            return lambda ctx, v=value[1:-1]: v
+        if kind == "number":
+            return lambda ctx, v=float(value): v
+        if (kind, value) == ("op", "("):
+            inner = self._or()
+            self._take(")")
+            return inner
+        if (kind, value) == ("op", "@"):
+            _, name = self._take()
+            if name == "*":
+                return lambda ctx: list(ctx[0].attrs.values())
+            return lambda ctx, n=name.lower(): [ctx[0].attrs[n]] if n in ctx[0].attrs else []
+        if (kind, value) == ("op", "."):
+            return lambda ctx: [_raw_text(ctx[0])]
+        if kind == "name" and value == "text()":
+            return lambda ctx: list(ctx[0].own_text)
+        if kind == "name" and value in ("position()", "last()"):
+            return (lambda ctx: float(ctx[1])) if value == "position()" else (lambda ctx: float(ctx[2]))
+        if kind == "name" and self._peek() == ("op", "("):
+            self._take()
+            arguments = []
+            while self._peek() != ("op", ")"):
+                arguments.append(self._or())
+                if self._peek() == ("op", ","):
+                    self._take()
+            self._take(")")
+            return self._function(value, arguments)
+        if kind == "name" and value.endswith("()"):
+            return self._function(value[:-2], [])
+        raise UnsupportedQuery(f"Unsupported XPath predicate: {self.source!r}")
+
+    def _function(self, name, arguments):
+        def string_argument(index, ctx):
+            if index < len(arguments):
+                return _string(arguments[index](ctx))
+            return _raw_text(ctx[0])
+
+        if name == "contains":
+            return lambda ctx: string_argument(1, ctx) in string_argument(0, ctx)
+        if name == "starts-with":
+            return lambda ctx: string_argument(0, ctx).startswith(string_argument(1, ctx))
+        if name == "normalize-space":
+            return lambda ctx: _WHITESPACE.sub(" ", string_argument(0, ctx)).strip()
+        if name == "not":
+            return lambda ctx: not bool(arguments[0](ctx))
+        if name == "concat":
+            return lambda ctx: "".join(string_argument(i, ctx) for i in range(len(arguments)))
+        if name == "string":
+            return lambda ctx: string_argument(0, ctx)
+        if name == "translate":
+            def translate(ctx):
+                source, old, new = (string_argument(i, ctx) for i in range(3))
+                table = {ord(char): (new[i] if i < len(new) else None) for i, char in enumerate(old)}
+                return source.translate(table)
+            return translate
+        raise UnsupportedQuery(f"Unsupported XPath function {name}()")
+
+    def evaluate(self, node, position, size):
+        return self.tree((node, position, size))
+
+
+def _string(value):
+    if isinstance(value, list):
+        return value[0] if value else ""
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _compare(left, right, op):
+    """XPath 1.0 comparison: node-sets compare true if any member does"""
+    lefts = left if isinstance(left, list) else [left]
+    rights = right if isinstance(right, list) else [right]
+    numeric = op not in ("=", "!=") or any(isinstance(v, float) for v in lefts + rights)
+    for a in lefts:
+        for b in rights:
+            if numeric:
+                try:
+                    a_value, b_value = float(a), float(b)
+                except (TypeError, ValueError):
+                    continue
+            else:
+                a_value, b_value = _string(a), _string(b)
+            if ((op == "=" and a_value == b_value) or (op == "!=" and a_value != b_value)
+                    or (op == "<" and a_value < b_value) or (op == ">" and a_value > b_value)
+                    or (op == "<=" and a_value <= b_value) or (op == ">=" and a_value >= b_value)):
+                return True
+    return False
+
+
+def _split_steps(path):
+    """Split an XPath location path into (separator, step) pairs"""
+    steps = []
+    depth = 0
+    quote = None
+    start = 0
+    separator = ""
+    position = 0
+    while position < len(path):
+        char = path[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "/" and depth == 0:
+            if position > start:
+                steps.append((separator, path[start:position]))
+            separator = "//" if path.startswith("//", position) else "/"
+            position += len(separator)
+            start = position
+            continue
+        position += 1
+    if start < len(path):
+        steps.append((separator, path[start:]))
+    return steps
+
+
+def _split_predicates(step):
+    """Split 'tag[1][@id="x"]' into ('tag', ['1', '@id="x"'])"""
+    bracket = step.find("[")
+    if bracket == -1:
+        return step.strip(), []
+    node_test = step[:bracket].strip()
+    predicates = []
+    depth = 0
+    quote = None
+    start = None
+    for index in range(bracket, len(step)):
+        char = step[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            if depth == 0:
+                start = index + 1
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                predicates.append(step[start:index])
+    return node_test, predicates
+
+
+def _axis_nodes(node, axis, snapshot):
+    """Nodes on an axis of a context node (None is the document), in axis order"""
+    if node is None:
+        if axis in ("child",):
+            return _root_nodes(snapshot)
+        if axis in ("descendant", "descendant-or-self"):
+            return list(snapshot.nodes)
+        return []
+    if axis == "child":
+        return list(node.children)
+    if axis == "descendant":
+        return list(_descendants(node))
+    if axis == "descendant-or-self":
+        return [node] + list(_descendants(node))
+    if axis == "self":
+        return [node]
+    if axis == "parent":
+        return [node.parent] if node.parent is not None else []
+    if axis == "ancestor":
+        return list(node.ancestors())
+    if axis == "ancestor-or-self":
+        return [node] + list(node.ancestors())
+    if axis == "following":
+        # Node indexes are in document order; skip the context node's own subtree
+        end = node.index + sum(1 for _ in _descendants(node))
+        return snapshot.nodes[end + 1:]
+    if axis == "preceding":
+        ancestors = {ancestor.index for ancestor in node.ancestors()}
+        return [n for n in reversed(snapshot.nodes[:node.index]) if n.index not in ancestors]
+    siblings = _siblings(node, snapshot)
+    index = siblings.index(node)
+    if axis == "following-sibling":
+        return siblings[index + 1:]
+    return list(reversed(siblings[:index]))
+
+
+def query_xpath(snapshot, expression):
+    """
+    Evaluate an XPath location path against a snapshot
+
+    Supports absolute and relative paths over element nodes, the common axes,
+    positional predicates and predicates built from @attributes, text(), ".",
+    contains(), starts-with(), normalize-space(), translate(), concat(), not(), and/or.
+
+    :param snapshot: DOMSnapshot
+    :param expression: XPath expression selecting elements
+    :return: Matching DOMNodes in document order
+    """
+    expression = expression.strip()
+    if expression.startswith("(") or "|" in expression:
+        raise UnsupportedQuery(f"Unsupported XPath expression: {expression!r}")
+    if not expression.startswith("/"):
+        expression = "//" + expression if not expression.startswith(".") else expression
+
+    contexts = [None]
+    for separator, step in _split_steps(expression):
+        if separator == "" and step in (".", ""):
+            continue
+        node_test, predicates = _split_predicates(step)
+        if node_test == ".":
+            axis, node_test = "self", "*"
+        elif node_test == "..":
+            axis, node_test = "parent", "*"
+        elif "::" in node_test:
+            axis, node_test = node_test.split("::", 1)
+            if axis not in _AXES:
+                raise UnsupportedQuery(f"Unsupported XPath axis {axis}::")
+        else:
+            axis = "child"
+        node_test = node_test.lower()
+        if node_test in ("node()",):
+            node_test = "*"
+        if not re.fullmatch(r"\*|[a-z_][\w.-]*", node_test):
+            raise UnsupportedQuery(f"Unsupported XPath step: {step!r}")
+        compiled = [_XPathExpression(predicate) for predicate in predicates]
+
+        if separator == "//":
+            expanded = []
+            for context in contexts:
+                expanded.extend(_axis_nodes(context, "descendant-or-self", snapshot) if context is not None else [None] + snapshot.nodes)
+            contexts = expanded
+
+        results = {}
+        for context in contexts:
+            nodes = [n for n in _axis_nodes(context, axis, snapshot) if node_test == "*" or n.tag == node_test]
+            for predicate in compiled:
+                size = len(nodes)
+                kept = []
+                for position, candidate in enumerate(nodes, 1):
+                    value = predicate.evaluate(candidate, position, size)
+                    # A number is a position test, anything else is converted to a boolean
+                    if (value == position) if isinstance(value, float) else bool(value):
+                        kept.append(candidate)
+                nodes = kept
+            for candidate in nodes:
+                results[candidate.index] = candidate
+        contexts = [results[index] for index in sorted(results)]
+    return [context for context in contexts if context is not None]
+
+
+# ---------------------------------------------------------------- Locators
+
+def query(snapshot, by, value):
+    """
+    Resolve a Selenium locator against a DOMSnapshot without a browser
+
+    :param snapshot: DOMSnapshot
+    :param by: Selenium By value
+    :param value: Locator value
+    :return: Matching DOMNodes in document order
+    :raises UnsupportedQuery: For strategies or syntax the engine does not evaluate
+    """
+    if by == By.ID:
+        return list(snapshot.by_id.get(value, ()))
+    if by == By.NAME:
+        return list(snapshot.by_name.get(value, ()))
+    if by == By.CLASS_NAME:
+        if " " in value.strip():
+            raise UnsupportedQuery("Compound class names are not permitted")
+        return list(snapshot.by_class.get(value.strip(), ()))
+    if by == By.TAG_NAME:
+        return list(snapshot.by_tag.get(value.lower(), ()))
+    if by == By.CSS_SELECTOR:
+        return query_css(snapshot, value)
+    if by == By.XPATH:
+        return query_xpath(snapshot, value)
+    if by == By.LINK_TEXT:
+        return [node for node in snapshot.by_tag.get("a", ()) if _raw_text(node) == value]
+    if by == By.PARTIAL_LINK_TEXT:
+        return [node for node in snapshot.by_tag.get("a", ()) if value in _raw_text(node)]
+    raise UnsupportedQuery(f"Unsupported locator strategy: {by}")
+
+
+def probe_snapshot(snapshot, strategies):
+    """
+    Offline counterpart of utils.batch_probe.probe_locators
+
+    Returns the same dicts, with DOMNodes as elements, so pick_best_probe works
+    on either.
+
+    :param snapshot: DOMSnapshot
+    :param strategies: Ordered list of (by, value) tuples
+    :return: List of dicts (by, value, count, visible, element, fingerprint, error)
+    """
+    probes = []
+    for by, value in strategies:
+        probe = {"by": by, "value": value, "count": 0, "visible": False, "element": None, "fingerprint": None, "error": None}
+        try:
+            matches = query(snapshot, by, value)
+        except UnsupportedQuery as e:
+            probe["error"] = str(e)
+            probes.append(probe)
+            continue
+        picked = next((node for node in matches if is_visible(node)), None)
+        probe["visible"] = picked is not None
+        if picked is None and matches:
+            picked = matches[0]
+        probe["count"] = len(matches)
+        probe["element"] = picked
+        probe["fingerprint"] = fingerprint_from_node(picked) if picked is not None else None
+        probes.append(probe)
+    return probes
@@ -0,0 +1,191 @@
+import time
+from contextlib import contextmanager, nullcontext
+import config
+
+# Span categories, in the order the breakdown tables list them
+LOCATE = "locate"  # Lookup bookkeeping: cache checks, fingerprints, learning, recording
+LOCATE_PRIMARY = "locate.primary"
+LOCATE_FALLBACK = "locate.fallback"
+LOCATE_DOM_ANALYSIS = "locate.dom_analysis"
+LOCATE_GENAI = "locate.genai"
+LOCATE_PAGE_HEALING = "locate.page_healing"
+WAIT = "wait"  # Explicit WebDriverWait conditions
+PAGE_LOAD = "page_load"  # wait_for_page_load polling and sleeps
+ACTION = "action"  # Element commands: click, send keys, clear, text, ...
+NAVIGATION = "navigation"
+OTHER = "other"  # Step time not covered by any span (step code, assertions, behave)
+
+CATEGORIES = [
+    LOCATE_PRIMARY, LOCATE_FALLBACK, LOCATE_DOM_ANALYSIS, LOCATE_GENAI, LOCATE_PAGE_HEALING, LOCATE,
+    WAIT, PAGE_LOAD, ACTION, NAVIGATION, OTHER
+]
+
+_NO_SPAN = nullcontext()
+
+
+class StepTimer:
+    """
+    Nested timing spans per behave step
+
+    Each span is charged only its own time: when a span ends, its duration is
+    taken off the span it is nested in, so a lookup inside an explicit wait
+    counts as locator time and not twice. Element commands polled by a wait
+    belong to the wait. Step time outside every span is charged to OTHER.
+    Spans outside a step are not recorded.
+    """
+
+    def __init__(self):
+        self.run_totals = {}  # category -> seconds over the whole run
+        self.run_counts = {}  # category -> spans over the whole run
+        self.run_steps = 0
+        self.scenario = None
+        self.step = None
+        self._stack = []  # [category, label, start, child time] of the open spans
+
+    def start_scenario(self, name):
+        self.scenario = {"name": name, "steps": []}
+
+    def end_scenario(self):
+        """
+        :return: Breakdown of the scenario: steps with their category times, plus totals
+        """
+        scenario, self.scenario = self.scenario, None
+        if scenario is None:
+            return None
+        totals = {}
+        for step in scenario["steps"]:
+            for category, seconds in step["categories"].items():
+                totals[category] = totals.get(category, 0.0) + seconds
+        scenario["totals"] = totals
+        scenario["duration"] = sum(step["duration"] for step in scenario["steps"])
+        return scenario
+
+    def start_step(self, name):
+        self._stack = []
+        self.step = {
+            "name": name, "start": time.perf_counter(), "categories": {}, "counts": {}, "spans": []
+        }
+
+    def end_step(self, status=None):
+        """
+        Close the current step and charge its uncovered time to OTHER
+
+        :param status: behave step status name
+        :return: Step record, or None if no step was open
+        """
+        step, self.step = self.step, None
+        if step is None:
+            return None
+        step["duration"] = time.perf_counter() - step.pop("start")
+        step["status"] = status
+        covered = sum(step["categories"].values())
+        step["categories"][OTHER] = max(step["duration"] - covered, 0.0)
+
+        for category, seconds in step["categories"].items():
+            self.run_totals[category] = self.run_totals.get(category, 0.0) + seconds
+        for category, count in step["counts"].items():
+            self.run_counts[category] = self.run_counts.get(category, 0) + count
+        self.run_steps += 1
+        if self.scenario is not None:
+            self.scenario["steps"].append(step)
+        return step
+
+    @contextmanager
+    def _span(self, category, label):
+        entry = [category, label, time.perf_counter(), 0.0]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            step = self.step
+            if step is not None:
+                duration = end - entry[2]
+                own = max(duration - entry[3], 0.0)
+                step["categories"][category] = step["categories"].get(category, 0.0) + own
+                step["counts"][category] = step["counts"].get(category, 0) + 1
+                step["spans"].append({
+                    "category": category, "label": label, "depth": len(self._stack),
+                    "offset": entry[2] - step["start"], "duration": duration
+                })
+                if self._stack:
+                    self._stack[-1][3] += duration
+
+    def span(self, category, label=None):
+        """
+        Time a block as one span of the current step
+
+        :param category: One of CATEGORIES
+        :param label: What the span did (locator name, command, URL)
+        :return: Context manager (a shared no-op outside a step)
+        """
+        if self.step is None:
+            return _NO_SPAN
+        if category == ACTION and self._stack and self._stack[-1][0] in (WAIT, PAGE_LOAD):
+            return _NO_SPAN
+        return self._span(category, label)
+
+
+def _rows(categories, counts, duration):
+    for category in CATEGORIES:
+        seconds = categories.get(category, 0.0)
+        if seconds <= 0:
+            continue
+        share = seconds / duration * 100 if duration else 0.0
+        yield category, seconds, counts.get(category), share
+
+
+def print_scenario_breakdown(scenario):
+    """Print the time of every step of a scenario, split by category"""
+    if not scenario or not scenario["steps"]:
+        return
+    print(f"\n⏱️ STEP TIMING: {scenario['name']} ({scenario['duration']:.2f}s)")
+    for step in scenario["steps"]:
+        parts = [
+            f"{category} {seconds:.2f}s"
+            for category, seconds, _, _ in _rows(step["categories"], step["counts"], step["duration"])
+            if seconds >= 0.005
+        ]
+        print(f"  • {step['duration']:>6.2f}s  {step['name'][:60]:<60}  {', '.join(parts)}")
+
+
+def print_run_breakdown(timer):
+    """Print where the time of every step of the run went"""
+    duration = sum(timer.run_totals.values())
+    if not timer.run_steps:
+        return
+    print("\n" + "-" * 80)
+    print(f"⏱️ WHERE DID THE TIME GO: {timer.run_steps} steps, {duration:.2f}s")
+    print("-" * 80)
+    print(f"  {'Category':<22} {'Seconds':>9} {'Share':>7} {'Spans':>7} {'Mean ms':>9}")
+    for category, seconds, count, share in sorted(
+        _rows(timer.run_totals, timer.run_counts, duration), key=lambda row: row[1], reverse=True
+    ):
+        mean = f"{seconds / count * 1000:>9.1f}" if count else f"{'-':>9}"
+        print(f"  {category:<22} {seconds:>9.2f} {share:>6.1f}% {count or '-':>7} {mean}")
+    print("-" * 80)
+
+
+_timer = None
+
+
+def step_timer():
+    """Timer shared by every page object and healing driver of this process"""
+    global _timer
+    if _timer is None:
+        _timer = StepTimer()
+    return _timer
+
+
+def span(category, label=None):
+    """
+    Time a block as a span of the current step (no-op when config.STEP_TIMING is off or no step runs)
+
+    :param category: One of CATEGORIES
+    :param label: What the span did
+    :return: Context manager
+    """
+    if _timer is None or not config.STEP_TIMING:
+        return _NO_SPAN
+    return _timer.span(category, label)
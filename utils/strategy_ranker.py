@@ -0,0 +1,206 @@
+import logging
+import math
+import time
+
+
+class StrategyStats:
+    """Success/failure counts and smoothed lookup latency of one (element, strategy) pair"""
+
+    __slots__ = ("successes", "failures", "latency", "last_success", "last_attempt")
+
+    def __init__(self, successes=0, failures=0, latency=None, last_success=None, last_attempt=None):
+        self.successes = successes
+        self.failures = failures
+        self.latency = latency  # Exponentially weighted lookup latency in seconds
+        self.last_success = last_success  # Epoch seconds of the last win
+        self.last_attempt = last_attempt if last_attempt is not None else last_success  # Epoch seconds of the last try
+
+    @property
+    def trials(self):
+        return self.successes + self.failures
+
+    def success_rate(self):
+        """Posterior mean success probability (Beta(1, 1) prior)"""
+        return (self.successes + 1) / (self.trials + 2)
+
+    def record(self, success, latency=None, alpha=0.3, now=None):
+        """
+        Add one lookup outcome
+
+        :param success: Whether the strategy located the element
+        :param latency: Lookup time in seconds (only meaningful for successes)
+        :param alpha: Weight of the newest latency sample
+        :param now: Current epoch time
+        """
+        now = now if now is not None else time.time()
+        self.last_attempt = now
+        if success:
+            self.successes += 1
+            self.last_success = now
+            if latency is not None:
+                self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        else:
+            self.failures += 1
+
+
+class StrategyRanker:
+    """
+    Orders each element's strategies by expected lookup cost
+
+    Expected cost is the time per successful lookup: smoothed latency plus the
+    price of a miss, divided by an optimistic (UCB) estimate of the success
+    probability. Fast reliable strategies come first while rarely tried ones
+    still get explored. Strategies that have not won within max_age seconds,
+    or never won and were not tried within max_age seconds, are evicted.
+    """
+
+    def __init__(self, alpha=0.3, exploration=0.5, default_latency=0.5, failure_cost=0.5, max_age=14 * 24 * 3600, limit=5):
+        """
+        :param alpha: EWMA weight of the newest latency sample
+        :param exploration: Weight of the UCB exploration bonus
+        :param default_latency: Latency assumed for strategies that never succeeded, in seconds
+        :param failure_cost: Seconds lost when a strategy misses
+        :param max_age: Seconds without a win (or, for strategies that never won, without a try) before eviction
+        :param limit: Maximum number of strategies kept per element
+        """
+        self.alpha = alpha
+        self.exploration = exploration
+        self.default_latency = default_latency
+        self.failure_cost = failure_cost
+        self.max_age = max_age
+        self.limit = limit
+        self.stats = {}  # element -> {(by, value): StrategyStats}
+        self.pending = {}  # element -> {(by, value): StrategyStats} recorded since the last flush
+        self.evicted = {}  # element -> set of (by, value) evicted since the last flush
+
+    def load(self, stats):
+        """
+        Replace the in-memory statistics
+
+        :param stats: Dict of element -> {(by, value): StrategyStats}
+        """
+        self.stats = stats
+        self.pending = {}
+        self.evicted = {}
+
+    @property
+    def dirty(self):
+        """Elements with statistics or evictions not flushed yet"""
+        return set(self.pending) | set(self.evicted)
+
+    def seed(self, element, strategy, stats):
+        """
+        Track a strategy with initial statistics if it is not tracked yet
+
+        The seed counts as pending so it is written on the next flush.
+
+        :param element: Locator name
+        :param strategy: (by, value) tuple
+        :param stats: Initial StrategyStats
+        """
+        strategies = self.stats.setdefault(element, {})
+        if strategy not in strategies:
+            strategies[strategy] = stats
+            self.pending.setdefault(element, {})[strategy] = StrategyStats(
+                stats.successes, stats.failures, stats.latency, stats.last_success, stats.last_attempt
+            )
+
+    def take_pending(self, element):
+        """
+        Hand over the changes of one element since the last flush
+
+        :param element: Locator name
+        :return: Tuple of ({(by, value): StrategyStats delta}, set of evicted (by, value))
+        """
+        return self.pending.pop(element, {}), self.evicted.pop(element, set())
+
+    def replace(self, element, stats):
+        """
+        Replace the statistics of one element, e.g. with the merged stored copy
+
+        :param element: Locator name
+        :param stats: Dict of (by, value) -> StrategyStats
+        """
+        self.stats[element] = stats
+
+    def record(self, element, strategy, success, latency=None):
+        """
+        Record one outcome for an (element, strategy) pair
+
+        :param element: Locator name
+        :param strategy: (by, value) tuple
+        :param success: Whether the strategy located the element
+        :param latency: Lookup time in seconds
+        :return: True if the strategy was not tracked before
+        """
+        strategies = self.stats.setdefault(element, {})
+        is_new = strategy not in strategies
+        if is_new:
+            strategies[strategy] = StrategyStats()
+        strategies[strategy].record(success, latency, self.alpha)
+        self.pending.setdefault(element, {}).setdefault(strategy, StrategyStats()).record(success, latency, self.alpha)
+        return is_new
+
+    def expected_cost(self, stats, total_trials):
+        """
+        Expected seconds spent per successful lookup with this strategy
+
+        :param stats: StrategyStats of the strategy
+        :param total_trials: Trials across all strategies of the element
+        :return: Cost; lower is better
+        """
+        latency = stats.latency if stats.latency is not None else self.default_latency
+        bonus = self.exploration * math.sqrt(math.log(total_trials + 1) / (stats.trials + 1))
+        optimistic_rate = min(stats.success_rate() + bonus, 1.0)
+        return (latency + (1 - optimistic_rate) * self.failure_cost) / optimistic_rate
+
+    def evict(self, element, now=None):
+        """
+        Drop strategies that have not won within max_age and keep the cheapest `limit`
+
+        Strategies that never won age out on their last try instead, so rows
+        that only ever fail do not pile up.
+
+        :param element: Locator name
+        :param now: Current epoch time
+        :return: List of evicted (by, value) tuples
+        """
+        now = now if now is not None else time.time()
+        strategies = self.stats.get(element, {})
+        evicted = [
+            strategy for strategy, stats in strategies.items()
+            if self._last_seen(stats) is not None and now - self._last_seen(stats) > self.max_age
+        ]
+        for strategy in self.ordered(element, evict=False)[self.limit:]:
+            if strategy not in evicted:
+                evicted.append(strategy)
+
+        for strategy in evicted:
+            del strategies[strategy]
+            self.pending.get(element, {}).pop(strategy, None)
+            self.evicted.setdefault(element, set()).add(strategy)
+            logging.info(f"Evicted stale strategy for '{element}': {strategy}")
+        return evicted
+
+    @staticmethod
+    def _last_seen(stats):
+        """Epoch seconds eviction ages a strategy from: its last win, or its last try if it never won"""
+        return stats.last_success if stats.last_success is not None else stats.last_attempt
+
+    def ordered(self, element, evict=True):
+        """
+        Strategies of an element with at least one win, cheapest expected cost first
+
+        :param element: Locator name
+        :param evict: Evict stale strategies first
+        :return: List of (by, value) tuples
+        """
+        if evict:
+            self.evict(element)
+        strategies = self.stats.get(element, {})
+        total_trials = sum(stats.trials for stats in strategies.values())
+        ranked = sorted(
+            (strategy for strategy, stats in strategies.items() if stats.successes),
+            key=lambda strategy: self.expected_cost(strategies[strategy], total_trials)
+        )
+        return ranked
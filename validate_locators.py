@@ -0,0 +1,198 @@
+"""
+Check every locator of every page object against the live application
+
+Each page object under pages/ is opened on the routes listed in PAGE_ROUTES and
+all of its AISelfHealingLocators are checked with one batched probe per page.
+A locator is healthy when its defined primary strategy finds a visible element,
+healed when only a learned, fallback or fingerprint strategy does, and broken
+when nothing matches. Keyword guesses are shown as suggestions only.
+
+Usage:
+    python validate_locators.py                  # all page objects, headless
+    python validate_locators.py PIMPage --headed
+    python validate_locators.py --prime          # store verified replacements as learned locators
+"""
+import argparse
+import glob
+import importlib
+import inspect
+import os
+import sys
+import time
+
+import config
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverSessionPool
+from utils.page_activity import wait_for_quiescence
+from utils.session_cache import AuthSessionCache
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Page object class -> (routes relative to config.BASE_URL, needs login)
+PAGE_ROUTES = {
+    "LoginPage": ([""], False),
+    "DashboardPage": (["web/index.php/dashboard/index"], True),
+    "PIMPage": (["web/index.php/pim/viewEmployeeList", "web/index.php/pim/addEmployee"], True),
+    "LeavePage": (["web/index.php/leave/viewLeaveList"], True),
+}
+
+# Best status wins when a locator is checked on several routes
+STATUS_ORDER = {"healthy": 0, "healed": 1, "broken": 2}
+STATUS_ICONS = {"healthy": "✅", "healed": "🩹", "broken": "❌"}
+
+# Winner sources that count as a heal; keyword guesses are unverified and stay suggestions
+HEALING_SOURCES = ("learned", "fallback", "fingerprint")
+
+
+def discover_page_objects():
+    """
+    Import every module under pages/ and collect its BasePage subclasses
+
+    :return: Dict of class name -> class
+    """
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "pages", "*.py"))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        if module_name.startswith("_"):
+            continue
+        module = importlib.import_module(f"pages.{module_name}")
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, BasePage) and cls is not BasePage and cls.__module__ == module.__name__:
+                pages[name] = cls
+    return pages
+
+
+def classify(result):
+    """
+    Turn one probe_page_locators result into a status and suggestion
+
+    :param result: Result dict of AISelfHealingDriver.probe_page_locators
+    :return: Dict with status, primary, suggestion, source and note
+    """
+    locator = result["locator"]
+    primary = result["primary"]
+    winner = result["winner"]
+    row = {
+        "status": "broken",
+        "primary": f"{locator.initial_strategies[0][0]}={locator.initial_strategies[0][1]}",
+        "suggestion": "",
+        "source": "",
+        "note": "",
+        "result": result,
+    }
+    if primary and primary["count"] and primary["visible"]:
+        row["status"] = "healthy"
+        if primary["count"] > 1:
+            row["note"] = f"ambiguous ({primary['count']} matches)"
+    elif winner is not None and result["source"] in HEALING_SOURCES:
+        row["status"] = "healed"
+    elif primary and primary["count"]:
+        row["note"] = "matches a hidden element"
+    elif winner is not None:
+        row["note"] = "unverified keyword guess"
+
+    if winner is not None and row["status"] != "healthy":
+        row["suggestion"] = f"{winner['by']}={winner['value']}"
+        row["source"] = result["source"]
+    return row
+
+
+def validate_page(driver, session_cache, page_class, routes, needs_login):
+    """
+    Open each route of a page object and check all of its locators
+
+    :return: Dict of locator name -> best row over the routes
+    """
+    page = page_class(driver)
+    best = {}
+    for route in routes:
+        if needs_login:
+            LoginPage(driver).login_with_session_cache(
+                session_cache, config.BASE_URL, config.TEST_USERNAME, config.TEST_PASSWORD
+            )
+        else:
+            # Logged-out pages redirect away while an earlier page's session is active
+            driver.reset_session_state()
+        driver.get(config.BASE_URL.rstrip("/") + "/" + route if route else config.BASE_URL)
+        wait_for_quiescence(driver.driver, idle=config.PAGE_IDLE_WINDOW)
+
+        for result in driver.probe_page_locators(page.locators, keyword_candidates=True):
+            row = classify(result)
+            row["route"] = route or "/"
+            name = result["locator"].name
+            if name not in best or STATUS_ORDER[row["status"]] < STATUS_ORDER[best[name]["status"]]:
+                best[name] = row
+    return best
+
+
+def print_table(rows):
+    """Print one line per locator, grouped by page object"""
+    headers = ("Page", "Locator", "Status", "Primary", "Suggestion")
+    lines = []
+    for page_name, name, row in rows:
+        suggestion = f"{row['suggestion']} ({row['source']})" if row["suggestion"] else ""
+        status = f"{STATUS_ICONS[row['status']]} {row['status']}" + (f", {row['note']}" if row["note"] else "")
+        lines.append((page_name, name, status, row["primary"][:60], suggestion[:70]))
+
+    widths = [max(len(str(line[i])) for line in lines + [headers]) for i in range(len(headers))]
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for line in lines:
+        print("  ".join(str(value).ljust(width) for value, width in zip(line, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the locators of all page objects before a run")
+    parser.add_argument("pages", nargs="*", help="Page object class names (default: all with a route)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--prime", action="store_true", help="Store verified replacements in the learned locator store")
+    args = parser.parse_args(argv)
+
+    page_objects = discover_page_objects()
+    selected = args.pages or sorted(page_objects)
+    unknown = [name for name in selected if name not in page_objects]
+    if unknown:
+        print(f"❌ Unknown page objects: {', '.join(unknown)}")
+        return 2
+    missing = [name for name in selected if name not in PAGE_ROUTES]
+    if missing:
+        print(f"ℹ️ No route for {', '.join(missing)}; add it to PAGE_ROUTES to validate it")
+    selected = [name for name in selected if name in PAGE_ROUTES]
+
+    pool = DriverSessionPool(headless=not args.headed)
+    session_cache = AuthSessionCache(ttl=config.AUTH_SESSION_TTL, login_path=LoginPage.login_path)
+    start_time = time.time()
+    rows = []
+    primed = 0
+    try:
+        driver = pool.acquire()
+        for page_name in selected:
+            routes, needs_login = PAGE_ROUTES[page_name]
+            print(f"🔎 Checking {page_name} on {', '.join(route or '/' for route in routes)}")
+            results = validate_page(driver, session_cache, page_objects[page_name], routes, needs_login)
+            for name, row in results.items():
+                rows.append((page_name, name, row))
+                # Keyword guesses were never verified against a fingerprint, so they are not learned
+                if args.prime and row["status"] == "healed":
+                    if driver._adopt_probe_result(row["result"]):
+                        primed += 1
+        if args.prime:
+            driver.flush_learning()
+    finally:
+        pool.close_all()
+
+    print()
+    print_table(rows)
+    counts = {status: sum(1 for _, _, row in rows if row["status"] == status) for status in STATUS_ORDER}
+    print(
+        f"\n📊 {len(rows)} locators in {time.time() - start_time:.1f}s: "
+        f"{counts['healthy']} healthy, {counts['healed']} healed, {counts['broken']} broken"
+    )
+    if args.prime:
+        print(f"💾 Primed {primed} learned locators in {config.LEARNED_LOCATORS_DB}")
+    return 1 if counts["broken"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())